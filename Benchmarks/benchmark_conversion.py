@@ -0,0 +1,57 @@
+"""
+Benchmark of query results to DataFrame conversion.
+
+Compares the per-page path (NotionPage -> NotionPageProperty.get_value for
+each cell) with the columnar converter used by NotionAPI.
+
+Usage (from the repository root):
+    python -m Benchmarks.benchmark_conversion --rows 50000 --columns 20
+"""
+import argparse
+import time
+import pandas as pd
+from Benchmarks.synthetic_notion import make_pages, make_schema
+from Notion.Notion_Columnar import ColumnarConverter
+from Notion.Notion_Page import NotionPage
+
+
+def convert_per_page(json_results: list[dict]) -> pd.DataFrame:
+    """Per-page conversion through NotionPage objects."""
+    return pd.DataFrame([NotionPage(page).get_property_values() for page in json_results])
+
+
+def convert_columnar(json_results: list[dict]) -> pd.DataFrame:
+    """Columnar conversion, schema inferred once from the first page."""
+    return ColumnarConverter.from_pages(json_results).convert(json_results)
+
+
+def best_of(function, json_results: list[dict], repeat: int) -> float:
+    """Returns the best wall-clock time in seconds over repeat runs."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(json_results)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=50000, help="Number of pages. Default: 50000")
+    parser.add_argument("--columns", type=int, default=20, help="Number of properties. Default: 20")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per converter. Default: 3")
+    args = parser.parse_args()
+
+    json_results = make_pages(args.rows, make_schema(args.columns))
+
+    per_page = best_of(convert_per_page, json_results, args.repeat)
+    columnar = best_of(convert_columnar, json_results, args.repeat)
+
+    print(f"rows={args.rows} columns={args.columns}")
+    print(f"per-page (NotionPage): {per_page:.3f}s  {args.rows / per_page:,.0f} rows/s")
+    print(f"columnar:              {columnar:.3f}s  {args.rows / columnar:,.0f} rows/s")
+    print(f"speedup: {per_page / columnar:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
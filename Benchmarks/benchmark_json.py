@@ -0,0 +1,124 @@
+"""
+Micro-benchmark of query response decoding.
+
+Compares the installed JSON backends (orjson, simdjson, json) on the bodies
+of databases/{id}/query responses, then decoding + columnar conversion done
+in the calling thread against NotionAPI's decode worker pool.
+
+The responses are read from --responses, a directory of recorded response
+bodies (one *.json file per cursor page). Record them once from a live
+database with --record, or leave --responses out to use synthetic pages.
+
+Usage (from the repository root):
+    python -m Benchmarks.benchmark_json --rows 20000 --columns 20 --workers 4
+    NOTION_API_KEY=secret_... python -m Benchmarks.benchmark_json --record <db> --responses responses/
+    python -m Benchmarks.benchmark_json --responses responses/
+"""
+import argparse
+import glob
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from Benchmarks.synthetic_notion import make_pages, make_schema
+from Notion.Notion_Columnar import decode_and_convert
+from Notion.Notion_JSON import get_available_backends, get_json_backend
+
+PAGE_SIZE = 100
+
+
+def make_responses(rows: int, columns: int) -> list[bytes]:
+    """Returns synthetic query response bodies of PAGE_SIZE pages each."""
+    pages = make_pages(rows, make_schema(columns))
+    responses = []
+    for start in range(0, rows, PAGE_SIZE):
+        has_more = start + PAGE_SIZE < rows
+        body = {
+            "object": "list",
+            "results": pages[start:start + PAGE_SIZE],
+            "next_cursor": pages[start + PAGE_SIZE]["id"] if has_more else None,
+            "has_more": has_more,
+        }
+        responses.append(json.dumps(body).encode())
+    return responses
+
+
+def load_responses(directory: str) -> list[bytes]:
+    """Returns the recorded response bodies of a directory, in file name order."""
+    responses = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.json"))):
+        with open(path, "rb") as response_file:
+            responses.append(response_file.read())
+    if not responses:
+        raise ValueError(f"No recorded responses (*.json) in {directory}")
+    return responses
+
+
+def record_responses(db: str, directory: str):
+    """Records the query response bodies of a live database."""
+    from Notion.Notion_API import NotionAPI
+    from Notion.Notion_Query import NotionQuery
+
+    os.makedirs(directory, exist_ok=True)
+    with NotionAPI(os.environ.get("NOTION_API_KEY")) as notion:
+        db = notion._parse_db(db)
+        responses = notion._iter_query_responses(db, notion._build_headers(), NotionQuery())
+        for index, (content, _) in enumerate(responses):
+            with open(os.path.join(directory, f"{index:05d}.json"), "wb") as response_file:
+                response_file.write(content)
+    print(f"Recorded {index + 1} responses to {directory}")
+
+
+def best_of(function, repeat: int) -> float:
+    """Returns the best wall-clock time in seconds over repeat runs."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--responses", type=str, default=None, help="Directory of recorded responses")
+    parser.add_argument("--record", type=str, default=None, help="Record this database's responses to --responses")
+    parser.add_argument("--rows", type=int, default=20000, help="Synthetic pages. Default: 20000")
+    parser.add_argument("--columns", type=int, default=20, help="Synthetic properties. Default: 20")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Decode workers. Default: CPUs")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per variant. Default: 3")
+    args = parser.parse_args()
+
+    if args.record:
+        if not args.responses:
+            parser.error("--record requires --responses")
+        record_responses(args.record, args.responses)
+        return
+
+    responses = load_responses(args.responses) if args.responses else make_responses(args.rows, args.columns)
+    megabytes = sum(len(content) for content in responses) / 1e6
+    rows = sum(len(get_json_backend("json").loads(content)["results"]) for content in responses)
+    print(f"responses={len(responses)} rows={rows} size={megabytes:.1f} MB")
+
+    print("decode only:")
+    for name in get_available_backends():
+        loads = get_json_backend(name).loads
+        seconds = best_of(lambda: [loads(content) for content in responses], args.repeat)
+        print(f"  {name:<10} {seconds:7.3f}s  {megabytes / seconds:8.1f} MB/s  {rows / seconds:12,.0f} rows/s")
+
+    print("decode + convert:")
+    backend = get_json_backend().name
+    seconds = best_of(lambda: [decode_and_convert(content, json_backend=backend) for content in responses], args.repeat)
+    print(f"  {'serial':<10} {seconds:7.3f}s  {rows / seconds:12,.0f} rows/s ({backend})")
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        # Starts the workers, so their start-up is not timed.
+        list(pool.map(decode_and_convert, responses[:args.workers], [None] * args.workers, [backend] * args.workers))
+        seconds = best_of(
+            lambda: list(pool.map(decode_and_convert, responses, [None] * len(responses), [backend] * len(responses))),
+            args.repeat,
+        )
+    print(f"  {f'{args.workers} workers':<10} {seconds:7.3f}s  {rows / seconds:12,.0f} rows/s ({backend})")
+
+
+if __name__ == "__main__":
+    main()
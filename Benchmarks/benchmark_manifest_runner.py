@@ -0,0 +1,67 @@
+"""
+Wall-clock benchmark of validating every database of a manifest.
+
+Compares running "Data Validation/run_expectations.py" once per database, one
+after the other (a new interpreter, Great Expectations import and context per
+database), against a single "Data Validation/run_manifest.py" run. Both talk
+to the real Notion API and Great Expectations project, so NOTION_API_KEY must
+be set and the suites must exist.
+
+Usage (from the repository root):
+    python -m Benchmarks.benchmark_manifest_runner --manifest manifest.yml --workers 4
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+VALIDATION_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Data Validation")
+sys.path.insert(0, VALIDATION_DIR)
+
+from run_manifest import load_manifest  # noqa: E402
+
+
+def run(command: list[str]) -> float:
+    """Runs a command with the repository on PYTHONPATH and returns its wall-clock seconds."""
+    repository_root = os.path.dirname(VALIDATION_DIR)
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([repository_root, VALIDATION_DIR])}
+    started = time.perf_counter()
+    subprocess.run(command, check=False, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--manifest", type=str, required=True, help="Manifest to validate")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="run_manifest.py --workers")
+    parser.add_argument("--max_concurrency", type=int, default=4, help="run_manifest.py --max_concurrency")
+    args = parser.parse_args()
+
+    tasks = load_manifest(args.manifest)
+
+    loop_seconds = 0.0
+    for task in tasks:
+        loop_seconds += run([
+            sys.executable, os.path.join(VALIDATION_DIR, "run_expectations.py"),
+            "--db", task["db"],
+            "--expectation_suite", task["expectation_suite"],
+            "--data_source", task["data_source"],
+            "--data_connector", task["data_connector"],
+        ])
+
+    manifest_seconds = run([
+        sys.executable, os.path.join(VALIDATION_DIR, "run_manifest.py"),
+        "--manifest", args.manifest,
+        "--workers", str(args.workers),
+        "--max_concurrency", str(args.max_concurrency),
+    ])
+
+    print(f"databases={len(tasks)} workers={args.workers} max_concurrency={args.max_concurrency}")
+    print(f"{'run_expectations.py per database':<34} {loop_seconds:8.2f} s")
+    print(f"{'run_manifest.py':<34} {manifest_seconds:8.2f} s")
+    print(f"{'speedup':<34} {loop_seconds / manifest_seconds:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
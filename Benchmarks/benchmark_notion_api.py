@@ -0,0 +1,185 @@
+"""
+Offline throughput benchmark of NotionAPI.
+
+Starts a local stand-in for Notion's API (see notion_server) seeded with a
+synthetic database using every property type, then measures in a fresh
+interpreter per variant:
+
+- query_db with each return type ("dataframe", "json", "NotionPage", and
+  "iter", whose generator is consumed);
+- the end-to-end "Data Validation/run_expectations.py" flow, with the native
+  engine and a suite of not-null, regex and range expectations over the
+  synthetic columns.
+
+For each one it reports rows/s, requests/s, p50 and p99 latency of the HTTP
+requests (429 retries included) and peak RSS. Nothing talks to Notion.
+
+Usage (from the repository root):
+    python -m Benchmarks.benchmark_notion_api --rows 20000 --columns 20 --latency 0.05 --rate_limit_every 25
+"""
+import argparse
+import json
+import os
+import resource
+import runpy
+import subprocess
+import sys
+import tempfile
+import time
+from Benchmarks.notion_server import NotionStandIn
+from Benchmarks.synthetic_notion import make_schema
+
+REPOSITORY_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+VALIDATION_DIR = os.path.join(REPOSITORY_ROOT, "Data Validation")
+
+RETURN_TYPES = ["dataframe", "json", "NotionPage", "iter"]
+API_KEY = "secret_" + "0" * 43
+
+
+def max_rss_mb() -> float:
+    """Returns the peak resident set size of this process in MB."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Returns a percentile (nearest rank) of some values, 0 if there are none."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def time_requests(latencies: list[float]):
+    """Records the duration of every HTTP request NotionAPI sends (each retry counts)."""
+    from Notion.Notion_API import NotionAPI
+
+    session_request = NotionAPI._session_request
+
+    def timed_session_request(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return session_request(self, *args, **kwargs)
+        finally:
+            latencies.append(time.perf_counter() - started)
+
+    NotionAPI._session_request = timed_session_request
+
+
+def make_suite(columns: int) -> dict:
+    """Returns a suite of not-null, regex and range expectations over the synthetic columns."""
+    expectations = []
+    for name, property_type in make_schema(columns).items():
+        kwargs = {"column": name, "result_format": "BASIC"}
+        expectations.append({"expectation_type": "expect_column_values_to_not_be_null", "kwargs": kwargs, "meta": {}})
+        if property_type == "multi_select":
+            expectations.append({
+                "expectation_type": "expect_column_values_to_match_regex",
+                "kwargs": {**kwargs, "regex": r"(?:.+\,){1,}.+"},
+                "meta": {},
+            })
+        elif property_type == "number":
+            expectations.append({
+                "expectation_type": "expect_column_values_to_be_between",
+                "kwargs": {**kwargs, "min_value": 0, "max_value": 10000},
+                "meta": {},
+            })
+    return {"expectation_suite_name": "synthetic", "data_asset_type": "Dataset", "expectations": expectations}
+
+
+def run_variant(args):
+    """Runs one variant against the stand-in and prints its measurements as JSON."""
+    from Notion.Notion_API import NotionAPI
+    from Notion.Notion_Rate_Limit import RequestScheduler
+
+    latencies = []
+    time_requests(latencies)
+    baseline = max_rss_mb()
+    started = time.perf_counter()
+
+    if args.variant == "run_expectations":
+        sys.argv = [
+            "run_expectations.py", "--db", args.db, "--engine", "native", "--suite_file", args.suite_file,
+            "--notion_base_url", args.base_url, "--requests_per_second", str(args.requests_per_second),
+        ]
+        sys.path.insert(0, VALIDATION_DIR)
+        runpy.run_path(os.path.join(VALIDATION_DIR, "run_expectations.py"), run_name="__main__")
+        rows = args.rows
+    else:
+        scheduler = RequestScheduler(rate=args.requests_per_second, burst=args.requests_per_second)
+        with NotionAPI(API_KEY, base_url=args.base_url, scheduler=scheduler) as notion:
+            results = notion.query_db(args.db, return_type=args.variant)
+            rows = sum(1 for _ in results) if args.variant == "iter" else len(results)
+
+    seconds = time.perf_counter() - started
+    print(json.dumps({
+        "rows": rows,
+        "seconds": seconds,
+        "requests": len(latencies),
+        "p50": percentile(latencies, 0.50),
+        "p99": percentile(latencies, 0.99),
+        "peak_mb": max_rss_mb() - baseline,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=20000, help="Pages in the database. Default: 20000")
+    parser.add_argument("--columns", type=int, default=20, help="Properties in the database. Default: 20")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response. Default: 0")
+    parser.add_argument("--rate_limit_every", type=int, default=0, help="Answer every n-th request with 429")
+    parser.add_argument("--retry_after", type=float, default=0.1, help="Retry-After of the 429s. Default: 0.1")
+    parser.add_argument(
+        "--requests_per_second", type=float, default=1000.0,
+        help="Client rate limit. Default: 1000, i.e. only the server's pace (Notion allows 3)",
+    )
+    parser.add_argument("--variants", nargs="+", default=RETURN_TYPES + ["run_expectations"], help="Variants to run")
+    parser.add_argument("--variant", type=str, help=argparse.SUPPRESS)
+    parser.add_argument("--base_url", type=str, help=argparse.SUPPRESS)
+    parser.add_argument("--db", type=str, help=argparse.SUPPRESS)
+    parser.add_argument("--suite_file", type=str, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.variant:
+        run_variant(args)
+        return
+
+    server = NotionStandIn.synthetic(
+        args.rows, args.columns, latency=args.latency,
+        rate_limit_every=args.rate_limit_every, retry_after=args.retry_after,
+    )
+    env = {
+        **os.environ,
+        "NOTION_API_KEY": API_KEY,
+        "PYTHONPATH": os.pathsep.join([REPOSITORY_ROOT, VALIDATION_DIR]),
+    }
+    with server, tempfile.TemporaryDirectory() as directory:
+        suite_file = os.path.join(directory, "suite.json")
+        with open(suite_file, "w") as suite:
+            json.dump(make_suite(args.columns), suite)
+
+        print(
+            f"rows={args.rows} columns={args.columns} latency={args.latency}s "
+            f"rate_limit_every={args.rate_limit_every} requests_per_second={args.requests_per_second}"
+        )
+        print(f"{'variant':<18} {'rows/s':>10} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'429s':>6} {'peak MB':>8}")
+        for variant in args.variants:
+            rate_limited = server.rate_limited
+            command = [
+                sys.executable, "-m", "Benchmarks.benchmark_notion_api", "--variant", variant,
+                "--base_url", server.base_url, "--db", server.db_ids[0], "--suite_file", suite_file,
+                "--rows", str(args.rows), "--requests_per_second", str(args.requests_per_second),
+            ]
+            output = subprocess.run(
+                command, check=True, capture_output=True, text=True, cwd=REPOSITORY_ROOT, env=env
+            ).stdout
+            measured = json.loads(output.strip().splitlines()[-1])
+            print(
+                f"{variant:<18} {measured['rows'] / measured['seconds']:10,.0f} "
+                f"{measured['requests'] / measured['seconds']:8.1f} "
+                f"{measured['p50'] * 1000:8.1f} {measured['p99'] * 1000:8.1f} "
+                f"{server.rate_limited - rate_limited:6d} {measured['peak_mb']:8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
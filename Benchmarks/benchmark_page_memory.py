@@ -0,0 +1,123 @@
+"""
+Memory benchmark of NotionPage objects.
+
+Compares peak RSS of holding a whole database as NotionPage objects with the
+lazy __slots__ classes in Notion/Notion_Page.py against the previous eager,
+dict-backed classes (reproduced below as Eager*). Each variant runs in its
+own subprocess so peak RSS is not shared between them.
+
+Usage (from the repository root):
+    python -m Benchmarks.benchmark_page_memory --rows 50000 --columns 20
+"""
+import argparse
+import gc
+import resource
+import subprocess
+import sys
+from Benchmarks.synthetic_notion import make_pages, make_schema
+from Notion.Notion_Page import NotionPage
+
+
+class EagerNotionRichTextObject:
+    """Rich text object copying its fields, as before the __slots__ rewrite."""
+
+    def __init__(self, rich_text_object: dict):
+        self.plain_text = rich_text_object["plain_text"]
+        self.href = rich_text_object["href"]
+        self.annotations = rich_text_object["annotations"]
+        self.type = rich_text_object["type"]
+
+
+class EagerNotionPageProperty:
+    """Page property copying its fields, as before the __slots__ rewrite."""
+
+    def __init__(self, page_property: dict):
+        self.id = page_property["id"]
+        self.type = page_property["type"]
+        self.value = page_property.get(self.type)
+
+    def get_value(self):
+        if self.type == "checkbox":
+            return self.value
+        if not self.value:
+            return None
+        if self.type in ("title", "rich_text"):
+            return EagerNotionRichTextObject(self.value[0]).plain_text
+        if self.type in ("multi_select", "files"):
+            return [item["name"] for item in self.value]
+        if self.type == "relation":
+            return [relation["id"] for relation in self.value]
+        if self.type == "select":
+            return self.value["name"]
+        return self.value
+
+
+class EagerNotionPage:
+    """Page copying its fields and building every property up front."""
+
+    def __init__(self, page: dict):
+        self.id = page["id"]
+        self.created_time = page.get("created_time")
+        self.last_edited_time = page.get("last_edited_time")
+        self.archived = page.get("archived", False)
+        self.url = page.get("url")
+        self.properties = {
+            name: EagerNotionPageProperty(page_property)
+            for name, page_property in page["properties"].items()
+        }
+
+
+VARIANTS = {"eager": EagerNotionPage, "slots": NotionPage}
+
+
+def max_rss_mb() -> float:
+    """Returns the peak resident set size of this process in MB."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_variant(variant: str, rows: int, columns: int, decode: bool):
+    """Builds NotionPage objects for every page and prints peak RSS figures."""
+    json_results = make_pages(rows, make_schema(columns))
+    gc.collect()
+    baseline = max_rss_mb()
+
+    pages = [VARIANTS[variant](page) for page in json_results]
+    del json_results
+    if decode:
+        for page in pages:
+            for page_property in page.properties.values():
+                page_property.get_value()
+    gc.collect()
+
+    print(f"{baseline:.1f} {max_rss_mb():.1f} {len(pages)}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=50000, help="Number of pages. Default: 50000")
+    parser.add_argument("--columns", type=int, default=20, help="Number of properties. Default: 20")
+    parser.add_argument("--variant", choices=sorted(VARIANTS), help=argparse.SUPPRESS)
+    parser.add_argument("--decode", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.variant:
+        run_variant(args.variant, args.rows, args.columns, args.decode)
+        return
+
+    print(f"rows={args.rows} columns={args.columns} (peak RSS above the raw JSON)")
+    for decode in (False, True):
+        for variant in ("eager", "slots"):
+            command = [
+                sys.executable, "-m", "Benchmarks.benchmark_page_memory",
+                "--rows", str(args.rows), "--columns", str(args.columns), "--variant", variant,
+            ]
+            if decode:
+                command.append("--decode")
+            output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+            baseline, peak, _ = output.split()
+            label = f"{variant}, {'all values decoded' if decode else 'wrapped only'}"
+            print(f"{label:<32} {float(peak) - float(baseline):8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Startup benchmark of run_expectations.py.
+
+Each variant runs in a fresh interpreter, as a cron-started run would:
+
+- "import run_expectations": importing the runner module itself, which no
+  longer imports Great Expectations at module level;
+- "import great_expectations": what that import used to add on top;
+- "eager": Great Expectations imported and its context read, then the
+  Notion fetch (simulated with --fetch_seconds of sleep), one after the other;
+- "background": the same with GreatExpectationsLoader, so the fetch overlaps
+  with the import and the context loading.
+
+Requires Great Expectations and a Great Expectations project in --project_dir.
+
+Usage (from the repository root):
+    python -m Benchmarks.benchmark_startup --fetch_seconds 2 --repeat 3
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+REPOSITORY_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+VARIANTS = {
+    "import run_expectations": "import run_expectations",
+    "import great_expectations": "import great_expectations",
+    "eager": (
+        "import time, great_expectations as ge\n"
+        "ge.get_context()\n"
+        "time.sleep({fetch_seconds})\n"
+    ),
+    "background": (
+        "import time\n"
+        "from Validation.Validation_GE import GreatExpectationsLoader\n"
+        "loader = GreatExpectationsLoader().start()\n"
+        "time.sleep({fetch_seconds})\n"
+        "loader.get_context()\n"
+    ),
+}
+
+
+def run(code: str, project_dir: str) -> float:
+    """Runs Python code in a new interpreter and returns its wall-clock seconds."""
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join([REPOSITORY_ROOT, os.path.join(REPOSITORY_ROOT, "Data Validation")]),
+    }
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=project_dir, env=env, capture_output=True)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fetch_seconds", type=float, default=2.0, help="Simulated Notion fetch time. Default: 2")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per variant; the median is shown. Default: 3")
+    parser.add_argument("--project_dir", type=str, default=".", help="Great Expectations project directory")
+    args = parser.parse_args()
+
+    print(f"fetch_seconds={args.fetch_seconds} repeat={args.repeat} (median wall-clock seconds)")
+    for name, code in VARIANTS.items():
+        code = code.format(fetch_seconds=args.fetch_seconds)
+        seconds = [run(code, args.project_dir) for _ in range(args.repeat)]
+        print(f"{name:<28} {statistics.median(seconds):8.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,389 @@
+"""
+Local stand-in for Notion's API, for the benchmarks.
+
+Serves synthetic databases (see synthetic_notion) over HTTP with the
+endpoints NotionAPI uses:
+
+- GET  /v1/users
+- GET  /v1/databases/{id}
+- POST /v1/databases/{id}/query: cursors, has_more, page_size, filter_properties,
+  last_edited_time timestamp filters and sorts; archived pages are left out, as Notion does
+- GET  /v1/pages/{id}
+- GET  /v1/blocks/{id}/children: cursors, has_more and page_size
+
+Every response can be delayed by a fixed latency, and every n-th request
+can be answered with 429 and a Retry-After header, to exercise the
+client's rate limiting. Databases can be shared with only some API keys,
+like integrations in a workspace.
+
+Usage (from the repository root), to point a client at it by hand:
+    python -m Benchmarks.notion_server --rows 10000 --columns 20 --port 8765
+"""
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlsplit
+from Benchmarks.synthetic_notion import make_blocks, make_database, make_pages, make_schema
+
+MAX_PAGE_SIZE = 100
+NOT_FOUND = {"object": "error", "status": 404, "code": "object_not_found", "message": "Not found"}
+UNAUTHORIZED = {"object": "error", "status": 401, "code": "unauthorized", "message": "API token is invalid."}
+
+
+def _normalize_id(object_id: str) -> str:
+    return object_id.replace("-", "")
+
+
+class NotionStandIn:
+    """
+    Threaded HTTP server answering like Notion's API for a set of databases.
+
+    Usage:
+        with NotionStandIn.synthetic(rows=10000, columns=20) as server:
+            notion = NotionAPI("secret_...", base_url=server.base_url)
+            df = notion.query_db(server.db_ids[0])
+    """
+
+    def __init__(
+        self,
+        databases: dict[str, tuple[dict, list[dict]]],
+        latency: float = 0.0,
+        rate_limit_every: int = 0,
+        retry_after: float = 0.1,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        blocks: Optional[dict[str, list[dict]]] = None,
+        key_access: Optional[dict[str, list[str]]] = None,
+    ):
+        """
+        Initializes the server. It only listens once started.
+
+        Args:
+            databases (dict[str, tuple[dict, list[dict]]]): Database id to (database object, pages).
+            latency (float): Seconds every response is delayed by.
+            rate_limit_every (int): Answer every n-th request with 429. 0 never does.
+            retry_after (float): Retry-After seconds sent with the 429 responses.
+            host (str): Interface to listen on.
+            port (int): Port to listen on. 0 picks a free one.
+            blocks (Optional[dict[str, list[dict]]]): Page or block id to its child blocks, see make_blocks.
+                                                      Pages without an entry have no content.
+            key_access (Optional[dict[str, list[str]]]): API key to the ids of the databases shared with it.
+                                                         Other keys are answered 401. None lets any key read all.
+        """
+        self.databases = {}
+        self.pages = {}
+        for db_id, (database, pages) in databases.items():
+            indexes = {_normalize_id(page["id"]): index for index, page in enumerate(pages)}
+            self.databases[_normalize_id(db_id)] = (database, pages, indexes)
+            for page in pages:
+                self.pages[_normalize_id(page["id"])] = page
+        self.db_ids = list(databases)
+        self.blocks = {_normalize_id(parent_id): children for parent_id, children in (blocks or {}).items()}
+        self.block_ids = set(self.pages) | {
+            _normalize_id(block["id"]) for children in self.blocks.values() for block in children
+        }
+        self.latency = latency
+        self.rate_limit_every = rate_limit_every
+        self.retry_after = retry_after
+        self.key_access = None
+        if key_access is not None:
+            self.key_access = {key: {_normalize_id(db_id) for db_id in db_ids} for key, db_ids in key_access.items()}
+        self.requests = 0
+        self.requests_per_key = {}
+        self.rate_limited = 0
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.stand_in = self
+        self._thread = None
+
+    @classmethod
+    def synthetic(
+        cls,
+        rows: int = 10000,
+        columns: int = 20,
+        databases: int = 1,
+        seed: int = 0,
+        block_fanout: int = 0,
+        block_depth: int = 2,
+        **kwargs,
+    ) -> "NotionStandIn":
+        """
+        Returns a server seeded with synthetic databases using every property type.
+
+        Args:
+            rows (int): Pages per database.
+            columns (int): Properties per database.
+            databases (int): Number of databases.
+            seed (int): Seed of the synthetic values.
+            block_fanout (int): Top-level blocks of each page, and children of each toggle. 0 leaves pages empty.
+            block_depth (int): Levels of nested blocks under the top-level ones.
+            **kwargs: Other arguments of NotionStandIn.
+        """
+        schema = make_schema(columns)
+        seeded = {}
+        for index in range(databases):
+            db_id = f"{seed:08x}{index:024x}"
+            seeded[db_id] = (
+                make_database(db_id, schema, title=f"Synthetic database {index}"),
+                make_pages(rows, schema, seed=seed + index),
+            )
+        if block_fanout:
+            page_ids = [page["id"] for _, pages in seeded.values() for page in pages]
+            kwargs["blocks"] = make_blocks(page_ids, block_fanout, block_depth, seed=seed)
+        return cls(seeded, **kwargs)
+
+    @property
+    def base_url(self) -> str:
+        """Base URL to give to NotionAPI."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1/"
+
+    def start(self) -> "NotionStandIn":
+        """Starts serving in a background thread. Returns the server itself."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._server.serve_forever, name="notion-stand-in", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Stops serving and closes the socket."""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self) -> "NotionStandIn":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def touch_page(self, db_id: str, index: int, last_edited_time: str):
+        """
+        Marks a page as edited, as if someone changed it in Notion.
+
+        Args:
+            db_id (str): Database id.
+            index (int): Position of the page in the database.
+            last_edited_time (str): New last_edited_time, ISO 8601.
+        """
+        _, pages, _ = self.databases[_normalize_id(db_id)]
+        with self._lock:
+            pages[index]["last_edited_time"] = last_edited_time
+
+    def can_access(self, api_key: str, db_id: Optional[str] = None) -> bool:
+        """Returns whether an API key is known and, given a database id, whether that database is shared with it."""
+        if self.key_access is None:
+            return True
+        if api_key not in self.key_access:
+            return False
+        return db_id is None or _normalize_id(db_id) in self.key_access[api_key]
+
+    def _count_request(self, api_key: str) -> bool:
+        """Counts a request. Returns whether it must be answered with 429."""
+        with self._lock:
+            self.requests += 1
+            self.requests_per_key[api_key] = self.requests_per_key.get(api_key, 0) + 1
+            limited = self.rate_limit_every > 0 and self.requests % self.rate_limit_every == 0
+            if limited:
+                self.rate_limited += 1
+            return limited
+
+    def list_children(self, block_id: str, start_cursor: Optional[str], page_size: int) -> Optional[dict]:
+        """Returns the body of a block children response, None for an unknown page or block."""
+        if _normalize_id(block_id) not in self.block_ids:
+            return None
+        children = self.blocks.get(_normalize_id(block_id), [])
+
+        start = 0
+        if start_cursor:
+            positions = (
+                position for position, block in enumerate(children) if _normalize_id(block["id"]) == start_cursor
+            )
+            start = next(positions, len(children))
+        page_size = min(page_size, MAX_PAGE_SIZE)
+        has_more = start + page_size < len(children)
+        return {
+            "object": "list",
+            "results": children[start:start + page_size],
+            "next_cursor": children[start + page_size]["id"] if has_more else None,
+            "has_more": has_more,
+            "type": "block",
+            "block": {},
+        }
+
+    def query(self, db_id: str, body: dict, filter_properties: list[str]) -> Optional[dict]:
+        """Returns the body of a database query response, None for an unknown database."""
+        if _normalize_id(db_id) not in self.databases:
+            return None
+        _, pages, indexes = self.databases[_normalize_id(db_id)]
+
+        selected = pages
+        if any(page.get("archived") or page.get("in_trash") for page in pages):
+            selected = [page for page in pages if not (page.get("archived") or page.get("in_trash"))]
+        timestamp_filter = body.get("filter") or {}
+        if timestamp_filter.get("timestamp") == "last_edited_time":
+            condition = timestamp_filter["last_edited_time"]
+            if "on_or_after" in condition:
+                selected = [page for page in selected if page["last_edited_time"] >= condition["on_or_after"]]
+            if "after" in condition:
+                selected = [page for page in selected if page["last_edited_time"] > condition["after"]]
+        for sort in reversed(body.get("sorts") or []):
+            if sort.get("timestamp") in ("last_edited_time", "created_time"):
+                selected = sorted(
+                    selected, key=lambda page: page[sort["timestamp"]], reverse=sort.get("direction") == "descending"
+                )
+
+        start = 0
+        if body.get("start_cursor"):
+            cursor = _normalize_id(body["start_cursor"])
+            if selected is pages:
+                start = indexes.get(cursor, len(pages))
+            else:
+                positions = (position for position, page in enumerate(selected) if _normalize_id(page["id"]) == cursor)
+                start = next(positions, len(selected))
+        page_size = min(int(body.get("page_size", MAX_PAGE_SIZE)), MAX_PAGE_SIZE)
+        results = selected[start:start + page_size]
+        if filter_properties:
+            wanted = set(filter_properties)
+            results = [
+                {
+                    **page,
+                    "properties": {
+                        name: page_property for name, page_property in page["properties"].items()
+                        if page_property["id"] in wanted
+                    },
+                }
+                for page in results
+            ]
+
+        has_more = start + page_size < len(selected)
+        return {
+            "object": "list",
+            "results": results,
+            "next_cursor": selected[start + page_size]["id"] if has_more else None,
+            "has_more": has_more,
+            "type": "page",
+            "page": {},
+        }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        stand_in = self.server.stand_in
+        if self._rate_limited(stand_in):
+            return
+        url = urlsplit(self.path)
+        path = url.path
+
+        if not stand_in.can_access(self._api_key):
+            return self._send(401, UNAUTHORIZED)
+        if path.endswith("/v1/users"):
+            return self._send(200, {"object": "list", "results": [], "next_cursor": None, "has_more": False})
+        match = re.fullmatch(r".*/v1/databases/([^/]+)", path)
+        if match and not stand_in.can_access(self._api_key, match.group(1)):
+            return self._send(404, NOT_FOUND)
+        if match and _normalize_id(match.group(1)) in stand_in.databases:
+            return self._send(200, stand_in.databases[_normalize_id(match.group(1))][0])
+        match = re.fullmatch(r".*/v1/pages/([^/]+)", path)
+        if match and _normalize_id(match.group(1)) in stand_in.pages:
+            return self._send(200, stand_in.pages[_normalize_id(match.group(1))])
+        match = re.fullmatch(r".*/v1/blocks/([^/]+)/children", path)
+        if match:
+            params = parse_qs(url.query)
+            start_cursor = _normalize_id(params["start_cursor"][0]) if "start_cursor" in params else None
+            response = stand_in.list_children(
+                match.group(1), start_cursor, int(params.get("page_size", [MAX_PAGE_SIZE])[0])
+            )
+            if response is not None:
+                return self._send(200, response)
+        self._send(404, NOT_FOUND)
+
+    def do_POST(self):
+        stand_in = self.server.stand_in
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if self._rate_limited(stand_in):
+            return
+        url = urlsplit(self.path)
+
+        if not stand_in.can_access(self._api_key):
+            return self._send(401, UNAUTHORIZED)
+        match = re.fullmatch(r".*/v1/databases/([^/]+)/query", url.path)
+        response = None
+        if match and stand_in.can_access(self._api_key, match.group(1)):
+            filter_properties = parse_qs(url.query).get("filter_properties", [])
+            response = stand_in.query(match.group(1), json.loads(body or b"{}"), filter_properties)
+        if response is None:
+            return self._send(404, NOT_FOUND)
+        self._send(200, response)
+
+    def _rate_limited(self, stand_in: NotionStandIn) -> bool:
+        if stand_in.latency:
+            time.sleep(stand_in.latency)
+        if not stand_in._count_request(self._api_key):
+            return False
+        self._send(
+            429,
+            {"object": "error", "status": 429, "code": "rate_limited", "message": "Rate limited"},
+            {"Retry-After": str(stand_in.retry_after)},
+        )
+        return True
+
+    @property
+    def _api_key(self) -> str:
+        return (self.headers.get("Authorization") or "").removeprefix("Bearer ")
+
+    def _send(self, status: int, content: dict, headers: Optional[dict] = None):
+        body = json.dumps(content).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+        with self.server.stand_in._lock:
+            self.server.stand_in.bytes_sent += len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10000, help="Pages per database. Default: 10000")
+    parser.add_argument("--columns", type=int, default=20, help="Properties per database. Default: 20")
+    parser.add_argument("--databases", type=int, default=1, help="Number of databases. Default: 1")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response. Default: 0")
+    parser.add_argument("--rate_limit_every", type=int, default=0, help="Answer every n-th request with 429")
+    parser.add_argument("--block_fanout", type=int, default=0, help="Top-level blocks per page. Default: 0")
+    parser.add_argument("--block_depth", type=int, default=2, help="Levels of nested blocks. Default: 2")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on. Default: 8765")
+    args = parser.parse_args()
+
+    server = NotionStandIn.synthetic(
+        args.rows, args.columns, args.databases, block_fanout=args.block_fanout, block_depth=args.block_depth,
+        latency=args.latency, rate_limit_every=args.rate_limit_every, port=args.port,
+    )
+    print(f"Serving {len(server.db_ids)} databases of {args.rows} rows at {server.base_url}")
+    for db_id in server.db_ids:
+        print(f"  {db_id}")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._server.server_close()
+
+
+if __name__ == "__main__":
+    main()
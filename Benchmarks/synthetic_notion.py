@@ -0,0 +1,210 @@
+"""
+Synthetic Notion objects for the benchmarks.
+
+Pages use every property type handled by NotionPageProperty.get_value and
+roughly one value in seven is left empty, so conversions exercise both paths.
+Relations link the pages of a database together.
+Page content is a tree of headings, paragraphs, list items and toggles, the
+toggles holding the nested blocks.
+"""
+import random
+import uuid
+
+PROPERTY_TYPES = [
+    "title",
+    "rich_text",
+    "relation",
+    "multi_select",
+    "phone_number",
+    "rollup",
+    "url",
+    "date",
+    "select",
+    "email",
+    "files",
+    "number",
+    "checkbox",
+]
+
+LANGUAGES = ["English", "Spanish", "French", "German", "Portuguese", "Italian"]
+COUNTRIES = ["Spain", "France", "Germany", "Portugal", "Italy", "Mexico", "Chile"]
+BLOCK_TYPES = ["heading_2", "paragraph", "bulleted_list_item", "to_do", "toggle"]
+
+
+def make_schema(n_columns: int = 20) -> dict[str, str]:
+    """
+    Returns a database schema (property name to property type).
+
+    The first property is the title; the rest cycle through every other
+    supported type until n_columns properties exist.
+    """
+    schema = {"Name": "title"}
+    other_types = PROPERTY_TYPES[1:]
+    for i in range(n_columns - 1):
+        property_type = other_types[i % len(other_types)]
+        schema[f"{property_type} {i}"] = property_type
+    return schema
+
+
+def make_id(rng: random.Random) -> str:
+    """Returns a random, dash-formatted Notion id."""
+    return str(uuid.UUID(int=rng.getrandbits(128)))
+
+
+def make_rich_text(text: str) -> list[dict]:
+    """Returns a rich text array with a single text object."""
+    return [
+        {
+            "type": "text",
+            "text": {"content": text, "link": None},
+            "annotations": {
+                "bold": False,
+                "italic": False,
+                "strikethrough": False,
+                "underline": False,
+                "code": False,
+                "color": "default",
+            },
+            "plain_text": text,
+            "href": None,
+        }
+    ]
+
+
+def make_value(property_type: str, i: int, rng: random.Random):
+    """Returns a (possibly empty) property value of the given type."""
+    empty = rng.random() < 1 / 7
+    if property_type == "checkbox":
+        return rng.random() < 0.5
+    if property_type in ("title", "rich_text"):
+        return [] if empty else make_rich_text(f"{property_type} value {i}")
+    if property_type == "relation":
+        return [] if empty else [{"id": make_id(rng)} for _ in range(rng.randint(1, 3))]
+    if property_type == "multi_select":
+        return [] if empty else [{"name": name} for name in rng.sample(LANGUAGES, rng.randint(1, 3))]
+    if empty:
+        return None
+    if property_type == "phone_number":
+        return f"+34 6{rng.randint(10000000, 99999999)}"
+    if property_type == "rollup":
+        return {"type": "number", "number": rng.randint(0, 5000), "function": "sum"}
+    if property_type == "url":
+        return f"https://example.com/{i}"
+    if property_type == "date":
+        return {"start": f"19{rng.randint(50, 99)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}", "end": None}
+    if property_type == "select":
+        return {"id": make_id(rng), "name": rng.choice(COUNTRIES), "color": "default"}
+    if property_type == "email":
+        return f"user{i}@example.com"
+    if property_type == "files":
+        return [{"name": f"file_{i}.pdf", "type": "external", "external": {"url": f"https://example.com/{i}.pdf"}}]
+    if property_type == "number":
+        return rng.randint(0, 10000)
+    return None
+
+
+def make_page(i: int, schema: dict[str, str], rng: random.Random) -> dict:
+    """Returns a page object as returned by a database query."""
+    properties = {}
+    for j, (name, property_type) in enumerate(schema.items()):
+        properties[name] = {
+            "id": "title" if property_type == "title" else f"p{j:03d}",
+            "type": property_type,
+            property_type: make_value(property_type, i, rng),
+        }
+
+    return {
+        "object": "page",
+        "id": make_id(rng),
+        "created_time": f"2021-{1 + i % 12:02d}-{1 + i % 28:02d}T10:00:00.000Z",
+        "last_edited_time": f"2022-{1 + i % 12:02d}-{1 + i % 28:02d}T10:{i % 60:02d}:00.000Z",
+        "archived": False,
+        "url": f"https://www.notion.so/{i}",
+        "properties": properties,
+    }
+
+
+def make_pages(n_rows: int, schema: dict[str, str], seed: int = 0) -> list[dict]:
+    """
+    Returns n_rows page objects for a schema.
+
+    Relations point to pages of the same list, except roughly one in ten which
+    points to a page that does not exist (e.g. one not shared with the integration).
+    """
+    rng = random.Random(seed)
+    pages = [make_page(i, schema, rng) for i in range(n_rows)]
+
+    link_rng = random.Random(seed + 1)
+    for page in pages:
+        for page_property in page["properties"].values():
+            if page_property["type"] != "relation":
+                continue
+            for relation in page_property["relation"]:
+                if link_rng.random() >= 0.1:
+                    relation["id"] = link_rng.choice(pages)["id"]
+    return pages
+
+
+def make_database(db_id: str, schema: dict[str, str], title: str = "Synthetic database") -> dict:
+    """Returns a database object as returned by GET /v1/databases/{id}."""
+    properties = {}
+    for j, (name, property_type) in enumerate(schema.items()):
+        properties[name] = {
+            "id": "title" if property_type == "title" else f"p{j:03d}",
+            "name": name,
+            "type": property_type,
+            property_type: {},
+        }
+
+    return {
+        "object": "database",
+        "id": db_id,
+        "title": make_rich_text(title),
+        "created_time": "2021-01-01T10:00:00.000Z",
+        "last_edited_time": "2022-01-01T10:00:00.000Z",
+        "properties": properties,
+    }
+
+
+def make_block(block_type: str, text: str, has_children: bool, rng: random.Random) -> dict:
+    """Returns a block object as returned by GET /v1/blocks/{id}/children."""
+    payload = {"rich_text": make_rich_text(text), "color": "default"}
+    if block_type == "to_do":
+        payload["checked"] = rng.random() < 0.5
+    return {
+        "object": "block",
+        "id": make_id(rng),
+        "created_time": "2021-01-01T10:00:00.000Z",
+        "last_edited_time": "2022-01-01T10:00:00.000Z",
+        "has_children": has_children,
+        "archived": False,
+        "type": block_type,
+        block_type: payload,
+    }
+
+
+def make_blocks(page_ids: list[str], fanout: int = 10, depth: int = 2, seed: int = 0) -> dict[str, list[dict]]:
+    """
+    Returns the content of pages: parent (page or block) id to its children.
+
+    Each page has fanout top-level blocks, the first one a heading; every
+    toggle holds fanout more blocks, down to depth levels of nesting.
+    """
+    # Seeded apart from make_pages, so block ids do not repeat page ids.
+    rng = random.Random(f"blocks {seed}")
+    children = {}
+
+    def add_children(parent_id: str, level: int):
+        blocks = []
+        for i in range(fanout):
+            block_type = BLOCK_TYPES[0] if level == 0 and i == 0 else rng.choice(BLOCK_TYPES)
+            has_children = block_type == "toggle" and level < depth
+            block = make_block(block_type, f"{block_type} {level}.{i}", has_children, rng)
+            blocks.append(block)
+            if has_children:
+                add_children(block["id"], level + 1)
+        children[parent_id] = blocks
+
+    for page_id in page_ids:
+        add_children(page_id, 0)
+    return children
@@ -1,14 +1,15 @@
 # initialize_notion.py
 
 import os
-from Notion.NotionAPI import NotionAPI
+from Notion.Notion_API import NotionAPI
 
 def main():
     # Set your environment variables
     NOTION_API_KEY = os.environ.get("NOTION_API_KEY")
     
     # Initialize NotionAPI
-    notion = NotionAPI(NOTION_API_KEY)
+    with NotionAPI(NOTION_API_KEY):
+        pass
     
     # Print a success message
     print("NotionAPI successfully initialized.")
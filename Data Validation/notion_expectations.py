@@ -1,16 +1,27 @@
 import os
 import great_expectations as ge
-from Notion.NotionAPI import NotionAPI
+from Notion.Notion_API import NotionAPI
+from Notion.Notion_Snapshot import read_snapshot
 
 def main():
     # Set your environment variables
     NOTION_API_KEY = os.environ.get("NOTION_API_KEY")
     dbid = "https://www.notion.so/29965940ff704020b78b7ec20dc063c6?v=f7f9dce03b6447278ebb7b2453143c43"
     expectation_suite_name = "example_3_columns_and_2_languages"
+    # Optional Parquet (or .arrow) snapshot of the database, e.g. notion_snapshot.parquet.
+    # Once written, the suite is authored against it without querying Notion again.
+    NOTION_SNAPSHOT = os.environ.get("NOTION_SNAPSHOT")
 
     # Initialize NotionAPI and query the database
-    notion = NotionAPI(NOTION_API_KEY)
-    notion_df = notion.query_db(dbid, return_type="dataframe")
+    if NOTION_SNAPSHOT and os.path.exists(NOTION_SNAPSHOT):
+        notion_df = read_snapshot(NOTION_SNAPSHOT)
+    else:
+        with NotionAPI(NOTION_API_KEY) as notion:
+            if NOTION_SNAPSHOT:
+                notion.snapshot_db(dbid, NOTION_SNAPSHOT)
+                notion_df = read_snapshot(NOTION_SNAPSHOT)
+            else:
+                notion_df = notion.query_db(dbid, return_type="dataframe")
 
     # Initialize Great Expectations context and convert DataFrame
     context = ge.get_context()
@@ -1,10 +1,18 @@
 import argparse
+import json
 import logging
 import os
-import great_expectations as ge
-from great_expectations.checkpoint import Checkpoint
-from great_expectations.core.batch import RuntimeBatchRequest
-from Notion.NotionAPI import NotionAPI
+from Notion.Notion_API import NotionAPI
+from Notion.Notion_Metrics import Metrics
+from Notion.Notion_Page_Cache import NotionPageCache
+from Notion.Notion_Rate_Limit import RequestScheduler
+from Notion.Notion_Response_Cache import ResponseCache
+from Notion.Notion_Snapshot import iter_snapshot, read_snapshot, read_snapshot_metadata
+from Validation.Validation_GE import GreatExpectationsLoader
+from Validation.Validation_Incremental import IncrementalValidator
+from Validation.Validation_Plan import PlanCache, get_default_plan_cache
+from Validation.Validation_Sampling import ReservoirSampler, StratifiedSampler, cochran_sample_size
+from Validation.Validation_Stream import StreamValidator, validate_stream
 
 def setup_logging():
     log = logging.getLogger("notion")
@@ -42,90 +50,212 @@ def parse_arguments():
         help="Run name. This will appear on the Data Docs. Default is 'None'",
         default="None",
     )
-    args = parser.parse_args()
-    return args
-
-def main():
-    log = setup_logging()
-    log.info("Starting the script...")
-
-    args = parse_arguments()
-    log.info("Parsed arguments: %s", args)
-
-    notion = NotionAPI(os.environ.get("NOTION_API_KEY"))
-    notion_df = notion.query_db(args.db, return_type="dataframe")
-    context = ge.get_context()
-    df = ge.from_pandas(notion_df)
-
-    checkpoint = Checkpoint(
-        context=context,
-        datasource=args.data_source,
-        data_connector_name=args.data_connector,
+    parser.add_argument(
+        "--incremental_cache",
+        type=str,
+        help="Path of a local page cache. If given, only pages edited since the "
+        "previous run are downloaded and merged into the cache. With --engine native, "
+        "the suite's metrics are stored in it too and only recomputed for changed pages. Default: disabled",
+        default=None,
     )
-    batch_request = RuntimeBatchRequest(
-        datasource_name=args.data_source,
-        data_connector_name=args.data_connector,
-        data_asset_name=args.db,
+    parser.add_argument(
+        "--reconcile",
+        action="store_true",
+        help="With --incremental_cache, list the ids of every page (title only) to drop the pages "
+        "deleted, archived or moved out of the database from the cache.",
     )
-    checkpoint_result = checkpoint.run(batch_request=batch_request)
-
-    log.info("Checkpoint result: %s", checkpoint_result)
-
-if __name__ == "__main__":
-    main()
-
-def main():
-    log = logging.getLogger("notion")
-    logging.basicConfig()
-    log.setLevel(logging.DEBUG)
-
-    # Parse arguments
-    parser = argparse.ArgumentParser()
     parser.add_argument(
-        "--db",
+        "--reconcile_interval",
+        type=float,
+        help="With --incremental_cache, reconcile (see --reconcile) whenever the previous "
+        "reconciliation is older than this many seconds. Default: 86400",
+        default=86400,
+    )
+    parser.add_argument(
+        "--response_cache",
         type=str,
-        help="Notion's database id",
+        help="Path of a persistent cache for database schema and page lookups. Default: disabled",
+        default=None,
     )
     parser.add_argument(
-        "--data_source",
+        "--response_cache_ttl",
+        type=float,
+        help="Seconds a cached schema or page is reused without asking Notion. Default: 3600",
+        default=3600.0,
+    )
+    parser.add_argument(
+        "--engine",
         type=str,
-        help="Data source to use. Default: my_notion_pandas_data_source",
-        default="my_notion_pandas_data_source",
+        choices=["ge", "native"],
+        help="Validation engine. 'native' evaluates null and regex expectations without "
+        "Great Expectations (falling back to it for other types) and skips the Data Docs. Default: ge",
+        default="ge",
     )
     parser.add_argument(
-        "--data_connector",
+        "--suite_file",
         type=str,
-        help="Data connector to use. Default: my_notion_pandas_data_connector",
-        default="my_notion_pandas_data_connector",
+        help="With --engine native, path of the expectation suite JSON, e.g. Expectations/expectation_suite.json",
+        default=None,
     )
     parser.add_argument(
-        "--expectation_suite",
+        "--result_file",
         type=str,
-        help="Expectation suite name to be used. Must be previously configured.",
+        help="With --engine native, path where the validation result JSON is written. Default: only logged",
+        default=None,
     )
     parser.add_argument(
-        "--run_name",
+        "--plan_cache",
         type=str,
-        help="Run name. This will appear on the Data Docs. Default is 'None'",
-        default="None",
+        help="With --engine native, directory where compiled suites are cached across runs. Default: disabled",
+        default=None,
+    )
+    parser.add_argument(
+        "--project",
+        action="store_true",
+        help="Only fetch and decode the columns the suite in --suite_file uses. Ignored if "
+        "the suite has table-level expectations, which need every column.",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="With --engine native, validate each page of results as it is fetched instead "
+        "of building the whole database first. Only one page of results is held in memory.",
+    )
+    parser.add_argument(
+        "--sample",
+        type=str,
+        help="Validate a random sample of this many rows instead of the whole database, "
+        "or 'auto' to size it with Cochran's formula. Default: disabled",
+        default=None,
+    )
+    parser.add_argument(
+        "--stratify_by",
+        type=str,
+        help="With --sample, sample that many rows per value of this column. Default: disabled",
+        default=None,
+    )
+    parser.add_argument(
+        "--margin_of_error",
+        type=float,
+        help="With --sample auto, accepted error of the estimated unexpected rate. Default: 0.05",
+        default=0.05,
+    )
+    parser.add_argument(
+        "--confidence",
+        type=float,
+        help="With --sample auto, confidence level of the estimate. Default: 0.95",
+        default=0.95,
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        help="Seed of the sampling, for reproducible samples. Default: random",
+        default=None,
+    )
+    parser.add_argument(
+        "--fail_fast",
+        action="store_true",
+        help="With --engine native, stop fetching as soon as every expectation has failed. "
+        "Every expectation of the suite must be evaluated natively.",
+    )
+    parser.add_argument(
+        "--error_budget",
+        type=int,
+        help="With --engine native, stop fetching once more unexpected values than this "
+        "were found, and fail. Expectations not evaluated natively are then validated on the "
+        "rows sampled so far. Default: disabled",
+        default=None,
+    )
+    parser.add_argument(
+        "--snapshot",
+        type=str,
+        help="Path of a Parquet (or .arrow) snapshot of the database. The database is validated "
+        "from the snapshot, which is only fetched from Notion if it does not exist yet. Default: disabled",
+        default=None,
+    )
+    parser.add_argument(
+        "--refresh_snapshot",
+        action="store_true",
+        help="With --snapshot, fetch the database again and overwrite the snapshot before validating.",
+    )
+    parser.add_argument(
+        "--notion_base_url",
+        type=str,
+        help="Base URL of Notion's API, e.g. a local stand-in. Default: https://api.notion.com/v1/",
+        default="https://api.notion.com/v1/",
+    )
+    parser.add_argument(
+        "--requests_per_second",
+        type=float,
+        help="Requests per second sent to Notion's API with each key. Default: 3, Notion's limit per integration",
+        default=None,
+    )
+    parser.add_argument(
+        "--metrics_file",
+        type=str,
+        help="Path where the run's stage timings and request counters are written as JSON. "
+        "They are logged in any case. Default: only logged",
+        default=None,
+    )
+    parser.add_argument(
+        "--prometheus_file",
+        type=str,
+        help="Path where the run's metrics are written in Prometheus' text format, e.g. for "
+        "node_exporter's textfile collector. Default: disabled",
+        default=None,
+    )
+    parser.add_argument(
+        "--profile_dir",
+        type=str,
+        help="Directory where a cProfile of each stage (<stage>.prof) is written. Default: disabled",
+        default=None,
     )
     args = parser.parse_args()
-    log.info("Successfully parsed arguments")
+    if (args.engine == "native" or args.project) and not args.suite_file:
+        parser.error("--engine native and --project require --suite_file")
+    if args.engine != "native" and (args.stream or args.fail_fast or args.error_budget is not None):
+        parser.error("--stream, --fail_fast and --error_budget require --engine native")
+    if args.incremental_cache and (args.stream or args.sample or args.fail_fast or args.error_budget is not None):
+        parser.error("--incremental_cache cannot be combined with --stream, --sample, --fail_fast or --error_budget")
+    if args.snapshot and args.incremental_cache:
+        parser.error("--snapshot cannot be combined with --incremental_cache")
+    if args.refresh_snapshot and not args.snapshot:
+        parser.error("--refresh_snapshot requires --snapshot")
+    if args.sample not in (None, "auto") and not args.sample.isdigit():
+        parser.error("--sample must be a number of rows or 'auto'")
+    return args
 
-    # Loading and testing Notion API key
-    log.info("Parsing Notion API key and testing connection")
-    notion = NotionAPI(os.environ.get("NOTION_API_KEY"))
+def build_sampler(args):
+    """Returns the sampler requested on the command line, None to validate every row."""
+    if args.sample is None:
+        return None
 
-    # Query database
-    log.info(f"Querying database: {args.db}")
-    directory_df = notion.query_db(args.db, return_type="dataframe")
-    db_title = notion.get_db_title(args.db)
-    df = ge.from_pandas(directory_df)
-    log.info("Queried Notion and got database as a pandas dataframe")
+    if args.sample == "auto":
+        size = cochran_sample_size(margin_of_error=args.margin_of_error, confidence=args.confidence)
+    else:
+        size = int(args.sample)
+    if args.stratify_by:
+        return StratifiedSampler(args.stratify_by, size, seed=args.seed)
+    return ReservoirSampler(size, seed=args.seed)
 
-    # Great Expectations
-    log.info("Reading Great Expectations' context")
-    context = ge.get_context()
+def build_checkpoint(
+    context, df, db_title, expectation_suite, data_source, data_connector
+):
+    """Builds the checkpoint validating one Notion database against one suite.
+
+    Args:
+        context: Great Expectations data context
+        df: Database contents, as returned by ge.from_pandas
+        db_title (str): Database title, used as data asset name in the Data Docs
+        expectation_suite (str): Expectation suite name
+        data_source (str): Data source to use
+        data_connector (str): Data connector to use
+
+    Returns:
+        Checkpoint: Checkpoint storing the result and updating the Data Docs
+    """
+    from great_expectations.checkpoint import Checkpoint
+    from great_expectations.core.batch import RuntimeBatchRequest
 
     checkpoint_name = "notion_checkpoint"
     action_list = [
@@ -137,8 +267,8 @@ def main():
     ]
 
     batch_request = RuntimeBatchRequest(
-        datasource_name=args.data_source,
-        data_connector_name=args.data_connector,
+        datasource_name=data_source,
+        data_connector_name=data_connector,
         data_asset_name=db_title,
         batch_identifiers={"default_identifier_name": "default_identifier"},
         runtime_parameters={"batch_data": df},
@@ -150,19 +280,229 @@ def main():
         "validations": [
             {
                 "batch_request": batch_request,
-                "expectation_suite_name": args.expectation_suite,
+                "expectation_suite_name": expectation_suite,
                 "action_list": action_list,
             }
         ],
     }
 
-    checkpoint = Checkpoint(
-        name=checkpoint_name, data_context=context, **checkpoint_config
+    return Checkpoint(name=checkpoint_name, data_context=context, **checkpoint_config)
+
+def summarize_checkpoint_result(checkpoint_result):
+    """Returns the success flag and statistics of a checkpoint run as a plain dict."""
+    statistics = {}
+    for run_result in checkpoint_result.run_results.values():
+        statistics = dict(run_result["validation_result"].statistics)
+
+    return {"success": bool(checkpoint_result.success), "statistics": statistics}
+
+def report_metrics(metrics, args, log):
+    """Logs the run's metrics and writes them to the requested files."""
+    log.info(f"Metrics: {metrics.to_json()}")
+    if args.metrics_file:
+        with open(args.metrics_file, "w") as metrics_file:
+            json.dump(metrics.to_dict(), metrics_file, indent=2)
+    if args.prometheus_file:
+        metrics.write_prometheus(args.prometheus_file, labels={"db": args.db, "run_name": args.run_name})
+
+def load_validator(args, metrics, log):
+    """
+    Loads the suite, if one is given.
+
+    Returns:
+        tuple: The native validator (None with --engine ge) and the columns to fetch (None for every column)
+    """
+    if not args.suite_file:
+        return None, None
+
+    plans = PlanCache(args.plan_cache) if args.plan_cache else get_default_plan_cache()
+    with metrics.stage("load_suite"):
+        suite_validator = plans.load(args.suite_file)
+    validator = suite_validator if args.engine == "native" else None
+    if validator is not None and validator.fallback and args.fail_fast:
+        raise SystemExit(
+            f"--fail_fast cannot be used with {args.suite_file}: {len(validator.fallback)} of its "
+            "expectations are not evaluated natively"
+        )
+
+    columns = None
+    if args.project:
+        columns = suite_validator.get_columns()
+        if columns is None:
+            log.warning("The suite has table-level expectations, fetching every column")
+    return validator, columns
+
+def is_streaming(args, validator):
+    """Returns whether the native validation runs chunk by chunk while the database is read."""
+    return validator is not None and (
+        args.stream or args.sample is not None or args.fail_fast or args.error_budget is not None
     )
 
-    log.info("Running validation")
-    checkpoint.run(run_name=args.run_name)
+def consume_chunks(chunks, validator, sampler, args, log):
+    """
+    Validates the chunks of a database while they are read (--stream, --fail_fast, --error_budget),
+    or samples them (--sample).
+
+    Returns:
+        tuple: The sampled rows and None, or None and the validation result when validating while streaming
+    """
+    if is_streaming(args, validator):
+        log.info("Validating while streaming the database")
+        stream = StreamValidator(validator, sampler, args.fail_fast, args.error_budget)
+        return None, validate_stream(stream, chunks, run_name=args.run_name)
+
+    for chunk in chunks:
+        sampler.add(chunk)
+    directory_df = sampler.get_sample()
+    log.info(f"Sampled {len(directory_df)} of {sampler.rows_seen} rows")
+    return directory_df, None
+
+def read_from_snapshot(args, validator, sampler, columns, log):
+    """
+    Reads the database from its memory-mapped snapshot; Notion is not queried at all.
+
+    Returns:
+        tuple: Database title, rows to validate (None if already validated) and validation result (or None)
+    """
+    log.info(f"Reading database from snapshot: {args.snapshot}")
+    snapshot_metadata = read_snapshot_metadata(args.snapshot)
+    log.info(f"Snapshot of {snapshot_metadata['rows']} rows taken at {snapshot_metadata['created_time']}")
+    db_title = snapshot_metadata["title"]
+    if sampler is not None or is_streaming(args, validator):
+        chunks = iter_snapshot(args.snapshot, chunk_size=1000, columns=columns)
+        return (db_title, *consume_chunks(chunks, validator, sampler, args, log))
+    return db_title, read_snapshot(args.snapshot, columns=columns), None
+
+def fetch_from_notion(notion, args, validator, sampler, columns, log):
+    """
+    Queries the database from Notion.
+
+    Returns:
+        tuple: Database title, rows to validate (None if already validated) and validation result (or None)
+    """
+    log.info(f"Querying database: {args.db}")
+    directory_df = result = None
+    if sampler is not None or is_streaming(args, validator):
+        chunks = notion.iter_db(args.db, return_type="dataframe", columns=columns)
+        directory_df, result = consume_chunks(chunks, validator, sampler, args, log)
+    elif args.incremental_cache:
+        query = notion.select_columns(args.db, columns) if columns is not None else ""
+        with NotionPageCache(args.incremental_cache) as cache:
+            if validator is None:
+                directory_df = notion.sync_db(
+                    args.db,
+                    cache,
+                    query=query,
+                    return_type="dataframe",
+                    reconcile=args.reconcile,
+                    reconcile_interval=args.reconcile_interval,
+                )
+            else:
+                # Only the pages of changed buckets are decoded and evaluated again.
+                notion.sync_db(
+                    args.db,
+                    cache,
+                    query=query,
+                    return_type=None,
+                    reconcile=args.reconcile,
+                    reconcile_interval=args.reconcile_interval,
+                )
+                with IncrementalValidator(validator, args.incremental_cache) as incremental:
+                    scope = notion.get_cache_scope(args.db, query)
+                    result = incremental.validate(cache, scope, run_name=args.run_name)
+    else:
+        directory_df = notion.query_db(args.db, return_type="dataframe", columns=columns)
+    return notion.get_db_title(args.db), directory_df, result
+
+def validate_natively(validator, directory_df, result, args, metrics, log):
+    """Validates the database with the native engine (unless it already was) and writes the result."""
+    if result is None:
+        log.info(f"Running native validation of {args.suite_file}")
+        with metrics.stage("validation"):
+            result = validator.validate(directory_df, run_name=args.run_name)
+    log.info(f"Validation {'succeeded' if result['success'] else 'failed'}: {result['statistics']}")
+    if args.result_file:
+        with open(args.result_file, "w") as result_file:
+            json.dump(result, result_file, indent=2)
+
+def validate_with_ge(ge_loader, directory_df, db_title, args, metrics, log):
+    """Validates the database with a Great Expectations checkpoint, which also updates the Data Docs."""
+    with metrics.stage("ge_context"):
+        context = ge_loader.get_context()
+    log.info(f"Read Great Expectations' context in {ge_loader.load_seconds:.2f}s")
+
+    with metrics.stage("validation"):
+        df = ge_loader.ge.from_pandas(directory_df)
+
+        checkpoint = build_checkpoint(
+            context,
+            df,
+            db_title,
+            args.expectation_suite,
+            args.data_source,
+            args.data_connector,
+        )
+
+        log.info("Running validation")
+        checkpoint.run(run_name=args.run_name)
     log.info("Done running validation. Check data docs to see result.")
 
+def main():
+    log = setup_logging()
+
+    args = parse_arguments()
+    log.info("Successfully parsed arguments")
+    metrics = Metrics(profile_dir=args.profile_dir)
+
+    # Great Expectations is imported, and its context read, while Notion is queried
+    ge_loader = None
+    if args.engine == "ge":
+        log.info("Reading Great Expectations' context in the background")
+        ge_loader = GreatExpectationsLoader().start()
+
+    validator, columns = load_validator(args, metrics, log)
+    sampler = build_sampler(args)
+
+    # Loading and testing Notion API key
+    # NOTION_API_KEY may hold several comma-separated keys: the queries of each database are
+    # spread across the keys of the integrations it is shared with, adding up their rate limits.
+    log.info("Parsing Notion API key and testing connection")
+    notion_options = {"base_url": args.notion_base_url}
+    if args.requests_per_second:
+        notion_options["scheduler"] = RequestScheduler(rate=args.requests_per_second)
+    response_cache = None
+    if args.response_cache:
+        response_cache = ResponseCache(args.response_cache, ttl=args.response_cache_ttl)
+        notion_options["response_cache"] = response_cache
+
+    try:
+        if args.snapshot and (args.refresh_snapshot or not os.path.exists(args.snapshot)):
+            # Every column is stored, so the snapshot serves any suite.
+            with NotionAPI(os.environ.get("NOTION_API_KEY"), **notion_options) as notion:
+                metrics.attach(notion)
+                log.info(f"Writing a snapshot of {args.db} to {args.snapshot}")
+                with metrics.stage("snapshot"):
+                    notion.snapshot_db(args.db, args.snapshot)
+
+        # When streaming, validation happens during (and is timed as part of) the fetch.
+        with metrics.stage("fetch"):
+            if args.snapshot:
+                db_title, directory_df, result = read_from_snapshot(args, validator, sampler, columns, log)
+            else:
+                with NotionAPI(os.environ.get("NOTION_API_KEY"), **notion_options) as notion:
+                    metrics.attach(notion)
+                    db_title, directory_df, result = fetch_from_notion(notion, args, validator, sampler, columns, log)
+    finally:
+        if response_cache is not None:
+            log.info(f"Response cache: {response_cache.hits} hits, {response_cache.misses} misses")
+            response_cache.close()
+    log.info("Got database as a pandas dataframe")
+
+    if validator is not None:
+        validate_natively(validator, directory_df, result, args, metrics, log)
+    else:
+        validate_with_ge(ge_loader, directory_df, db_title, args, metrics, log)
+    report_metrics(metrics, args, log)
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,247 @@
+"""
+Validates many Notion databases in one process.
+
+The manifest (JSON or YAML) maps databases to expectation suites:
+
+    defaults:
+      data_source: my_notion_pandas_data_source
+      data_connector: my_notion_pandas_data_connector
+      plan_cache: .plan_cache
+    databases:
+      - db: https://www.notion.so/29965940ff704020b78b7ec20dc063c6?v=f7f9dce03b6447278ebb7b2453143c43
+        expectation_suite: example_3_columns_and_2_languages
+      - db: 0b8d7b1f2c5e4c0e9a6a1f0b5d2e3c4a
+        expectation_suite: example_no_null_columns
+        query: {"filter": {"property": "Name", "title": {"is_not_empty": true}}}
+      - db: 5f0c2d7e9b1a4c3d8e6f7a8b9c0d1e2f
+        expectation_suite: example_no_null_columns
+        engine: native
+        suite_file: Expectations/no_null_columns_expectations.jsonc
+      - db: 7a1e3c5b9d2f4e6a8c0b1d3f5e7a9c2b
+        expectation_suite: example_3_columns_and_2_languages
+        snapshot: snapshots/languages.parquet
+
+Databases are fetched concurrently with AsyncNotionAPI and each one is handed
+to a process pool for validation as soon as it arrives, so fetching and
+validating overlap. Great Expectations is imported and its context loaded
+once per worker process instead of once per database. Entries with
+"engine: native" are evaluated by Validation.Validation_Native instead, and
+skip the Data Docs. Entries with a "snapshot" path are validated from that
+Parquet (or .arrow) snapshot, memory-mapped by the worker, once it exists;
+the first run fetches the database and writes it.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from Notion.Notion_Async_API import AsyncNotionAPI
+from Notion.Notion_Columnar import ColumnarConverter
+from Notion.Notion_Snapshot import read_snapshot, read_snapshot_metadata, write_snapshot
+
+_context = None
+
+
+def setup_logging():
+    log = logging.getLogger("notion")
+    logging.basicConfig()
+    log.setLevel(logging.DEBUG)
+    return log
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--manifest",
+        type=str,
+        required=True,
+        help="JSON or YAML file mapping Notion databases to expectation suites.",
+    )
+    parser.add_argument(
+        "--run_name",
+        type=str,
+        help="Run name. This will appear on the Data Docs. Default is 'None'",
+        default="None",
+    )
+    parser.add_argument(
+        "--max_concurrency",
+        type=int,
+        help="Maximum number of databases fetched at the same time. Default: 4",
+        default=4,
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Validation processes. 0 validates in this process. Default: number of CPUs",
+        default=os.cpu_count() or 1,
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        help="Path of the aggregated JSON result. Default: only logged",
+        default=None,
+    )
+    args = parser.parse_args()
+    return args
+
+
+def load_manifest(path: str) -> list[dict]:
+    """Loads a manifest and returns one validation task per database, defaults applied."""
+    with open(path) as manifest_file:
+        if path.endswith((".yml", ".yaml")):
+            from ruamel.yaml import YAML
+
+            manifest = YAML(typ="safe").load(manifest_file)
+        else:
+            manifest = json.load(manifest_file)
+
+    defaults = {
+        "data_source": "my_notion_pandas_data_source",
+        "data_connector": "my_notion_pandas_data_connector",
+        "query": "",
+        "engine": "ge",
+        **manifest.get("defaults", {}),
+    }
+    tasks = []
+    for database in manifest["databases"]:
+        task = {**defaults, **database}
+        if not task.get("db") or not task.get("expectation_suite"):
+            raise ValueError(f"Manifest entry needs 'db' and 'expectation_suite': {database}")
+        if task["engine"] == "native" and not task.get("suite_file"):
+            raise ValueError(f"Manifest entry with engine 'native' needs 'suite_file': {database}")
+        tasks.append(task)
+    return tasks
+
+
+def _get_context():
+    """Returns this process' Great Expectations context, loading it on first use."""
+    global _context
+    if _context is None:
+        import great_expectations as ge
+
+        _context = ge.get_context()
+    return _context
+
+
+def validate(task: dict, df, db_title: str, run_name: str) -> dict:
+    """
+    Validates one fetched database. Runs in a worker process (or inline).
+    A None df is read from the task's snapshot, so it is never pickled to the worker.
+    """
+    started = time.perf_counter()
+    if task["engine"] == "native":
+        from Validation.Validation_Plan import PlanCache, get_default_plan_cache
+
+        plans = PlanCache(task["plan_cache"]) if task.get("plan_cache") else get_default_plan_cache()
+        validator = plans.load(task["suite_file"])
+        if df is None:
+            df = read_snapshot(task["snapshot"], columns=validator.get_columns())
+        result = validator.validate(df, run_name=run_name)
+        summary = {"success": result["success"], "statistics": result["statistics"]}
+    else:
+        if df is None:
+            df = read_snapshot(task["snapshot"])
+        import great_expectations as ge
+        from run_expectations import build_checkpoint, summarize_checkpoint_result
+
+        checkpoint = build_checkpoint(
+            _get_context(),
+            ge.from_pandas(df),
+            db_title,
+            task["expectation_suite"],
+            task["data_source"],
+            task["data_connector"],
+        )
+        summary = summarize_checkpoint_result(checkpoint.run(run_name=run_name))
+    summary["validation_seconds"] = round(time.perf_counter() - started, 3)
+    return summary
+
+
+async def run_manifest(tasks: list[dict], args, log) -> list[dict]:
+    """Fetches every database concurrently and validates each one as soon as it arrives."""
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(args.max_concurrency)
+    executor = None
+    if args.workers > 0:
+        uses_ge = any(task["engine"] == "ge" for task in tasks)
+        executor = ProcessPoolExecutor(max_workers=args.workers, initializer=_get_context if uses_ge else None)
+
+    async def fetch_and_validate(notion: AsyncNotionAPI, task: dict) -> dict:
+        result = {"db": task["db"], "expectation_suite": task["expectation_suite"]}
+        try:
+            started = time.perf_counter()
+            snapshot = task.get("snapshot")
+            if snapshot and os.path.exists(snapshot):
+                snapshot_metadata = read_snapshot_metadata(snapshot)
+                df, db_title, rows = None, snapshot_metadata["title"], snapshot_metadata["rows"]
+                log.info(f"Using snapshot {snapshot} taken at {snapshot_metadata['created_time']}")
+            else:
+                async with semaphore:
+                    df = await notion.query_db(task["db"], query=task["query"], return_type="dataframe")
+                    db_title, rows = await notion.get_db_title(task["db"]), len(df)
+                    if snapshot:
+                        db_object = json.loads((await notion.get_db(task["db"])).content)
+                if snapshot:
+                    schema = ColumnarConverter.from_db(db_object).schema
+                    metadata = {"db": task["db"], "title": db_title, "query": task["query"]}
+                    await loop.run_in_executor(None, write_snapshot, snapshot, df, schema, metadata)
+            result.update(title=db_title, rows=rows, fetch_seconds=round(time.perf_counter() - started, 3))
+            log.info(f"Fetched {db_title} ({rows} rows), validating against {task['expectation_suite']}")
+
+            if executor is None:
+                summary = validate(task, df, db_title, args.run_name)
+            else:
+                summary = await loop.run_in_executor(executor, validate, task, df, db_title, args.run_name)
+            result.update(summary)
+        except Exception as e:
+            log.error(f"Validation of {task['db']} failed: {e}")
+            result.update(success=False, error=f"{type(e).__name__}: {e}")
+        return result
+
+    try:
+        # NOTION_API_KEY may hold several comma-separated keys, see run_expectations.
+        async with AsyncNotionAPI(
+            os.environ.get("NOTION_API_KEY"), pool_size=args.max_concurrency
+        ) as notion:
+            return await asyncio.gather(*(fetch_and_validate(notion, task) for task in tasks))
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+
+def main():
+    log = setup_logging()
+
+    args = parse_arguments()
+    log.info("Successfully parsed arguments")
+
+    tasks = load_manifest(args.manifest)
+    log.info(f"Validating {len(tasks)} databases from {args.manifest}")
+
+    started = time.perf_counter()
+    if args.workers == 0 and any(task["engine"] == "ge" for task in tasks):
+        log.info("Reading Great Expectations' context")
+        _get_context()
+    results = asyncio.run(run_manifest(tasks, args, log))
+
+    aggregated = {
+        "run_name": args.run_name,
+        "success": all(result.get("success") for result in results),
+        "databases": len(results),
+        "failed": sum(1 for result in results if not result.get("success")),
+        "wall_clock_seconds": round(time.perf_counter() - started, 3),
+        "results": results,
+    }
+    log.info("Aggregated result: %s", json.dumps(aggregated, indent=2))
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(aggregated, output_file, indent=2)
+
+    log.info("Done running validation. Check data docs to see result.")
+    return 0 if aggregated["success"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
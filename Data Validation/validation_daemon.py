@@ -0,0 +1,410 @@
+"""
+Keeps validating the databases of a manifest (see run_manifest) as they change.
+
+Instead of running run_expectations.py from cron, which imports pandas and
+Great Expectations and checks the Notion key again on every tick, the
+daemon stays resident with one NotionAPI client (and its pooled
+connections) and Great Expectations' context loaded once per worker.
+
+Each database is polled on its own schedule with a single request of one
+page sorted by last_edited_time (NotionAPI.get_last_edited). The database is
+only fetched and validated again when its newest page changed, when it was
+edited during the minute of the previous fetch (Notion rounds
+last_edited_time to the minute), or when "max_age" seconds passed since its
+last validation. Pages deleted or archived without being the newest one are
+not seen by the poll, so set "max_age" to bound how long that goes unnoticed.
+
+Manifest entries accept two more keys, also settable under "defaults":
+
+    databases:
+      - db: 29965940ff704020b78b7ec20dc063c6
+        expectation_suite: example_3_columns_and_2_languages
+        interval: 60       # seconds between polls, default --interval
+        max_age: 86400     # re-validate at least this often, default never
+
+NOTION_API_KEY may hold several comma-separated keys, see run_expectations.
+
+Usage:
+    python validation_daemon.py --manifest manifest.yml --state_file daemon_state.json --output results.jsonl
+"""
+import argparse
+import heapq
+import json
+import os
+import signal
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Optional
+from Notion.Notion_API import NotionAPI
+from Notion.Notion_Metrics import Metrics
+from Notion.Notion_Rate_Limit import RequestScheduler
+from Notion.Notion_Response_Cache import ResponseCache
+from run_manifest import _get_context, load_manifest, setup_logging, validate
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--manifest",
+        type=str,
+        required=True,
+        help="JSON or YAML file mapping Notion databases to expectation suites.",
+    )
+    parser.add_argument(
+        "--run_name",
+        type=str,
+        help="Run name. This will appear on the Data Docs. Default is 'None'",
+        default="None",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        help="Seconds between two polls of a database without an 'interval' in the manifest. Default: 300",
+        default=300.0,
+    )
+    parser.add_argument(
+        "--max_concurrency",
+        type=int,
+        help="Maximum number of databases polled or fetched at the same time. Default: 4",
+        default=4,
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Validation processes. 0 validates in this process. Default: number of CPUs",
+        default=os.cpu_count() or 1,
+    )
+    parser.add_argument(
+        "--state_file",
+        type=str,
+        help="JSON file keeping what was last validated, so a restart does not validate "
+        "unchanged databases again. Default: kept in memory",
+        default=None,
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        help="File each validation result is appended to, one JSON document per line. Default: only logged",
+        default=None,
+    )
+    parser.add_argument(
+        "--prometheus_file",
+        type=str,
+        help="Path of a .prom file rewritten after each validation, for node_exporter. Default: disabled",
+        default=None,
+    )
+    parser.add_argument(
+        "--response_cache",
+        type=str,
+        help="Path of a persistent cache for database schema lookups. Default: disabled",
+        default=None,
+    )
+    parser.add_argument(
+        "--notion_base_url",
+        type=str,
+        help="Base URL of Notion's API. Default: https://api.notion.com/v1/",
+        default="https://api.notion.com/v1/",
+    )
+    parser.add_argument(
+        "--requests_per_second",
+        type=float,
+        help="Client-side rate limit of the requests to Notion, per API key. Default: 3, Notion's limit",
+        default=None,
+    )
+    parser.add_argument(
+        "--once",
+        action="store_true",
+        help="Poll every database once, validate the changed ones and exit.",
+    )
+    args = parser.parse_args()
+    if args.interval <= 0:
+        parser.error("--interval must be positive")
+    if args.max_concurrency < 1:
+        parser.error("--max_concurrency must be at least 1")
+    return args
+
+
+def _parse_time(timestamp: str) -> datetime:
+    """Parses an ISO 8601 timestamp as returned by Notion."""
+    return datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+
+
+class ValidationDaemon:
+    """
+    Polls the databases of a manifest on their schedules and validates the changed ones.
+
+    Polls and fetches run on a bounded thread pool sharing one NotionAPI
+    client (and so its rate limit); validations run on a process pool whose
+    workers load Great Expectations' context once. A database whose previous
+    check is still running is not polled again until it finishes.
+
+    Usage:
+        with NotionAPI(key) as notion:
+            daemon = ValidationDaemon(notion, load_manifest("manifest.yml"), log)
+            daemon.run(stop_event)
+    """
+
+    def __init__(
+        self,
+        notion: NotionAPI,
+        tasks: list[dict],
+        log,
+        run_name: str = "None",
+        interval: float = 300.0,
+        max_concurrency: int = 4,
+        workers: int = 0,
+        metrics: Optional[Metrics] = None,
+        state_file: Optional[str] = None,
+        output: Optional[str] = None,
+        prometheus_file: Optional[str] = None,
+    ):
+        """
+        Initializes the daemon. Nothing is polled before run().
+
+        Args:
+            notion (NotionAPI): Client used for every poll and fetch.
+            tasks (list[dict]): Validation tasks, as returned by load_manifest.
+            log (logging.Logger): Logger.
+            run_name (str): Run name of the validations.
+            interval (float): Seconds between polls of the tasks without an "interval".
+            max_concurrency (int): Polls and fetches running at the same time.
+            workers (int): Validation processes. 0 validates in the polling threads.
+            metrics (Optional[Metrics]): Metrics to count polls and validations in, attached to the client.
+            state_file (Optional[str]): JSON file the last validated state of each task is kept in.
+            output (Optional[str]): File the validation results are appended to, as JSON lines.
+            prometheus_file (Optional[str]): .prom file the metrics are rewritten to after each validation.
+        """
+        for task in tasks:
+            if task.get("snapshot"):
+                raise ValueError(f"The validation daemon validates live databases, remove 'snapshot' from: {task}")
+
+        self.notion = notion
+        self.tasks = tasks
+        self.log = log
+        self.run_name = run_name
+        self.interval = interval
+        self.max_concurrency = max_concurrency
+        self.workers = workers
+        self.metrics = metrics or Metrics()
+        self.state_file = state_file
+        self.output = output
+        self.prometheus_file = prometheus_file
+        self.results = []
+        self.keys = [
+            f"{notion.get_cache_scope(task['db'], task['query'])}:{task['expectation_suite']}" for task in tasks
+        ]
+        self.state = self._load_state()
+        self._lock = threading.Lock()
+        self._validation_lock = threading.Lock()
+        self._executor = None
+
+    def _load_state(self) -> dict:
+        """Returns the state kept in the state file, empty if there is none."""
+        if not self.state_file or not os.path.exists(self.state_file):
+            return {}
+        with open(self.state_file) as state_file:
+            return json.load(state_file)
+
+    def _save_state(self):
+        """Writes the state file atomically. Called with the lock held."""
+        if not self.state_file:
+            return
+        temporary_path = f"{self.state_file}.{os.getpid()}.tmp"
+        with open(temporary_path, "w") as state_file:
+            json.dump(self.state, state_file, indent=2, sort_keys=True)
+        os.replace(temporary_path, self.state_file)
+
+    def run(self, stop: threading.Event, once: bool = False) -> list[dict]:
+        """
+        Polls and validates until stop is set (or, with once, until every task was checked once).
+
+        Args:
+            stop (threading.Event): Set it to shut down; running checks are finished first.
+            once (bool): Check every task once and return.
+
+        Returns:
+            list[dict]: Results of the validations done, in completion order.
+        """
+        if self.workers > 0:
+            uses_ge = any(task["engine"] == "ge" for task in self.tasks)
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_get_context if uses_ge else None
+            )
+
+        pool = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="validation-daemon")
+        running = {}
+        # (monotonic due time, task index): the next poll of each task.
+        schedule = [(time.monotonic(), index) for index in range(len(self.tasks))]
+        heapq.heapify(schedule)
+        try:
+            while schedule and not stop.is_set():
+                due, index = schedule[0]
+                wait = due - time.monotonic()
+                if wait > 0:
+                    stop.wait(wait)
+                    continue
+                heapq.heappop(schedule)
+                if not once:
+                    task_interval = float(self.tasks[index].get("interval") or self.interval)
+                    heapq.heappush(schedule, (time.monotonic() + task_interval, index))
+
+                if index in running and not running[index].done():
+                    self.log.info(f"Still checking {self.tasks[index]['db']}, skipping this poll")
+                    continue
+                running[index] = pool.submit(self.check, index)
+        finally:
+            pool.shutdown(wait=True, cancel_futures=stop.is_set())
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+        return self.results
+
+    def check(self, index: int) -> Optional[dict]:
+        """
+        Polls one task's database and validates it if it needs to be.
+
+        Args:
+            index (int): Position of the task.
+
+        Returns:
+            Optional[dict]: Validation result, None if the database did not need to be validated.
+        """
+        task, key = self.tasks[index], self.keys[index]
+        try:
+            with self.metrics.stage("poll"):
+                last_edited = self.notion.get_last_edited(task["db"], task["query"])
+            self.metrics.increment("polls")
+            with self._lock:
+                previous = self.state.get(key)
+            reason = self._get_reason(task, previous, last_edited)
+            if reason is None:
+                self.log.debug(f"{task['db']} did not change since {previous['last_edited_time']}")
+                return None
+        except Exception as e:
+            self.log.error(f"Polling {task['db']} failed: {e}")
+            return None
+
+        self.log.info(f"Validating {task['db']} against {task['expectation_suite']}: {reason}")
+        return self._fetch_and_validate(task, key, last_edited)
+
+    def _get_reason(
+        self, task: dict, previous: Optional[dict], last_edited: Optional[tuple[str, str]]
+    ) -> Optional[str]:
+        """Returns why a task must be validated again, None if it need not be."""
+        if previous is None:
+            return "not validated yet"
+        if list(last_edited or [None, None]) != [previous["last_edited_time"], previous["page_id"]]:
+            return "its pages changed"
+        if last_edited is not None:
+            fetched_minute = _parse_time(previous["fetched_at"]).replace(second=0, microsecond=0)
+            if _parse_time(last_edited[0]) >= fetched_minute:
+                # The edit may have happened after the fetch, within the same (rounded) minute.
+                return "it was edited during the previous fetch's minute"
+        max_age = task.get("max_age")
+        if max_age and time.time() - previous["validated_at"] >= float(max_age):
+            return f"last validated more than {max_age}s ago"
+        return None
+
+    def _fetch_and_validate(self, task: dict, key: str, last_edited: Optional[tuple[str, str]]) -> dict:
+        """Fetches a task's database, validates it and records the result and the new state."""
+        result = {"db": task["db"], "expectation_suite": task["expectation_suite"]}
+        try:
+            fetched_at = datetime.now(timezone.utc).isoformat()
+            started = time.perf_counter()
+            with self.metrics.stage("fetch"):
+                df = self.notion.query_db(task["db"], query=task["query"], return_type="dataframe")
+                db_title = self.notion.get_db_title(task["db"])
+            result.update(title=db_title, rows=len(df), fetch_seconds=round(time.perf_counter() - started, 3))
+
+            with self.metrics.stage("validation"):
+                if self._executor is None:
+                    # Great Expectations' context is not thread-safe.
+                    with self._validation_lock:
+                        summary = validate(task, df, db_title, self.run_name)
+                else:
+                    summary = self._executor.submit(validate, task, df, db_title, self.run_name).result()
+            result.update(summary)
+            self.log.info(
+                f"Validation of {db_title} ({len(df)} rows) {'succeeded' if summary['success'] else 'failed'}"
+            )
+
+            with self._lock:
+                self.state[key] = {
+                    "last_edited_time": last_edited[0] if last_edited else None,
+                    "page_id": last_edited[1] if last_edited else None,
+                    "fetched_at": fetched_at,
+                    "validated_at": time.time(),
+                    "success": summary["success"],
+                }
+                self._save_state()
+        except Exception as e:
+            # The state is left as it was, so the next poll tries again.
+            self.log.error(f"Validation of {task['db']} failed: {e}")
+            result.update(success=False, error=f"{type(e).__name__}: {e}")
+
+        self.metrics.increment("validations")
+        if not result["success"]:
+            self.metrics.increment("failed_validations")
+        result["validated_at"] = datetime.now(timezone.utc).isoformat()
+        with self._lock:
+            self.results.append(result)
+            if self.output:
+                with open(self.output, "a") as output_file:
+                    output_file.write(json.dumps(result) + "\n")
+            if self.prometheus_file:
+                self.metrics.write_prometheus(self.prometheus_file, labels={"run_name": self.run_name})
+        return result
+
+
+def main():
+    log = setup_logging()
+
+    args = parse_arguments()
+    log.info("Successfully parsed arguments")
+
+    tasks = load_manifest(args.manifest)
+    log.info(f"Watching {len(tasks)} databases from {args.manifest}")
+
+    if args.workers == 0 and any(task["engine"] == "ge" for task in tasks):
+        log.info("Reading Great Expectations' context")
+        _get_context()
+
+    stop = threading.Event()
+    for signal_number in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signal_number, lambda *_: stop.set())
+
+    notion_options = {"base_url": args.notion_base_url, "pool_size": args.max_concurrency}
+    if args.requests_per_second:
+        notion_options["scheduler"] = RequestScheduler(rate=args.requests_per_second)
+    if args.response_cache:
+        notion_options["response_cache"] = ResponseCache(args.response_cache)
+
+    metrics = Metrics()
+    with NotionAPI(os.environ.get("NOTION_API_KEY"), **notion_options) as notion:
+        metrics.attach(notion)
+        daemon = ValidationDaemon(
+            notion,
+            tasks,
+            log,
+            run_name=args.run_name,
+            interval=args.interval,
+            max_concurrency=args.max_concurrency,
+            workers=args.workers,
+            metrics=metrics,
+            state_file=args.state_file,
+            output=args.output,
+            prometheus_file=args.prometheus_file,
+        )
+        results = daemon.run(stop, once=args.once)
+    if args.response_cache:
+        notion_options["response_cache"].close()
+
+    log.info(f"Metrics: {metrics.to_json()}")
+    log.info("Validation daemon stopped")
+    return 0 if all(result.get("success") for result in results) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
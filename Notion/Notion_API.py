@@ -1,34 +1,74 @@
+import hashlib
 import json
 import logging
-from typing import Union
+import queue
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable, Iterator, Optional, Union
+from urllib.parse import unquote, urlencode
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
 from requests.models import Response
-from Notion.NotionPage import NotionPage
+from Notion.Notion_Blocks import BlockTreeFetcher
+from Notion.Notion_Columnar import ColumnarConverter, decode_and_convert
+from Notion.Notion_JSON import get_json_backend
+from Notion.Notion_Page import NotionPage
+from Notion.Notion_Page_Cache import NotionPageCache
+from Notion.Notion_Query import NotionQuery
+from Notion.Notion_Rate_Limit import RequestScheduler, get_default_scheduler
+from Notion.Notion_Relations import RelationResolver
+from Notion.Notion_Response_Cache import ResponseCache
+from Notion.Notion_Snapshot import SnapshotWriter
 
-class NotionAPI:
-    def __init__(self, notion_api_key: str):
-        """Constructor for NotionAPI class.
-        Checks that the key has access to the API.
 
-        Args:
-            notion_api_key (str): Notion API key used to call Notion's API
-        """
-        self._add_notion_api_key(notion_api_key)
+class NotionAPIBase:
+    """
+    Transport-independent helpers shared by NotionAPI and AsyncNotionAPI:
+    key validation, headers, id parsing and result conversion.
+    """
+
+    # Timestamp (last_edited_time) filters and filter_properties are documented from this version on.
+    NOTION_VERSION = "2022-06-28"
 
-    def _add_notion_api_key(self, key: str):
+    # Request lifecycle events hooks can be added for, see add_hook.
+    HOOK_EVENTS = ("request", "response", "retry", "error", "page", "convert", "cache")
+
+    def add_hook(self, event: str, callback: Callable[..., None]):
         """
-        Internal method used by __init__.
-        Sets the instance variable for the API key.
-        Checks the validity of the key and tests the connection.
+        Calls a function on every occurrence of a request lifecycle event.
+
+        Callbacks receive keyword arguments only (more may be added, so accept **details):
+            request: method, url, attempt. Before each HTTP request, retries included.
+            response: method, url, status_code, response_bytes, seconds. After a successful response.
+            retry: method, url, status_code (None for connection errors), delay, attempt.
+            error: method, url, status_code, error. When a request fails for good.
+            page: db, rows, decode_seconds. After each cursor page of a database query is decoded.
+            convert: rows, seconds. After query results are converted to a DataFrame.
+            cache: url, hit. When the response cache is looked up.
+
+        Exceptions raised by callbacks are logged and ignored.
 
         Args:
-            key (str): Notion API key
+            event (str): One of HOOK_EVENTS
+            callback (Callable[..., None]): Function to call
         """
-        self.NOTION_API_KEY = key
+        if event not in self.HOOK_EVENTS:
+            raise ValueError(f"Unknown hook event {event!r}, expected one of {self.HOOK_EVENTS}")
+        if not hasattr(self, "_hooks"):
+            self._hooks = {}
+        self._hooks.setdefault(event, []).append(callback)
 
-        self._validate_key(key)
-        self._validate_connection()
+    def _emit(self, event: str, **details):
+        """Calls the hooks of an event."""
+        for callback in getattr(self, "_hooks", {}).get(event, ()):
+            try:
+                callback(**details)
+            except Exception as e:
+                logging.getLogger("notion").warning(f"Hook {callback!r} for {event} failed: {e}")
 
     def _validate_key(self, key: str):
         """
@@ -42,206 +82,1056 @@ class NotionAPI:
         elif not key.startswith("secret"):
             raise ValueError("Given NOTION_API_KEY does not start with 'secret'.")
 
-    def _validate_connection(self):
-        """Validates the connection to the API by making a basic query."""
-        headers = self._build_headers()
-        response = self._get_request("https://api.notion.com/v1/users", headers)
+    def _parse_keys(self, key: Union[str, list[str], None]) -> list[str]:
+        """
+        Splits and validates the API keys given to a client.
+
+        Args:
+            key (Union[str, list[str], None]): Notion API key, or several keys, as a list
+                                               or separated by commas
+
+        Returns:
+            list[str]: Distinct keys, in the given order
+        """
+        if isinstance(key, str):
+            key = key.split(",")
+        keys = list(dict.fromkeys(api_key.strip() for api_key in key or [] if api_key and api_key.strip()))
+        for api_key in keys or [None]:
+            self._validate_key(api_key)
+        return keys
+
+    def _pick_key(self, keys: list[str]) -> str:
+        """
+        Returns the key whose token bucket can send a request the soonest;
+        ties go to the keys in turn.
+
+        Args:
+            keys (list[str]): Candidate keys
+
+        Returns:
+            str: Key to send the next request with
+        """
+        if len(keys) == 1:
+            return keys[0]
 
-        if response.status_code != 200:
-            raise ConnectionError(f"API connection validation failed. Status code: {response.status_code}")
+        with self._keys_lock:
+            self._key_turn += 1
+            turn = self._key_turn
+        rotated = keys[turn % len(keys):] + keys[:turn % len(keys)]
+        return min(rotated, key=lambda api_key: self.scheduler.get_bucket(api_key).get_delay())
 
-    def _build_headers(self) -> dict:
-        """Builds headers as expected by Notion's API."""
+    def _build_headers(self, api_key: Optional[str] = None) -> dict:
+        """
+        Builds headers as expected by Notion's API.
+
+        Args:
+            api_key (Optional[str]): Notion API key to authenticate with. Defaults to the client's key.
+        """
         headers = {
-            "Notion-Version": "2021-08-16",
-            "Authorization": f"Bearer {self.NOTION_API_KEY}",
+            "Notion-Version": self.NOTION_VERSION,
+            "Authorization": f"Bearer {api_key or self.NOTION_API_KEY}",
         }
+        if not self.keep_alive:
+            headers["Connection"] = "close"
         return headers
 
-    def _get_request(self, request_url: str, headers: dict) -> Response:
-        """Sends a GET HTTP request to Notion's API and handles errors.
-        
+    def _get_base_url(self) -> str:
+        """Returns the base URL of Notion's API."""
+        return self.base_url
+
+    def _get_api_key(self, headers: dict) -> str:
+        """Returns the Notion API key a request's headers authenticate with."""
+        return headers["Authorization"].removeprefix("Bearer ")
+
+    def _extract_dbid_from_http_url(self, url: str) -> str:
+        """
+        Extracts the database id from a Notion database link.
+
         Args:
-            request_url (str): Request URL for the HTTP request.
-            headers (dict): Headers for the HTTP request.
+            url (str): Notion's database link, e.g. https://www.notion.so/<dbid>?v=<viewid>
 
         Returns:
-            Response: Response from the Notion API.
+            str: Notion's database id
         """
-        try:
-            response = requests.get(request_url, headers=headers)
-            response.raise_for_status()
-        except requests.exceptions.RequestException as e:
-            self.logger.error(
-                f"Received HTTP response: {response.status_code}. Reason: {response.reason}"
-            )
-            raise ConnectionError(e)
-        
-        return response
+        path = url.split("?")[0].rstrip("/")
+        segment = path.split("/")[-1]
+        # Links end with the id, bare (possibly after the title) or dash-formatted.
+        match = re.search(r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$", segment)
+        if match:
+            return match.group(0)
+        return segment.split("-")[-1]
+
+    def _format_page_id(self, page_id: str) -> str:
+        """
+        Formats a page or database id with dashes (8-4-4-4-12) as expected by Notion's API.
+
+        Args:
+            page_id (str): Notion's page id (formatted or not)
+
+        Returns:
+            str: Formatted page id
+        """
+        raw_id = page_id.replace("-", "")
+        if len(raw_id) != 32:
+            return page_id
+
+        return f"{raw_id[:8]}-{raw_id[8:12]}-{raw_id[12:16]}-{raw_id[16:20]}-{raw_id[20:]}"
+
+    def _parse_db(self, db: str) -> str:
+        """
+        Returns the database id given a full https link or a dbid.
+
+        Args:
+            db (str): Notion's db (full https link or dbid)
+
+        Returns:
+            str: Notion's db id
+        """
+        if db.startswith("https"):
+            db = self._extract_dbid_from_http_url(db)
+        if not re.fullmatch(r"[0-9a-fA-F]{32}", db.replace("-", "")):
+            raise ValueError(f"Invalid database id {db!r}, expected 32 hexadecimal digits with or without dashes")
+
+        return db
+
+    def _extract_db_title(self, db: dict) -> str:
+        """
+        Returns the plain text title of a database object.
+
+        Args:
+            db (dict): Database object returned by Notion's API
+
+        Returns:
+            str: Database title
+        """
+        return "".join(title["plain_text"] for title in db["title"])
+
+    def _format_results(self, json_results: list[dict], return_type: str):
+        """
+        Converts JSON query results to the requested format.
+
+        Args:
+            json_results (list[dict]): JSON query results
+            return_type (str): Format for results ("dataframe", "json", "NotionPage")
+
+        Returns:
+            Union[pd.DataFrame, list[dict], list[NotionPage]]: Query results in the specified format
+        """
+        if return_type == "json":
+            return json_results
+        elif return_type == "dataframe":
+            return self._convert_to_dataframe(json_results)
+        elif return_type == "NotionPage":
+            return self._convert_to_notion_pages(json_results)
+
+        raise ValueError(f"Unsupported return_type: {return_type}")
+
+    def _convert_to_notion_pages(self, json_results: list[dict]) -> list[NotionPage]:
+        """
+        Converts JSON query results to a list of NotionPage objects.
+
+        Args:
+            json_results (list[dict]): JSON query results
+
+        Returns:
+            list[NotionPage]: List of NotionPage objects
+        """
+        return [NotionPage(page) for page in json_results]
+
+    def _convert_to_dataframe(
+        self, json_results: list[dict], converter: Optional[ColumnarConverter] = None
+    ) -> pd.DataFrame:
+        """
+        Converts JSON query results to a pandas DataFrame, column by column.
+        Each page is a row and each page property is a column.
+
+        Args:
+            json_results (list[dict]): JSON query results
+            converter (Optional[ColumnarConverter]): Converter to use. By default it is
+                                                     built from the results' property types.
 
-    # Additional methods for querying databases and retrieving pages can be added here
+        Returns:
+            pd.DataFrame: Query results as a DataFrame
+        """
+        started = time.perf_counter()
+        converter = converter or ColumnarConverter.from_pages(json_results)
+        if converter is None:
+            return pd.DataFrame()
 
+        df = converter.convert(json_results)
+        self._emit("convert", rows=len(df), seconds=time.perf_counter() - started)
+        return df
 
 
-    def __init__(self, notion_api_key: str):
+class NotionAPI(NotionAPIBase):
+    def __init__(
+        self,
+        notion_api_key: Union[str, list[str]],
+        pool_size: int = 10,
+        keep_alive: bool = True,
+        http2: bool = False,
+        timeout: Optional[float] = 30.0,
+        base_url: str = "https://api.notion.com/v1/",
+        scheduler: Optional[RequestScheduler] = None,
+        response_cache: Optional[ResponseCache] = None,
+        json_backend: Optional[str] = None,
+        decode_workers: int = 0,
+    ):
         """Constructor for NotionAPI class.
-        Checks that the key has access to the API.
+        Opens a pooled HTTP session and checks that the key has access to the API.
+
+        Several keys (a list, or a comma-separated string) pool the rate limits of
+        several integrations: each database's queries are spread across the keys
+        that can access it, see _get_db_keys. Pages and blocks are requested with the first key.
+
+        The session is reused by every request made by this instance, so
+        paginated queries only pay the TCP+TLS handshake once per pooled
+        connection. Use the instance as a context manager (or call close())
+        to release the pooled connections.
 
         Args:
-            notion_api_key (str): Notion API key used to call Notion's API
+            notion_api_key (Union[str, list[str]]): Notion API key used to call Notion's API, or several
+                                                    keys, as a list or separated by commas
+            pool_size (int): Maximum number of pooled connections kept to Notion's API
+            keep_alive (bool): Whether connections are kept open between requests
+            http2 (bool): Use an HTTP/2-capable transport (requires httpx[http2])
+            timeout (Optional[float]): Timeout in seconds for each HTTP request
+            base_url (str): Base URL of Notion's API
+            scheduler (Optional[RequestScheduler]): Rate limit scheduler. Defaults to the
+                                                    process-wide scheduler shared by all clients.
+            response_cache (Optional[ResponseCache]): Persistent cache for get_db and get_page
+                                                      responses. Disabled by default.
+            json_backend (Optional[str]): JSON decoder for query responses ("orjson", "simdjson"
+                                          or "json"). Defaults to the fastest one installed.
+            decode_workers (int): Worker processes decoding and converting query responses
+                                  to DataFrames while the next pages are fetched. 0 (default)
+                                  converts in the calling thread.
         """
-        self._add_notion_api_key(notion_api_key)
+        if decode_workers < 0:
+            raise ValueError("decode_workers must be at least 0")
+
+        self.logger = logging.getLogger("notion")
+        self.base_url = base_url if base_url.endswith("/") else base_url + "/"
+        self.timeout = timeout
+        self.keep_alive = keep_alive
+        self.scheduler = scheduler or get_default_scheduler()
+        self.response_cache = response_cache
+        self.json_backend = get_json_backend(json_backend)
+        self.decode_workers = decode_workers
+        self._decode_pool = None
+        self._relation_resolver = None
+        self._block_fetcher = None
+        self._db_keys = {}
+        self._keys_lock = threading.Lock()
+        self._key_turn = 0
+        self._session = self._build_session(pool_size, http2)
 
-    def _add_notion_api_key(self, key: str):
+        try:
+            self._add_notion_api_key(notion_api_key)
+        except Exception:
+            self.close()
+            raise
+
+    def __enter__(self) -> "NotionAPI":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Closes the pooled HTTP session and its connections, and stops the decode workers."""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+        if self._decode_pool is not None:
+            self._decode_pool.shutdown(cancel_futures=True)
+            self._decode_pool = None
+
+    def _build_session(self, pool_size: int, http2: bool):
         """
         Internal method used by __init__.
-        Sets the instance variable for the API key.
-        Checks the validity of the key and tests the connection.
+        Builds the pooled HTTP session shared by all requests.
 
         Args:
-            key (str): Notion API key
+            pool_size (int): Maximum number of pooled connections
+            http2 (bool): Whether to use the HTTP/2-capable httpx transport
+
+        Returns:
+            Union[requests.Session, httpx.Client]: Pooled HTTP session
         """
-        self.NOTION_API_KEY = key
+        if pool_size < 1:
+            raise ValueError("pool_size must be at least 1")
 
-        self._validate_key(key)
-        self._validate_connection()
+        if http2:
+            try:
+                import httpx
+            except ImportError as e:
+                raise ImportError(
+                    "http2=True requires the 'httpx[http2]' package to be installed."
+                ) from e
 
-    def _validate_key(self, key: str):
+            limits = httpx.Limits(
+                max_connections=pool_size,
+                max_keepalive_connections=pool_size if self.keep_alive else 0,
+            )
+            return httpx.Client(http2=True, limits=limits, timeout=self.timeout)
+
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def _add_notion_api_key(self, key: Union[str, list[str]]):
         """
-        Validates the provided API key.
+        Internal method used by __init__.
+        Sets the instance variables for the API keys; the first one is the default key.
+        Checks the validity of the keys and tests the connection.
 
         Args:
-            key (str): Notion API key
+            key (Union[str, list[str]]): Notion API key, or several keys
         """
-        if not key:
-            raise ValueError("Received None as NOTION_API_KEY")
-        elif not key.startswith("secret"):
-            raise ValueError("Given NOTION_API_KEY does not start with 'secret'.")
+        keys = self._parse_keys(key)
+        self.NOTION_API_KEYS = keys
+        self.NOTION_API_KEY = keys[0]
+
+        self._validate_connection()
 
     def _validate_connection(self):
-        """Validates the connection to the API by making a basic query."""
-        headers = self._build_headers()
-        response = self._get_request("https://api.notion.com/v1/users", headers)
+        """Validates the connection to the API of every key by making a basic query."""
+        for api_key in self.NOTION_API_KEYS:
+            headers = self._build_headers(api_key)
+            response = self._get_request(self._get_base_url() + "users", headers)
 
-        if response.status_code != 200:
-            raise ConnectionError(f"API connection validation failed. Status code: {response.status_code}")
+            if response.status_code != 200:
+                raise ConnectionError(f"API connection validation failed. Status code: {response.status_code}")
 
-    def _build_headers(self) -> dict:
-        """Builds headers as expected by Notion's API."""
-        headers = {
-            "Notion-Version": "2021-08-16",
-            "Authorization": f"Bearer {self.NOTION_API_KEY}",
-        }
-        return headers
+    def _get_db_keys(self, db: str) -> list[str]:
+        """
+        Returns the API keys that can access a database.
+
+        With several keys, the first get_db of a database asks Notion for it with
+        every key, and the keys it succeeds with are remembered by this instance.
 
-    def _get_request(self, request_url: str, headers: dict) -> Response:
-        """Sends a GET HTTP request to Notion's API and handles errors.
-        
         Args:
-            request_url (str): Request URL for the HTTP request.
-            headers (dict): Headers for the HTTP request.
+            db (str): Notion's db id
 
         Returns:
-            Response: Response from the Notion API.
+            list[str]: Keys with access to the database
         """
-        try:
-            response = requests.get(request_url, headers=headers)
-            response.raise_for_status()
-        except requests.exceptions.RequestException as e:
-            self.logger.error(
-                f"Received HTTP response: {response.status_code}. Reason: {response.reason}"
-            )
-            raise ConnectionError(e)
-        
-        return response
-  
+        if len(self.NOTION_API_KEYS) == 1:
+            return self.NOTION_API_KEYS
+
+        db_id = db.replace("-", "")
+        with self._keys_lock:
+            keys = self._db_keys.get(db_id)
+        if keys is None:
+            self.get_db(db)
+            with self._keys_lock:
+                keys = self._db_keys[db_id]
+        return keys
+
+    def _build_db_headers(self, db: str) -> dict:
+        """
+        Builds the headers of a request about a database, with the least busy key that can access it.
+
+        Args:
+            db (str): Notion's db id
 
+        Returns:
+            dict: Request headers
+        """
+        if len(self.NOTION_API_KEYS) == 1:
+            return self._build_headers()
+        return self._build_headers(self._pick_key(self._get_db_keys(db)))
 
-    def query_db(self, db: str, query: str = "", return_type: str = "dataframe"):
+    def query_db(
+        self,
+        db: str,
+        query: Union[str, dict, NotionQuery] = "",
+        return_type: str = "dataframe",
+        resolve_relations: bool = False,
+        columns: Optional[list[str]] = None,
+    ):
         """
         Queries a database and returns the results in various possible formats.
 
         Args:
             db (str): Notion's db (full https link or dbid)
-            query (str): Query to be sent
-            return_type (str): Format for results ("dataframe", "json", "NotionPage")
+            query (Union[str, dict, NotionQuery]): Query to be sent: a NotionQuery, or its
+                                                   body as a dict or JSON string. It is sent
+                                                   on every paginated request.
+            return_type (str): Format for results ("dataframe", "json", "NotionPage", "iter").
+                               "iter" returns a generator of NotionPage objects, see iter_db.
+            resolve_relations (bool): Only for "dataframe". Adds a "<column> (resolved)"
+                                      column with the titles of the related pages next to
+                                      every relation and rollup column, see resolve_relations.
+            columns (Optional[list[str]]): Only fetch and decode these properties, see select_columns.
 
         Returns:
-            Union[pd.DataFrame, list[dict], list[NotionPage]]: Query results in the specified format
+            Union[pd.DataFrame, list[dict], list[NotionPage], Iterator[NotionPage]]:
+                Query results in the specified format
         """
-        if db.startswith("https"):
-            db = self._extract_dbid_from_http_url(db)
-        # TODO: Add a check for valid dbid format if needed
+        if resolve_relations and return_type != "dataframe":
+            raise ValueError("resolve_relations is only supported with return_type='dataframe'")
+        if return_type == "iter":
+            return self.iter_db(db, query, return_type="NotionPage", columns=columns)
+
+        db = self._parse_db(db)
 
         self.logger.info(f"Attempting to query database {db}")
+        headers = self._build_db_headers(db)
+        query = NotionQuery.parse(query)
+        converter = None
+        if columns is not None:
+            query, converter = self._project(db, query, columns)
+
+        if self.decode_workers and return_type == "dataframe" and not resolve_relations:
+            return self._concat_dataframes(list(self._iter_decoded_chunks(db, headers, query, converter)))
+
+        json_results = self._execute_query(db, headers, query)
+
+        if converter is not None and return_type == "dataframe" and not resolve_relations:
+            return self._convert_to_dataframe(json_results, converter)
+        if resolve_relations:
+            converter = converter or ColumnarConverter.from_pages(json_results)
+            df = self._convert_to_dataframe(json_results, converter)
+            if converter is None:
+                return df
+            columns = [
+                name for name, property_type in converter.schema.items()
+                if property_type in ("relation", "rollup")
+            ]
+            return self.resolve_relations(df, columns)
+
+        return self._format_results(json_results, return_type)
+
+    def select_columns(
+        self, db: str, columns: Iterable[str], query: Union[str, dict, NotionQuery] = ""
+    ) -> NotionQuery:
+        """
+        Returns a query that only fetches some properties of each page.
+
+        Notion's filter_properties takes property ids, so the names are looked
+        up in the database schema (get_db, cached when a response cache is set).
+        Unknown names are logged and skipped.
+
+        Args:
+            db (str): Notion's db (full https link or dbid)
+            columns (Iterable[str]): Names of the properties to fetch
+            query (Union[str, dict, NotionQuery]): Query to restrict, see query_db
+
+        Returns:
+            NotionQuery: Copy of the query with filter_properties set
+        """
+        query, _ = self._project(self._parse_db(db), NotionQuery.parse(query), columns)
+        return query
+
+    def _project(
+        self, db: str, query: NotionQuery, columns: Iterable[str], db_properties: Optional[dict] = None
+    ) -> tuple[NotionQuery, ColumnarConverter]:
+        """
+        Restricts a query to some properties.
+
+        Args:
+            db (str): Notion's db id
+            query (NotionQuery): Query to restrict
+            columns (Iterable[str]): Names of the properties to fetch
+            db_properties (Optional[dict]): The database's properties, if already fetched
+
+        Returns:
+            tuple[NotionQuery, ColumnarConverter]: Restricted copy of the query and a
+                converter decoding only those properties
+        """
+        if db_properties is None:
+            db_properties = json.loads(self.get_db(db).content)["properties"]
+        columns = list(dict.fromkeys(columns))
+        unknown = [name for name in columns if name not in db_properties]
+        if unknown:
+            self.logger.warning(f"Database {db} has no properties named {unknown}")
+
+        known = [name for name in columns if name in db_properties]
+        # Property ids come URL-encoded (e.g. "%3AUPp"); the query string encodes them again.
+        query = query.copy().select(*(unquote(db_properties[name]["id"]) for name in known))
+        converter = ColumnarConverter.from_db({"properties": db_properties}).select(known)
+        self.logger.info(f"Fetching {len(known)} of {len(db_properties)} properties")
+        return query, converter
+
+    def snapshot_db(
+        self,
+        db: str,
+        path: str,
+        query: Union[str, dict, NotionQuery] = "",
+        columns: Optional[list[str]] = None,
+        chunk_size: int = 1000,
+    ) -> dict:
+        """
+        Queries a database and writes its pages to a typed Arrow or Parquet snapshot.
+
+        The column types come from the database schema (get_db), not from the
+        pages, so every snapshot of a database has the same schema even when
+        some properties are empty. Pages are converted and written chunk by
+        chunk as they arrive. Read the snapshot back with
+        Notion.Notion_Snapshot.read_snapshot, which memory-maps the file.
+        Requires pyarrow.
+
+        Args:
+            db (str): Notion's db (full https link or dbid)
+            path (str): Path of the snapshot. .arrow, .feather and .ipc paths are written as
+                        Arrow IPC files, anything else as Parquet.
+            query (Union[str, dict, NotionQuery]): Query to be sent, see query_db
+            columns (Optional[list[str]]): Only fetch and store these properties, see select_columns.
+            chunk_size (int): Number of rows converted and written at a time
+
+        Returns:
+            dict: The snapshot's metadata, see read_snapshot_metadata
+        """
+        db = self._parse_db(db)
+
+        self.logger.info(f"Attempting to snapshot database {db} to {path}")
+        db_object = json.loads(self.get_db(db).content)
+        headers = self._build_db_headers(db)
+        query = NotionQuery.parse(query)
+        if columns is not None:
+            query, converter = self._project(db, query, columns, db_object["properties"])
+        else:
+            converter = ColumnarConverter.from_db(db_object)
+
+        metadata = {"db": db, "title": self._extract_db_title(db_object), "query": json.loads(query.to_json())}
+        with SnapshotWriter(path, converter.schema, metadata) as writer:
+            result_pages = self._iter_query_results(db, headers, query)
+            for chunk in self._iter_dataframe_chunks(result_pages, chunk_size, converter):
+                writer.write(chunk)
+
+        return {**writer.metadata, "rows": writer.rows}
+
+    def resolve_relations(self, df: pd.DataFrame, columns: list[str]) -> pd.DataFrame:
+        """
+        Adds a "<column> (resolved)" column with the titles of the related pages
+        next to each given relation/rollup column.
+
+        Related pages are de-duplicated across all the columns, fetched concurrently
+        under the rate limit and cached by this instance across queries.
+
+        Args:
+            df (pd.DataFrame): Query results as returned by query_db
+            columns (list[str]): Relation or rollup columns holding page ids
+
+        Returns:
+            pd.DataFrame: New DataFrame with the resolved columns
+        """
+        if self._relation_resolver is None:
+            self._relation_resolver = RelationResolver(self)
+
+        return self._relation_resolver.resolve_columns(df, columns)
+
+    def get_blocks(self, pages: Iterable[Union[str, dict]], max_depth: Optional[int] = None) -> pd.DataFrame:
+        """
+        Returns the content of pages as flattened blocks, one row per block, e.g. to
+        validate required headings or non-empty descriptions.
+
+        The block trees are fetched breadth-first with a few concurrent requests under
+        the rate limit, and the trees of pages that did not change since a previous
+        call are reused by this instance, see BlockTreeFetcher.
+
+        Args:
+            pages (Iterable[Union[str, dict]]): Page ids, or page objects as returned by
+                                                query_db(return_type="json").
+            max_depth (Optional[int]): Deepest level of nesting fetched, 0 being the page's
+                                       own blocks. None fetches every level.
+
+        Returns:
+            pd.DataFrame: Blocks with their page_id, block_id, parent_id, depth, position,
+                          type, text, has_children and last_edited_time, in document order.
+        """
+        if self._block_fetcher is None:
+            self._block_fetcher = BlockTreeFetcher(self)
+
+        return self._block_fetcher.fetch(pages, max_depth)
+
+    def iter_blocks(
+        self, pages: Iterable[Union[str, dict]], max_depth: Optional[int] = None
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Yields the flattened blocks of each page as soon as its tree is fetched, see get_blocks.
+
+        Args:
+            pages (Iterable[Union[str, dict]]): Page ids, or page objects as returned by
+                                                query_db(return_type="json").
+            max_depth (Optional[int]): Deepest level of nesting fetched. None fetches every level.
+
+        Yields:
+            pd.DataFrame: Blocks of one page.
+        """
+        if self._block_fetcher is None:
+            self._block_fetcher = BlockTreeFetcher(self)
+
+        return self._block_fetcher.iter_pages(pages, max_depth)
+
+    def get_block_children(self, block_id: str) -> list[dict]:
+        """
+        Returns the children of a block (or the top-level blocks of a page), every cursor page of them.
+
+        Args:
+            block_id (str): Notion's block or page id (formatted or not)
+
+        Returns:
+            list[dict]: Block objects, as documented by Notion
+        """
+        request_url = self._get_base_url() + f"blocks/{self._format_page_id(block_id)}/children"
         headers = self._build_headers()
-        data = f"{query}"
+        params = {"page_size": 100}
+        children = []
 
-        json_results = self._execute_query(db, headers, data)
+        while True:
+            response = self._get_request(f"{request_url}?{urlencode(params)}", headers)
+            json_content = self.json_backend.loads(response.content)
+            children += json_content["results"]
 
-        notion_pages = self._convert_to_notion_pages(json_results)
+            if not json_content["has_more"]:
+                return children
+            params["start_cursor"] = json_content["next_cursor"]
 
-        if return_type == "json":
-            return json_results
-        elif return_type == "dataframe":
-            return self._convert_to_dataframe(notion_pages)
-        elif return_type == "NotionPage":
-            return notion_pages
+    def sync_db(
+        self,
+        db: str,
+        cache: NotionPageCache,
+        query: Union[str, dict, NotionQuery] = "",
+        return_type: Optional[str] = "dataframe",
+        reconcile: bool = False,
+        reconcile_interval: Optional[float] = None,
+    ):
+        """
+        Incrementally syncs a database into a local page cache and returns every cached page.
+
+        The first sync downloads the whole database. Later syncs only request the
+        pages with a last_edited_time on or after the latest one already cached,
+        and merge them into the cache.
+
+        Pages that are deleted, archived or moved out of the database never show up
+        in a delta: Notion's queries do not return them. Reconciling lists the ids of
+        every page of the query (with only the title property, so a fraction of a full
+        pass) and removes the cached pages that are not among them. Pass reconcile=True,
+        or a reconcile_interval to reconcile whenever the last reconciliation of the
+        scope is older than that.
+
+        Args:
+            db (str): Notion's db (full https link or dbid)
+            cache (NotionPageCache): Local page cache
+            query (Union[str, dict, NotionQuery]): Query to be sent, see query_db
+            return_type (Optional[str]): Format for results ("dataframe", "json", "NotionPage"),
+                                         or None to only sync the cache
+            reconcile (bool): Remove the cached pages that are no longer in the database
+            reconcile_interval (Optional[float]): Seconds after which a sync reconciles on its own.
+                                                  None only reconciles when asked to.
+
+        Returns:
+            Union[pd.DataFrame, list[dict], list[NotionPage], None]: Cached pages in the specified format
+        """
+        db = self._parse_db(db)
+        query = NotionQuery.parse(query)
+        scope = self._get_cache_scope(db, query)
+
+        last_edited_time = cache.get_last_edited_time(scope)
+        if last_edited_time:
+            self.logger.info(f"Syncing database {db} changes since {last_edited_time}")
+            delta = query.copy().where_timestamp("last_edited_time", "on_or_after", last_edited_time)
+            if not reconcile and reconcile_interval is not None:
+                reconciled_at = cache.get_reconciled_at(scope)
+                reconcile = reconciled_at is None or time.time() - reconciled_at >= reconcile_interval
+        else:
+            self.logger.info(f"Syncing all pages of database {db}")
+            delta = query
+
+        headers = self._build_db_headers(db)
+        high_water_mark = last_edited_time
+        page_ids = set()
+        upserted = removed = 0
+        started = time.time()
+        for page_results in self._iter_query_results(db, headers, delta):
+            merged = cache.merge_pages(scope, page_results)
+            upserted += merged[0]
+            removed += merged[1]
+            for page in page_results:
+                page_ids.add(page["id"])
+                if not high_water_mark or page["last_edited_time"] > high_water_mark:
+                    high_water_mark = page["last_edited_time"]
+
+        if not last_edited_time or reconcile:
+            if last_edited_time:
+                # Only the ids are needed; the title is the one property every database has.
+                self.logger.info(f"Reconciling the cached pages of database {db}")
+                ids_query = query.copy()
+                ids_query.filter_properties = ["title"]
+                page_ids = {
+                    page["id"] for page_results in self._iter_query_results(db, headers, ids_query)
+                    for page in page_results
+                }
+            removed += cache.remove_missing_pages(scope, page_ids)
+            cache.set_reconciled_at(scope, started)
+        if high_water_mark:
+            cache.set_last_edited_time(scope, high_water_mark)
+
+        self.logger.info(f"Synced database {db}: {upserted} pages updated, {removed} removed")
+
+        if return_type is None:
+            return None
+        return self._format_results(cache.get_pages(scope), return_type)
+
+    def get_cache_scope(self, db: str, query: Union[str, dict, NotionQuery] = "") -> str:
+        """
+        Returns the page cache scope sync_db stores a database query under.
+
+        Args:
+            db (str): Notion's db (full https link or dbid)
+            query (Union[str, dict, NotionQuery]): Query sent to the database, see query_db
+
+        Returns:
+            str: Cache scope
+        """
+        return self._get_cache_scope(self._parse_db(db), NotionQuery.parse(query))
 
-    def _execute_query(self, db: str, headers: dict, data: str) -> list[dict]:
+    def get_last_edited(self, db: str, query: Union[str, dict, NotionQuery] = "") -> Optional[tuple[str, str]]:
+        """
+        Returns the most recently edited page of a database query, with a single
+        request of one result and only the title property: a cheap way to tell
+        whether anything changed since a previous call.
+
+        The query's sorts are replaced by last_edited_time descending; its filter is kept.
+        Notion rounds last_edited_time to the minute, and pages that are deleted
+        (or archived) without being the newest one leave the result unchanged.
+
+        Args:
+            db (str): Notion's db (full https link or dbid)
+            query (Union[str, dict, NotionQuery]): Query sent to the database, see query_db
+
+        Returns:
+            Optional[tuple[str, str]]: (last_edited_time, page id) of the newest page, None if there are no pages
+        """
+        db = self._parse_db(db)
+        probe = NotionQuery.parse(query).copy()
+        probe.sorts = []
+        probe.sort_by(timestamp="last_edited_time", direction="descending")
+        probe.filter_properties = ["title"]
+        probe.page_size = 1
+
+        response = self._post_request(
+            self._get_base_url() + f"databases/{db}/query",
+            headers=self._build_db_headers(db),
+            json_arg=probe.to_body(),
+            params=probe.to_params(),
+        )
+        results = self.json_backend.loads(response.content)["results"]
+        if not results:
+            return None
+        return results[0]["last_edited_time"], results[0]["id"]
+
+    def _get_cache_scope(self, db: str, query: NotionQuery) -> str:
+        """
+        Returns the page cache scope of a database query.
+
+        Args:
+            db (str): Notion's db id
+            query (NotionQuery): Query sent to the database
+
+        Returns:
+            str: The db id, suffixed with a hash of the query if it is not the default one
+        """
+        query_json = query.to_json()
+        if query_json == NotionQuery().to_json():
+            return db
+        return f"{db}:{hashlib.sha256(query_json.encode()).hexdigest()[:16]}"
+
+    def iter_db(
+        self,
+        db: str,
+        query: Union[str, dict, NotionQuery] = "",
+        return_type: str = "NotionPage",
+        chunk_size: int = 100,
+        prefetch: int = 1,
+        columns: Optional[list[str]] = None,
+    ) -> Iterator[Union[dict, NotionPage, pd.DataFrame]]:
+        """
+        Queries a database and yields the results as each cursor page arrives.
+
+        Only the cursor pages that have not been consumed yet are held in memory,
+        so memory stays bounded by roughly (prefetch + 1) pages of results
+        instead of the whole database.
+
+        Args:
+            db (str): Notion's db (full https link or dbid)
+            query (Union[str, dict, NotionQuery]): Query to be sent, see query_db
+            return_type (str): Format for results ("json", "NotionPage", "dataframe").
+                               "dataframe" yields DataFrame chunks of chunk_size rows.
+            chunk_size (int): Number of rows per DataFrame chunk
+            prefetch (int): Number of cursor pages fetched ahead in a background
+                            thread while the consumer converts the current one.
+                            0 fetches synchronously.
+            columns (Optional[list[str]]): Only fetch and decode these properties, see select_columns.
+
+        Yields:
+            Union[dict, NotionPage, pd.DataFrame]: Query results in the specified format
+        """
+        if return_type not in ("json", "NotionPage", "dataframe"):
+            raise ValueError(f"Unsupported return_type: {return_type}")
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+
+        db = self._parse_db(db)
+
+        self.logger.info(f"Attempting to stream database {db}")
+        headers = self._build_db_headers(db)
+        query = NotionQuery.parse(query)
+        converter = None
+        if columns is not None:
+            query, converter = self._project(db, query, columns)
+
+        if self.decode_workers and return_type == "dataframe":
+            # The workers already overlap fetching with conversion.
+            yield from self._rechunk_dataframes(self._iter_decoded_chunks(db, headers, query, converter), chunk_size)
+            return
+
+        result_pages = self._iter_query_results(db, headers, query)
+        if prefetch > 0:
+            result_pages = self._prefetch(result_pages, prefetch)
+
+        if return_type == "dataframe":
+            yield from self._iter_dataframe_chunks(result_pages, chunk_size, converter)
+            return
+
+        for json_results in result_pages:
+            if return_type == "json":
+                yield from json_results
+            else:
+                yield from self._convert_to_notion_pages(json_results)
+
+    def _execute_query(self, db: str, headers: dict, query: NotionQuery) -> list[dict]:
         """
         Executes a database query and retrieves results.
 
         Args:
             db (str): Notion's db id
             headers (dict): Request headers
-            data (str): Query data
+            query (NotionQuery): Query to be sent
 
         Returns:
             list[dict]: Query results as a list of dictionaries
         """
-        response = self._post_request(
-            f"https://api.notion.com/v1/databases/{db}/query",
-            headers=headers,
-            data=data,
-        )
-        json_content = json.loads(response.content)
-        json_results = json_content["results"]
+        json_results = []
+        for page_results in self._iter_query_results(db, headers, query):
+            json_results += page_results
 
-        while json_content["has_more"]:
-            next_cursor = json_content["next_cursor"]
-            data = {"start_cursor": next_cursor}
+        return json_results
+
+    def _iter_query_results(self, db: str, headers: dict, query: NotionQuery) -> Iterator[list[dict]]:
+        """
+        Executes a database query and yields the results of each cursor page.
+        The query's filter, sorts and filter_properties are sent on every request.
+
+        Args:
+            db (str): Notion's db id
+            headers (dict): Request headers
+            query (NotionQuery): Query to be sent
+
+        Yields:
+            list[dict]: Results of one cursor page
+        """
+        for _, json_content in self._iter_query_responses(db, headers, query):
+            yield json_content["results"]
+
+    def _iter_query_responses(self, db: str, headers: dict, query: NotionQuery) -> Iterator[tuple[bytes, dict]]:
+        """
+        Executes a database query and yields each cursor page's response.
+
+        Args:
+            db (str): Notion's db id
+            headers (dict): Request headers
+            query (NotionQuery): Query to be sent
+
+        Yields:
+            tuple[bytes, dict]: Raw body of one cursor page's response, and the body decoded
+        """
+        request_url = self._get_base_url() + f"databases/{db}/query"
+        params = query.to_params()
+        next_cursor = None
+
+        while True:
+            if next_cursor is not None and len(self.NOTION_API_KEYS) > 1:
+                # Cursors are not tied to a key, so every page can go through the least busy one.
+                headers = {**headers, **self._build_db_headers(db)}
             response = self._post_request(
-                f"https://api.notion.com/v1/databases/{db}/query",
-                headers=headers,
-                json_arg=data,
+                request_url, headers=headers, json_arg=query.to_body(next_cursor), params=params
             )
-            json_content = json.loads(response.content)
-            json_results += json_content["results"]
+            started = time.perf_counter()
+            json_content = self.json_backend.loads(response.content)
+            self._emit("page", db=db, rows=len(json_content["results"]), decode_seconds=time.perf_counter() - started)
+            yield response.content, json_content
 
-        return json_results
+            if not json_content["has_more"]:
+                return
+            next_cursor = json_content["next_cursor"]
 
-    def _convert_to_notion_pages(self, json_results: list[dict]) -> list[NotionPage]:
+    def _iter_decoded_chunks(
+        self, db: str, headers: dict, query: NotionQuery, converter: Optional[ColumnarConverter] = None
+    ) -> Iterator[pd.DataFrame]:
         """
-        Converts JSON query results to a list of NotionPage objects.
+        Executes a database query and converts each cursor page to a DataFrame on the decode workers.
+
+        The next cursor is needed before the next page can be requested, so each
+        response is still decoded here; the workers decode it again and do the
+        (much slower) conversion, while up to two pages per worker are fetched ahead.
 
         Args:
-            json_results (list[dict]): JSON query results
+            db (str): Notion's db id
+            headers (dict): Request headers
+            query (NotionQuery): Query to be sent
+            converter (Optional[ColumnarConverter]): Converter whose schema the workers use.
+                                                     By default each page's own property types.
 
-        Returns:
-            list[NotionPage]: List of NotionPage objects
+        Yields:
+            pd.DataFrame: Results of one cursor page, in order
         """
-        return [NotionPage(page) for page in json_results]
-    def _convert_to_dataframe(self, notion_pages: list[NotionPage]) -> pd.DataFrame:
-    
-    
+        if self._decode_pool is None:
+            self._decode_pool = ProcessPoolExecutor(max_workers=self.decode_workers)
+        schema = converter.schema if converter is not None else None
+
+        pending = deque()
+        try:
+            for content, _ in self._iter_query_responses(db, headers, query):
+                future = self._decode_pool.submit(decode_and_convert, content, schema, self.json_backend.name)
+                pending.append(future)
+                if len(pending) > 2 * self.decode_workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def _concat_dataframes(self, frames: list[pd.DataFrame]) -> pd.DataFrame:
+        """
+        Concatenates DataFrame chunks of the same query. Select columns stay categorical
+        even when the chunks saw different options.
+        """
+        if not frames:
+            return pd.DataFrame()
+        if len(frames) == 1:
+            return frames[0]
+
+        df = pd.concat(frames, ignore_index=True)
+        for name, dtype in frames[0].dtypes.items():
+            if isinstance(dtype, pd.CategoricalDtype) and not isinstance(df[name].dtype, pd.CategoricalDtype):
+                df[name] = df[name].astype("category")
+        return df
+
+    def _rechunk_dataframes(self, frames: Iterator[pd.DataFrame], chunk_size: int) -> Iterator[pd.DataFrame]:
+        """
+        Regroups DataFrames of any size into chunks of chunk_size rows.
+
+        Args:
+            frames (Iterator[pd.DataFrame]): DataFrames of the same query, in order
+            chunk_size (int): Number of rows per chunk
+
+        Yields:
+            pd.DataFrame: Chunk of query results. The last chunk may be smaller.
+        """
+        pending, rows = [], 0
+        for frame in frames:
+            pending.append(frame)
+            rows += len(frame)
+            if rows < chunk_size:
+                continue
+
+            merged = self._concat_dataframes(pending)
+            complete = len(merged) - len(merged) % chunk_size
+            for start in range(0, complete, chunk_size):
+                yield merged.iloc[start:start + chunk_size].reset_index(drop=True)
+            rest = merged.iloc[complete:].reset_index(drop=True)
+            pending, rows = ([rest] if len(rest) else []), len(rest)
+
+        if pending:
+            yield self._concat_dataframes(pending)
+
+    def _prefetch(self, iterator: Iterator, depth: int) -> Iterator:
+        """
+        Consumes an iterator in a background thread, keeping up to depth items ahead.
+
+        Args:
+            iterator (Iterator): Iterator to consume, e.g. cursor pages
+            depth (int): Maximum number of items buffered ahead of the consumer
+
+        Yields:
+            Items of the iterator, in order. Exceptions raised by the iterator
+            are re-raised in the consumer.
+        """
+        buffer = queue.Queue(maxsize=depth)
+        stop = threading.Event()
+        done = object()
+
+        def produce():
+            try:
+                for item in iterator:
+                    while not stop.is_set():
+                        try:
+                            buffer.put((item, None), timeout=0.1)
+                            break
+                        except queue.Full:
+                            continue
+                    if stop.is_set():
+                        return
+                buffer.put((done, None))
+            except Exception as e:
+                buffer.put((done, e))
+
+        producer = threading.Thread(target=produce, name="notion-prefetch", daemon=True)
+        producer.start()
+        try:
+            while True:
+                item, error = buffer.get()
+                if item is done:
+                    if error is not None:
+                        raise error
+                    return
+                yield item
+        finally:
+            stop.set()
+
+    def _iter_dataframe_chunks(
+        self, result_pages: Iterator[list[dict]], chunk_size: int, converter: Optional[ColumnarConverter] = None
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Regroups cursor pages of results into DataFrame chunks of chunk_size rows.
+
+        Args:
+            result_pages (Iterator[list[dict]]): Results of each cursor page
+            chunk_size (int): Number of rows per DataFrame chunk
+            converter (Optional[ColumnarConverter]): Converter to use. By default it is
+                                                     built from the first chunk's property types.
+
+        Yields:
+            pd.DataFrame: Chunk of query results. The last chunk may be smaller.
+        """
+        pending = []
+        for json_results in result_pages:
+            pending += json_results
+            while len(pending) >= chunk_size:
+                chunk, pending = pending[:chunk_size], pending[chunk_size:]
+                converter = converter or ColumnarConverter.from_pages(chunk)
+                yield self._convert_to_dataframe(chunk, converter)
 
-     def get_page(self, page_id: str) -> Response:
+        if pending:
+            converter = converter or ColumnarConverter.from_pages(pending)
+            yield self._convert_to_dataframe(pending, converter)
+
+    def get_page(self, page_id: str, expected_statuses: tuple[int, ...] = ()) -> Response:
         """
         Queries the Notion API for a specific page and returns it.
 
         Args:
             page_id (str): Notion's page id (formatted or not)
+            expected_statuses (tuple[int, ...]): Error statuses returned as is instead of
+                                                 being logged and raised, e.g. (403, 404)
+                                                 for pages that may not be shared.
 
         Returns:
             Response: Response from the Notion API
@@ -252,9 +1142,9 @@ class NotionAPI:
 
         request_url = f"{base_request}/{page_id}"
         headers = self._build_headers()
-        response = self._get_request(request_url, headers)
+        response = self._get_request(request_url, headers, cacheable=True, expected_statuses=expected_statuses)
 
-        if response.status_code != 200:
+        if response.status_code != 200 and response.status_code not in expected_statuses:
             raise ValueError("Did not get response 200")
 
         return response
@@ -269,37 +1159,239 @@ class NotionAPI:
         Returns:
             Response: Response from the Notion API
         """
+        db_id = self._parse_db(db_id)
+
         base_request = self._get_base_url() + "databases"
 
         db_id = self._format_page_id(db_id)
 
         request_url = f"{base_request}/{db_id}"
-        headers = self._build_headers()
-        response = self._get_request(request_url, headers)
+        if len(self.NOTION_API_KEYS) == 1:
+            return self._get_request(request_url, self._build_headers(), cacheable=True)
 
+        with self._keys_lock:
+            keys = self._db_keys.get(db_id.replace("-", ""))
+        if keys is not None:
+            return self._get_request(request_url, self._build_headers(self._pick_key(keys)), cacheable=True)
+
+        self.logger.info(f"Checking which of the {len(self.NOTION_API_KEYS)} API keys can access database {db_id}")
+        response = None
+        keys = []
+        for api_key in self.NOTION_API_KEYS:
+            # Notion answers 404 to the keys of integrations the database is not shared with.
+            try:
+                key_response = self._get_request(
+                    request_url, self._build_headers(api_key), cacheable=True, expected_statuses=(403, 404)
+                )
+            except ConnectionError:
+                continue
+            if key_response.status_code == 200:
+                keys.append(api_key)
+                response = response or key_response
+            else:
+                self.logger.debug(f"An API key got response {key_response.status_code} for database {db_id}")
+        if response is None:
+            raise ValueError(f"None of the {len(self.NOTION_API_KEYS)} API keys can access database {db_id}")
+
+        self.logger.info(f"{len(keys)} of the {len(self.NOTION_API_KEYS)} API keys can access database {db_id}")
+        with self._keys_lock:
+            self._db_keys[db_id.replace("-", "")] = keys
         return response
 
-    
-    def _get_request(self, request_url: str, headers: dict) -> Response:
+    def get_db_title(self, db_id: str) -> str:
+        """
+        Returns the plain text title of a database.
+
+        Args:
+            db_id (str): Notion's db (full https link or dbid)
+
+        Returns:
+            str: Database title
+        """
+        return self._extract_db_title(json.loads(self.get_db(db_id).content))
+
+    def _get_request(
+        self, request_url: str, headers: dict, cacheable: bool = False, expected_statuses: tuple[int, ...] = ()
+    ) -> Response:
         """
         Sends a GET HTTP request to Notion's API and handles errors.
 
         Args:
             request_url (str): Request URL for the HTTP request.
             headers (dict): Headers for the HTTP request.
+            cacheable (bool): Whether the response may be served from / stored in
+                              the response cache, if the instance has one.
+            expected_statuses (tuple[int, ...]): Error statuses returned as is instead of
+                                                 being logged and raised, see _send_request.
 
         Returns:
             Response: Response from the Notion API.
         """
-        try:
-            response = requests.get(request_url, headers=headers)
-            response.raise_for_status()
-        except requests.exceptions.RequestException as e:
-            self.logger.error(
-                f"Received HTTP response: {response.status_code}. Reason: {response.reason}"
-            )
-            raise ConnectionError(e)
-        
+        if not cacheable or self.response_cache is None:
+            return self._send_request("GET", request_url, headers, expected_statuses=expected_statuses)
+
+        key = self.response_cache.get_key(request_url, headers)
+        response, etag = self.response_cache.get(key)
+        self._emit("cache", url=request_url, hit=response is not None)
+        if response is not None:
+            return response
+
+        if etag:
+            headers = {**headers, "If-None-Match": etag}
+        response = self._send_request("GET", request_url, headers, expected_statuses=expected_statuses)
+
+        if response.status_code == 304:
+            cached_response = self.response_cache.refresh(key)
+            if cached_response is not None:
+                return cached_response
+            headers = {name: value for name, value in headers.items() if name != "If-None-Match"}
+            response = self._send_request("GET", request_url, headers, expected_statuses=expected_statuses)
+
+        if response.status_code == 200:
+            self.response_cache.set(key, response)
         return response
-    
 
+    def _post_request(
+        self,
+        request_url: str,
+        headers: dict,
+        data: Optional[str] = None,
+        json_arg: Optional[dict] = None,
+        params: Optional[list[tuple[str, str]]] = None,
+    ) -> Response:
+        """
+        Sends a POST HTTP request to Notion's API and handles errors.
+
+        Args:
+            request_url (str): Request URL for the HTTP request.
+            headers (dict): Headers for the HTTP request.
+            data (Optional[str]): Raw body for the HTTP request.
+            json_arg (Optional[dict]): Body for the HTTP request, sent as JSON.
+            params (Optional[list[tuple[str, str]]]): URL query parameters.
+
+        Returns:
+            Response: Response from the Notion API.
+        """
+        if data and json_arg is None:
+            headers = {**headers, "Content-Type": "application/json"}
+        return self._send_request(
+            "POST", request_url, headers, data=data or None, json_arg=json_arg, params=params
+        )
+
+    def _send_request(
+        self,
+        method: str,
+        request_url: str,
+        headers: dict,
+        data: Optional[str] = None,
+        json_arg: Optional[dict] = None,
+        params: Optional[list[tuple[str, str]]] = None,
+        expected_statuses: tuple[int, ...] = (),
+    ) -> Response:
+        """
+        Sends an HTTP request through the pooled session and handles errors.
+
+        Args:
+            method (str): HTTP method.
+            request_url (str): Request URL for the HTTP request.
+            headers (dict): Headers for the HTTP request.
+            data (Optional[str]): Raw body for the HTTP request.
+            json_arg (Optional[dict]): Body for the HTTP request, sent as JSON.
+            params (Optional[list[tuple[str, str]]]): URL query parameters.
+            expected_statuses (tuple[int, ...]): Error statuses the caller handles, e.g. 404
+                                                 when probing: such responses are returned
+                                                 without being logged, retried or reported
+                                                 to the error hooks.
+
+        Returns:
+            Response: Response from the Notion API.
+        """
+        if self._session is None:
+            raise ConnectionError("NotionAPI session is closed")
+
+        bucket = self.scheduler.get_bucket(self._get_api_key(headers))
+        attempt = 0
+        while True:
+            bucket.acquire()
+            response = None
+            self._emit("request", method=method, url=request_url, attempt=attempt)
+            started = time.perf_counter()
+            try:
+                response = self._session_request(method, request_url, headers, data, json_arg, params)
+                if response.status_code not in expected_statuses:
+                    response.raise_for_status()
+                self._emit(
+                    "response",
+                    method=method,
+                    url=request_url,
+                    status_code=response.status_code,
+                    response_bytes=len(response.content),
+                    seconds=time.perf_counter() - started,
+                )
+                return response
+            except Exception as e:
+                if not self._is_http_error(e):
+                    raise
+                status_code = response.status_code if response is not None else None
+                retry_after = response.headers.get("Retry-After") if response is not None else None
+
+                delay = self.scheduler.get_retry_delay(attempt, status_code, retry_after)
+                if delay is None:
+                    self._emit("error", method=method, url=request_url, status_code=status_code, error=e)
+                    if response is not None:
+                        self.logger.error(
+                            f"Received HTTP response: {response.status_code}. Reason: {self._get_reason(response)}"
+                        )
+                    else:
+                        self.logger.error(f"HTTP request to {request_url} failed: {e}")
+                    raise ConnectionError(e) from e
+
+                self.logger.warning(
+                    f"HTTP request to {request_url} failed ({status_code or e}). Retrying in {delay:.2f}s"
+                )
+                self._emit(
+                    "retry", method=method, url=request_url, status_code=status_code, delay=delay, attempt=attempt
+                )
+                if status_code == 429:
+                    bucket.pause(delay)
+                else:
+                    time.sleep(delay)
+                attempt += 1
+
+    def _session_request(
+        self,
+        method: str,
+        request_url: str,
+        headers: dict,
+        data: Optional[str],
+        json_arg: Optional[dict],
+        params: Optional[list[tuple[str, str]]] = None,
+    ):
+        """Sends a single HTTP request with whichever transport the session uses."""
+        if isinstance(self._session, requests.Session):
+            return self._session.request(
+                method,
+                request_url,
+                headers=headers,
+                params=params,
+                data=data,
+                json=json_arg,
+                timeout=self.timeout,
+            )
+        return self._session.request(
+            method, request_url, headers=headers, params=params, content=data, json=json_arg
+        )
+
+    def _is_http_error(self, error: Exception) -> bool:
+        """Checks whether an exception was raised by the HTTP transport."""
+        if isinstance(error, requests.exceptions.RequestException):
+            return True
+        try:
+            import httpx
+        except ImportError:
+            return False
+        return isinstance(error, httpx.HTTPError)
+
+    def _get_reason(self, response) -> str:
+        """Returns the reason phrase of a response from either transport."""
+        return getattr(response, "reason", None) or getattr(response, "reason_phrase", "")
@@ -0,0 +1,445 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+from typing import Optional, Union
+from Notion.Notion_API import NotionAPIBase
+from Notion.Notion_JSON import get_json_backend
+from Notion.Notion_Query import NotionQuery
+from Notion.Notion_Rate_Limit import RequestScheduler, get_default_scheduler
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+
+class AsyncNotionAPI(NotionAPIBase):
+    """
+    asyncio counterpart of NotionAPI built on httpx.AsyncClient.
+
+    Mirrors query_db, get_page, get_db and get_db_title as coroutines, and adds
+    query_dbs to fetch many databases concurrently over one connection pool.
+    Like NotionAPI, it accepts a pool of keys whose rate limits add up.
+
+    Usage:
+        async with AsyncNotionAPI(key) as notion:
+            dfs = await notion.query_dbs(db_ids, max_concurrency=8)
+    """
+
+    def __init__(
+        self,
+        notion_api_key: Union[str, list[str]],
+        pool_size: int = 10,
+        keep_alive: bool = True,
+        http2: bool = False,
+        timeout: Optional[float] = 30.0,
+        base_url: str = "https://api.notion.com/v1/",
+        scheduler: Optional[RequestScheduler] = None,
+        json_backend: Optional[str] = None,
+    ):
+        """Constructor for AsyncNotionAPI class.
+        The connection is checked when entering the async context (or in connect()).
+
+        Several keys (a list, or a comma-separated string) pool the rate limits of
+        several integrations, as with NotionAPI: each database's cursor pages are sent
+        with the least busy key that can access it. Pages are requested with the first key.
+
+        Args:
+            notion_api_key (Union[str, list[str]]): Notion API key used to call Notion's API, or several
+                                                    keys, as a list or separated by commas
+            pool_size (int): Maximum number of pooled connections kept to Notion's API
+            keep_alive (bool): Whether connections are kept open between requests
+            http2 (bool): Use HTTP/2 (requires httpx[http2])
+            timeout (Optional[float]): Timeout in seconds for each HTTP request
+            base_url (str): Base URL of Notion's API
+            scheduler (Optional[RequestScheduler]): Rate limit scheduler. Defaults to the
+                                                    process-wide scheduler shared by all clients.
+            json_backend (Optional[str]): JSON decoder for query responses ("orjson", "simdjson"
+                                          or "json"). Defaults to the fastest one installed.
+        """
+        if httpx is None:
+            raise ImportError("AsyncNotionAPI requires the 'httpx' package to be installed.")
+        if pool_size < 1:
+            raise ValueError("pool_size must be at least 1")
+
+        self.logger = logging.getLogger("notion")
+        self.base_url = base_url if base_url.endswith("/") else base_url + "/"
+        self.timeout = timeout
+        self.keep_alive = keep_alive
+        self.scheduler = scheduler or get_default_scheduler()
+        self.json_backend = get_json_backend(json_backend)
+
+        self.NOTION_API_KEYS = self._parse_keys(notion_api_key)
+        self.NOTION_API_KEY = self.NOTION_API_KEYS[0]
+        self._db_keys = {}
+        self._keys_lock = threading.Lock()
+        self._key_turn = 0
+
+        limits = httpx.Limits(
+            max_connections=pool_size,
+            max_keepalive_connections=pool_size if keep_alive else 0,
+        )
+        self._client = httpx.AsyncClient(http2=http2, limits=limits, timeout=timeout)
+
+    async def __aenter__(self) -> "AsyncNotionAPI":
+        try:
+            await self.connect()
+        except Exception:
+            await self.aclose()
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+
+    async def connect(self):
+        """Validates the connection to the API of every key by making a basic query."""
+        for api_key in self.NOTION_API_KEYS:
+            headers = self._build_headers(api_key)
+            response = await self._get_request(self._get_base_url() + "users", headers)
+
+            if response.status_code != 200:
+                raise ConnectionError(f"API connection validation failed. Status code: {response.status_code}")
+
+    async def _get_db_keys(self, db: str) -> list[str]:
+        """
+        Returns the API keys that can access a database, see NotionAPI._get_db_keys.
+
+        Args:
+            db (str): Notion's db id
+
+        Returns:
+            list[str]: Keys with access to the database
+        """
+        if len(self.NOTION_API_KEYS) == 1:
+            return self.NOTION_API_KEYS
+
+        db_id = db.replace("-", "")
+        if db_id not in self._db_keys:
+            await self.get_db(db)
+        return self._db_keys[db_id]
+
+    async def _build_db_headers(self, db: str) -> dict:
+        """
+        Builds the headers of a request about a database, with the least busy key that can access it.
+
+        Args:
+            db (str): Notion's db id
+
+        Returns:
+            dict: Request headers
+        """
+        if len(self.NOTION_API_KEYS) == 1:
+            return self._build_headers()
+        return self._build_headers(self._pick_key(await self._get_db_keys(db)))
+
+    async def aclose(self):
+        """Closes the underlying HTTP client and its connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def query_db(
+        self, db: str, query: Union[str, dict, NotionQuery] = "", return_type: str = "dataframe"
+    ):
+        """
+        Queries a database and returns the results in various possible formats.
+
+        Args:
+            db (str): Notion's db (full https link or dbid)
+            query (Union[str, dict, NotionQuery]): Query to be sent on every paginated request
+            return_type (str): Format for results ("dataframe", "json", "NotionPage")
+
+        Returns:
+            Union[pd.DataFrame, list[dict], list[NotionPage]]: Query results in the specified format
+        """
+        db = self._parse_db(db)
+
+        self.logger.info(f"Attempting to query database {db}")
+        headers = await self._build_db_headers(db)
+        query = NotionQuery.parse(query)
+
+        json_results = await self._execute_query(db, headers, query)
+
+        return self._format_results(json_results, return_type)
+
+    async def query_dbs(
+        self,
+        dbs: list[str],
+        query: Union[str, dict, NotionQuery] = "",
+        return_type: str = "dataframe",
+        max_concurrency: int = 4,
+    ) -> dict:
+        """
+        Queries several databases concurrently.
+
+        Pagination within a database is inherently sequential (each cursor
+        comes from the previous response), so concurrency is across databases:
+        at most max_concurrency databases are being fetched at any time.
+
+        Args:
+            dbs (list[str]): Notion's dbs (full https links or dbids)
+            query (Union[str, dict, NotionQuery]): Query to be sent to every database
+            return_type (str): Format for results ("dataframe", "json", "NotionPage")
+            max_concurrency (int): Maximum number of databases fetched at the same time
+
+        Returns:
+            dict: db as given in dbs to its query results in the specified format
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def bounded_query(db: str):
+            async with semaphore:
+                return await self.query_db(db, query=query, return_type=return_type)
+
+        results = await asyncio.gather(*(bounded_query(db) for db in dbs))
+        return dict(zip(dbs, results))
+
+    async def _execute_query(self, db: str, headers: dict, query: NotionQuery) -> list[dict]:
+        """
+        Executes a database query and retrieves results.
+
+        Args:
+            db (str): Notion's db id
+            headers (dict): Request headers
+            query (NotionQuery): Query to be sent on every paginated request
+
+        Returns:
+            list[dict]: Query results as a list of dictionaries
+        """
+        request_url = self._get_base_url() + f"databases/{db}/query"
+        params = query.to_params()
+        json_results = []
+        next_cursor = None
+
+        while True:
+            if next_cursor is not None and len(self.NOTION_API_KEYS) > 1:
+                # Cursors are not tied to a key, so every page can go through the least busy one.
+                headers = {**headers, **(await self._build_db_headers(db))}
+            response = await self._post_request(
+                request_url, headers=headers, json_arg=query.to_body(next_cursor), params=params
+            )
+            started = time.perf_counter()
+            json_content = self.json_backend.loads(response.content)
+            self._emit("page", db=db, rows=len(json_content["results"]), decode_seconds=time.perf_counter() - started)
+            json_results += json_content["results"]
+
+            if not json_content["has_more"]:
+                return json_results
+            next_cursor = json_content["next_cursor"]
+
+    async def get_page(self, page_id: str, expected_statuses: tuple[int, ...] = ()) -> "httpx.Response":
+        """
+        Queries the Notion API for a specific page and returns it.
+
+        Args:
+            page_id (str): Notion's page id (formatted or not)
+            expected_statuses (tuple[int, ...]): Error statuses returned as is instead of
+                                                 being logged and raised, e.g. (403, 404)
+                                                 for pages that may not be shared.
+
+        Returns:
+            httpx.Response: Response from the Notion API
+        """
+        page_id = self._format_page_id(page_id)
+
+        request_url = self._get_base_url() + f"pages/{page_id}"
+        headers = self._build_headers()
+        response = await self._get_request(request_url, headers, expected_statuses=expected_statuses)
+
+        if response.status_code != 200 and response.status_code not in expected_statuses:
+            raise ValueError("Did not get response 200")
+
+        return response
+
+    async def get_db(self, db_id: str) -> "httpx.Response":
+        """
+        Queries the Notion API for a specific database and returns it.
+
+        Args:
+            db_id (str): Notion's db (full https link or dbid, formatted or not)
+
+        Returns:
+            httpx.Response: Response from the Notion API
+        """
+        db_id = self._format_page_id(self._parse_db(db_id))
+
+        request_url = self._get_base_url() + f"databases/{db_id}"
+        if len(self.NOTION_API_KEYS) == 1:
+            return await self._get_request(request_url, self._build_headers())
+
+        keys = self._db_keys.get(db_id.replace("-", ""))
+        if keys is not None:
+            return await self._get_request(request_url, self._build_headers(self._pick_key(keys)))
+
+        self.logger.info(f"Checking which of the {len(self.NOTION_API_KEYS)} API keys can access database {db_id}")
+        response = None
+        keys = []
+        for api_key in self.NOTION_API_KEYS:
+            # Notion answers 404 to the keys of integrations the database is not shared with.
+            try:
+                key_response = await self._get_request(
+                    request_url, self._build_headers(api_key), expected_statuses=(403, 404)
+                )
+            except ConnectionError:
+                continue
+            if key_response.status_code == 200:
+                keys.append(api_key)
+                response = response or key_response
+            else:
+                self.logger.debug(f"An API key got response {key_response.status_code} for database {db_id}")
+        if response is None:
+            raise ValueError(f"None of the {len(self.NOTION_API_KEYS)} API keys can access database {db_id}")
+
+        self.logger.info(f"{len(keys)} of the {len(self.NOTION_API_KEYS)} API keys can access database {db_id}")
+        self._db_keys[db_id.replace("-", "")] = keys
+        return response
+
+    async def get_db_title(self, db_id: str) -> str:
+        """
+        Returns the plain text title of a database.
+
+        Args:
+            db_id (str): Notion's db (full https link or dbid)
+
+        Returns:
+            str: Database title
+        """
+        return self._extract_db_title(json.loads((await self.get_db(db_id)).content))
+
+    async def _get_request(
+        self, request_url: str, headers: dict, expected_statuses: tuple[int, ...] = ()
+    ) -> "httpx.Response":
+        """Sends a GET HTTP request to Notion's API and handles errors."""
+        return await self._send_request("GET", request_url, headers, expected_statuses=expected_statuses)
+
+    async def _post_request(
+        self,
+        request_url: str,
+        headers: dict,
+        data: Optional[str] = None,
+        json_arg: Optional[dict] = None,
+        params: Optional[list[tuple[str, str]]] = None,
+    ) -> "httpx.Response":
+        """Sends a POST HTTP request to Notion's API and handles errors."""
+        if data and json_arg is None:
+            headers = {**headers, "Content-Type": "application/json"}
+        return await self._send_request(
+            "POST", request_url, headers, data=data or None, json_arg=json_arg, params=params
+        )
+
+    async def _send_request(
+        self,
+        method: str,
+        request_url: str,
+        headers: dict,
+        data: Optional[str] = None,
+        json_arg: Optional[dict] = None,
+        params: Optional[list[tuple[str, str]]] = None,
+        expected_statuses: tuple[int, ...] = (),
+    ) -> "httpx.Response":
+        """
+        Sends an HTTP request through the pooled client and handles errors.
+
+        Args:
+            method (str): HTTP method.
+            request_url (str): Request URL for the HTTP request.
+            headers (dict): Headers for the HTTP request.
+            data (Optional[str]): Raw body for the HTTP request.
+            json_arg (Optional[dict]): Body for the HTTP request, sent as JSON.
+            params (Optional[list[tuple[str, str]]]): URL query parameters.
+            expected_statuses (tuple[int, ...]): Error statuses the caller handles, returned
+                                                 without being logged, retried or reported.
+
+        Returns:
+            httpx.Response: Response from the Notion API.
+        """
+        if self._client is None:
+            raise ConnectionError("AsyncNotionAPI client is closed")
+
+        bucket = self.scheduler.get_bucket(self._get_api_key(headers))
+        attempt = 0
+        while True:
+            await bucket.acquire_async()
+            response = None
+            self._emit("request", method=method, url=request_url, attempt=attempt)
+            started = time.perf_counter()
+            try:
+                response = await self._client.request(
+                    method, request_url, headers=headers, params=params, content=data, json=json_arg
+                )
+                if response.status_code not in expected_statuses:
+                    response.raise_for_status()
+                self._emit(
+                    "response",
+                    method=method,
+                    url=request_url,
+                    status_code=response.status_code,
+                    response_bytes=len(response.content),
+                    seconds=time.perf_counter() - started,
+                )
+                return response
+            except httpx.HTTPError as e:
+                status_code = response.status_code if response is not None else None
+                retry_after = response.headers.get("Retry-After") if response is not None else None
+
+                delay = self.scheduler.get_retry_delay(attempt, status_code, retry_after)
+                if delay is None:
+                    self._emit("error", method=method, url=request_url, status_code=status_code, error=e)
+                    if response is not None:
+                        self.logger.error(
+                            f"Received HTTP response: {response.status_code}. Reason: {response.reason_phrase}"
+                        )
+                    else:
+                        self.logger.error(f"HTTP request to {request_url} failed: {e}")
+                    raise ConnectionError(e) from e
+
+                self.logger.warning(
+                    f"HTTP request to {request_url} failed ({status_code or e}). Retrying in {delay:.2f}s"
+                )
+                self._emit(
+                    "retry", method=method, url=request_url, status_code=status_code, delay=delay, attempt=attempt
+                )
+                if status_code == 429:
+                    bucket.pause(delay)
+                else:
+                    await asyncio.sleep(delay)
+                attempt += 1
+
+
+def query_dbs(
+    notion_api_key: Union[str, list[str]],
+    dbs: list[str],
+    query: str = "",
+    return_type: str = "dataframe",
+    max_concurrency: int = 4,
+    **client_kwargs,
+) -> dict:
+    """
+    Synchronous entry point to query several databases concurrently.
+
+    Args:
+        notion_api_key (Union[str, list[str]]): Notion API key used to call Notion's API, or several keys
+        dbs (list[str]): Notion's dbs (full https links or dbids)
+        query (str): Query to be sent to every database
+        return_type (str): Format for results ("dataframe", "json", "NotionPage")
+        max_concurrency (int): Maximum number of databases fetched at the same time
+        **client_kwargs: Extra arguments for AsyncNotionAPI (pool_size, http2, ...)
+
+    Returns:
+        dict: db as given in dbs to its query results in the specified format
+    """
+
+    async def run():
+        client_kwargs.setdefault("pool_size", max_concurrency)
+        async with AsyncNotionAPI(notion_api_key, **client_kwargs) as notion:
+            return await notion.query_dbs(
+                dbs, query=query, return_type=return_type, max_concurrency=max_concurrency
+            )
+
+    return asyncio.run(run())
@@ -0,0 +1,85 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Thread-safe in-memory LRU cache whose entries expire after a time to live.
+
+    Used to share looked-up Notion objects (e.g. related pages) across
+    queries made by the same NotionAPI instance.
+    """
+
+    def __init__(self, maxsize: int = 10000, ttl: Optional[float] = 3600.0):
+        """
+        Initializes an empty cache.
+
+        Args:
+            maxsize (int): Maximum number of entries; the least recently used are evicted first.
+            ttl (Optional[float]): Seconds an entry stays valid. None never expires entries.
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING, count=False) is not _MISSING
+
+    def get(self, key: Hashable, default: Any = None, count: bool = True) -> Any:
+        """
+        Returns the cached value of a key.
+
+        Args:
+            key (Hashable): Cache key.
+            default (Any): Value returned if the key is missing or expired.
+            count (bool): Whether the lookup counts towards hits/misses.
+
+        Returns:
+            Any: Cached value or default.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry[1] is None or entry[1] > time.monotonic()):
+                self._entries.move_to_end(key)
+                if count:
+                    self.hits += 1
+                return entry[0]
+
+            if entry is not None:
+                del self._entries[key]
+            if count:
+                self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any):
+        """
+        Stores a value, evicting the least recently used entry if the cache is full.
+
+        Args:
+            key (Hashable): Cache key.
+            value (Any): Value to cache.
+        """
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Removes every entry."""
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,215 @@
+from typing import Callable, Iterable, Optional
+import numpy as np
+import pandas as pd
+from Notion.Notion_JSON import get_json_backend
+
+
+def _raw_values(name: str, property_type: str, properties: list[dict]) -> list:
+    """Returns the raw value of a property for every page, None where it is missing."""
+    try:
+        return [page_properties[name][property_type] for page_properties in properties]
+    except KeyError:
+        pass
+
+    values = []
+    for page_properties in properties:
+        page_property = page_properties.get(name)
+        values.append(page_property.get(property_type) if page_property else None)
+    return values
+
+
+def _extract_plain_text(name: str, property_type: str, properties: list[dict]) -> pd.Series:
+    """title and rich_text: plain text of the first rich text object."""
+    values = [value[0]["plain_text"] if value else None for value in _raw_values(name, property_type, properties)]
+    return pd.Series(values, dtype=object)
+
+
+def _extract_string(name: str, property_type: str, properties: list[dict]) -> pd.Series:
+    """url, email and phone_number: the value itself."""
+    values = [value if value else None for value in _raw_values(name, property_type, properties)]
+    return pd.Series(values, dtype=object)
+
+
+def _extract_number(name: str, property_type: str, properties: list[dict]) -> pd.Series:
+    """number: float64 column, NaN where empty."""
+    return pd.Series(np.array(_raw_values(name, property_type, properties), dtype=np.float64))
+
+
+def _extract_checkbox(name: str, property_type: str, properties: list[dict]) -> pd.Series:
+    """checkbox: bool column."""
+    values = _raw_values(name, property_type, properties)
+    return pd.Series(np.fromiter((bool(value) for value in values), dtype=np.bool_, count=len(values)))
+
+
+def _extract_select(name: str, property_type: str, properties: list[dict]) -> pd.Series:
+    """select: categorical column of option names."""
+    values = [value["name"] if value else None for value in _raw_values(name, property_type, properties)]
+    return pd.Series(pd.Categorical(values))
+
+
+def _extract_multi_select(name: str, property_type: str, properties: list[dict]) -> pd.Series:
+    """multi_select: list of option names per row, None where empty."""
+    values = [
+        [selection["name"] for selection in value] if value else None
+        for value in _raw_values(name, property_type, properties)
+    ]
+    return pd.Series(values, dtype=object)
+
+
+def _extract_relation(name: str, property_type: str, properties: list[dict]) -> pd.Series:
+    """relation: list of related page ids per row, None where empty."""
+    values = [
+        [relation["id"] for relation in value] if value else None
+        for value in _raw_values(name, property_type, properties)
+    ]
+    return pd.Series(values, dtype=object)
+
+
+def _extract_date(name: str, property_type: str, properties: list[dict]) -> pd.Series:
+    """date: datetime64 (UTC) column of the start date, NaT where empty."""
+    values = [value["start"] if value else None for value in _raw_values(name, property_type, properties)]
+    return pd.Series(pd.to_datetime(values, utc=True, format="ISO8601", errors="coerce"))
+
+
+def _extract_files(name: str, property_type: str, properties: list[dict]) -> pd.Series:
+    """files: name of the first file."""
+    values = [value[0]["name"] if value else None for value in _raw_values(name, property_type, properties)]
+    return pd.Series(values, dtype=object)
+
+
+def _extract_rollup(name: str, property_type: str, properties: list[dict]) -> pd.Series:
+    """rollup: value of the rollup's own type (number, date, array...)."""
+    values = [value[value["type"]] if value else None for value in _raw_values(name, property_type, properties)]
+    return pd.Series(values, dtype=object)
+
+
+def _extract_unsupported(name: str, property_type: str, properties: list[dict]) -> pd.Series:
+    """Unsupported property types are returned as empty columns."""
+    return pd.Series([None] * len(properties), dtype=object)
+
+
+TYPE_TO_EXTRACTOR: dict[str, Callable[[str, str, list[dict]], pd.Series]] = {
+    "title": _extract_plain_text,
+    "rich_text": _extract_plain_text,
+    "relation": _extract_relation,
+    "multi_select": _extract_multi_select,
+    "phone_number": _extract_string,
+    "rollup": _extract_rollup,
+    "url": _extract_string,
+    "date": _extract_date,
+    "select": _extract_select,
+    "email": _extract_string,
+    "files": _extract_files,
+    "number": _extract_number,
+    "checkbox": _extract_checkbox,
+}
+
+
+class ColumnarConverter:
+    """
+    Converts raw database query results into a DataFrame column by column.
+
+    The schema (property name to property type) is inspected once and one
+    extractor is picked per column, so converting a page does not go through
+    NotionPage/NotionPageProperty objects. Columns are typed: float64 for
+    number, bool for checkbox, categorical for select and datetime64 for date.
+    """
+
+    def __init__(self, schema: dict[str, str]):
+        """
+        Initializes the converter.
+
+        Args:
+            schema (dict[str, str]): Property name to Notion property type, in column order.
+        """
+        self.schema = dict(schema)
+        self._extractors = {
+            name: TYPE_TO_EXTRACTOR.get(property_type, _extract_unsupported)
+            for name, property_type in self.schema.items()
+        }
+
+    @classmethod
+    def from_db(cls, db: dict) -> "ColumnarConverter":
+        """
+        Builds a converter from a database object, as returned by NotionAPI.get_db.
+
+        Args:
+            db (dict): Database object returned by Notion's API.
+
+        Returns:
+            ColumnarConverter: Converter for the database's properties.
+        """
+        return cls({name: db_property["type"] for name, db_property in db["properties"].items()})
+
+    @classmethod
+    def from_pages(cls, json_results: Iterable[dict]) -> Optional["ColumnarConverter"]:
+        """
+        Builds a converter from query results. Every page object carries the
+        type of each of its properties, so the first page gives the schema.
+
+        Args:
+            json_results (Iterable[dict]): JSON query results.
+
+        Returns:
+            Optional[ColumnarConverter]: Converter, None if there are no results.
+        """
+        for page in json_results:
+            return cls({name: page_property["type"] for name, page_property in page["properties"].items()})
+        return None
+
+    def select(self, columns: Iterable[str]) -> "ColumnarConverter":
+        """
+        Returns a converter for some of the columns only; the other properties
+        of the pages are not decoded at all. Unknown columns are skipped.
+
+        Args:
+            columns (Iterable[str]): Columns to keep, in output order.
+
+        Returns:
+            ColumnarConverter: Converter restricted to the columns.
+        """
+        return ColumnarConverter({name: self.schema[name] for name in columns if name in self.schema})
+
+    def convert(self, json_results: list[dict]) -> pd.DataFrame:
+        """
+        Converts JSON query results to a DataFrame. Each page is a row and
+        each property of the schema is a column.
+
+        Args:
+            json_results (list[dict]): JSON query results.
+
+        Returns:
+            pd.DataFrame: Query results as a DataFrame.
+        """
+        properties = [page["properties"] for page in json_results]
+
+        columns = {
+            name: extractor(name, self.schema[name], properties) for name, extractor in self._extractors.items()
+        }
+
+        return pd.DataFrame(columns, index=pd.RangeIndex(len(properties)))
+
+
+def decode_and_convert(
+    content: bytes, schema: Optional[dict[str, str]] = None, json_backend: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Decodes the body of a database query response and converts its results to a DataFrame.
+
+    Module-level so it can run in a worker process: only the raw body is sent
+    to the worker and only the typed DataFrame comes back.
+
+    Args:
+        content (bytes): Body of a databases/{id}/query response.
+        schema (Optional[dict[str, str]]): Property name to Notion property type. By default
+                                           it is inferred from the first result.
+        json_backend (Optional[str]): JSON backend name, see Notion.Notion_JSON.get_json_backend.
+
+    Returns:
+        pd.DataFrame: The response's results, one row per page.
+    """
+    json_results = get_json_backend(json_backend).loads(content)["results"]
+    converter = ColumnarConverter(schema) if schema is not None else ColumnarConverter.from_pages(json_results)
+    if converter is None:
+        return pd.DataFrame()
+    return converter.convert(json_results)
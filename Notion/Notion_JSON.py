@@ -0,0 +1,102 @@
+import json
+from typing import Any, Callable, Optional
+
+# Backends in order of preference, when none is requested.
+JSON_BACKENDS = ("orjson", "simdjson", "json")
+
+
+def _load_orjson() -> Callable[[bytes], Any]:
+    import orjson
+
+    return orjson.loads
+
+
+def _load_simdjson() -> Callable[[bytes], Any]:
+    import simdjson
+
+    # simdjson.loads builds plain Python objects with a parser of its own, so it
+    # is thread-safe, unlike the lazy proxies returned by a shared Parser.
+    return simdjson.loads
+
+
+def _load_json() -> Callable[[bytes], Any]:
+    return json.loads
+
+
+_BACKEND_LOADERS = {
+    "orjson": _load_orjson,
+    "simdjson": _load_simdjson,
+    "json": _load_json,
+}
+
+
+class JSONBackend:
+    """
+    JSON decoder used on Notion's responses.
+
+    Usage:
+        backend = get_json_backend()
+        json_content = backend.loads(response.content)
+    """
+
+    def __init__(self, name: str, loads: Callable[[bytes], Any]):
+        """
+        Initializes the backend.
+
+        Args:
+            name (str): Backend name, one of JSON_BACKENDS.
+            loads (Callable[[bytes], Any]): Function decoding a JSON document (bytes or str).
+        """
+        self.name = name
+        self.loads = loads
+
+    def __repr__(self) -> str:
+        return f"JSONBackend({self.name!r})"
+
+
+# Package to install for each optional backend.
+_BACKEND_PACKAGES = {"orjson": "orjson", "simdjson": "pysimdjson"}
+
+_backends: dict[str, JSONBackend] = {}
+
+
+def get_json_backend(name: Optional[str] = None) -> JSONBackend:
+    """
+    Returns a JSON backend.
+
+    Args:
+        name (Optional[str]): "orjson", "simdjson" (pysimdjson) or "json" (the standard
+                              library). None picks the first one installed, in that order.
+
+    Returns:
+        JSONBackend: The backend.
+    """
+    if name is None:
+        for candidate in JSON_BACKENDS:
+            try:
+                return get_json_backend(candidate)
+            except ImportError:
+                continue
+
+    if name not in _BACKEND_LOADERS:
+        raise ValueError(f"Unknown JSON backend {name!r}, expected one of {JSON_BACKENDS}")
+    if name not in _backends:
+        try:
+            _backends[name] = JSONBackend(name, _BACKEND_LOADERS[name]())
+        except ImportError as e:
+            raise ImportError(
+                f"The {name!r} JSON backend requires the '{_BACKEND_PACKAGES[name]}' package to be installed."
+            ) from e
+    return _backends[name]
+
+
+def get_available_backends() -> list[str]:
+    """Returns the names of the JSON backends that are installed, in order of preference."""
+    available = []
+    for name in JSON_BACKENDS:
+        try:
+            get_json_backend(name)
+        except ImportError:
+            continue
+        available.append(name)
+    return available
@@ -0,0 +1,249 @@
+import cProfile
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+# Counter name to Prometheus help text. Counters not listed here can still be
+# incremented, they are exported without help text.
+COUNTERS = {
+    "requests": "HTTP requests sent to Notion's API, retries included.",
+    "response_bytes": "Bytes of the successful responses' bodies.",
+    "retries": "Requests retried after a 429, a 5xx or a connection error.",
+    "rate_limited": "Responses with status 429.",
+    "errors": "Requests that failed for good.",
+    "pages": "Cursor pages of database query results.",
+    "rows": "Rows (Notion pages) fetched by database queries.",
+    "cache_hits": "get_db and get_page responses served by the response cache.",
+    "cache_misses": "get_db and get_page responses not found in the response cache.",
+    "request_seconds": "Seconds spent waiting for Notion's responses.",
+    "decode_seconds": "Seconds spent decoding the JSON of query responses.",
+    "convert_seconds": "Seconds spent converting query results to DataFrames.",
+    "polls": "Change polls of the validation daemon.",
+    "validations": "Databases fetched and validated by the validation daemon.",
+    "failed_validations": "Daemon validations that failed or raised an error.",
+}
+
+
+def _escape_label(value) -> str:
+    """Escapes a label value for Prometheus' text format."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Metrics:
+    """
+    Per-stage timers and counters of a validation run.
+
+    Stages (fetch, validation...) are timed by the runner; the counters are
+    filled by NotionAPI's request lifecycle hooks once the metrics are
+    attached to a client. With a profile directory, each outermost stage is
+    also run under cProfile and its stats are written to <stage>.prof
+    (inspect them with python -m pstats or snakeviz). Only one stage is
+    profiled at a time, in the thread that started it.
+
+    Usage:
+        metrics = Metrics()
+        with NotionAPI(key) as notion:
+            metrics.attach(notion)
+            with metrics.stage("fetch"):
+                df = notion.query_db(db)
+        metrics.write_prometheus("metrics.prom")
+    """
+
+    def __init__(self, profile_dir: Optional[str] = None):
+        """
+        Initializes empty metrics.
+
+        Args:
+            profile_dir (Optional[str]): Directory the cProfile stats of each stage are written to.
+                                         None does not profile.
+        """
+        self.logger = logging.getLogger("notion")
+        self.profile_dir = profile_dir
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.stages = {}
+        self._started = {}
+        self._profiler = None
+        self._lock = threading.Lock()
+        if profile_dir is not None:
+            os.makedirs(profile_dir, exist_ok=True)
+
+    def increment(self, name: str, value: float = 1):
+        """
+        Adds to a counter.
+
+        Args:
+            name (str): Counter name, see COUNTERS.
+            value (float): Amount to add.
+        """
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def start(self, stage: str):
+        """
+        Starts timing a stage. A stage can be started and stopped several times,
+        also from several threads at once; its seconds and calls add up.
+
+        Args:
+            stage (str): Stage name, e.g. "fetch".
+        """
+        thread_id = threading.get_ident()
+        if self.profile_dir is not None:
+            with self._lock:
+                # Only one profiler can be active at a time: nested stages are part of the outer
+                # one's profile, and stages started meanwhile by other threads are not profiled.
+                if self._profiler is None:
+                    self._profiler = (stage, thread_id, cProfile.Profile())
+                    self._profiler[2].enable()
+        self._started[(stage, thread_id)] = time.perf_counter()
+
+    def stop(self, stage: str):
+        """
+        Stops timing a stage.
+
+        Args:
+            stage (str): Stage name, as given to start() in this thread.
+        """
+        thread_id = threading.get_ident()
+        seconds = time.perf_counter() - self._started.pop((stage, thread_id))
+        profiler = None
+        with self._lock:
+            timing = self.stages.setdefault(stage, {"seconds": 0.0, "calls": 0})
+            timing["seconds"] += seconds
+            timing["calls"] += 1
+            if self._profiler is not None and self._profiler[:2] == (stage, thread_id):
+                profiler = self._profiler[2]
+                profiler.disable()
+                self._profiler = None
+
+        if profiler is not None:
+            profile_path = os.path.join(self.profile_dir, f"{stage}.prof")
+            profiler.dump_stats(profile_path)
+            self.logger.info(f"Wrote the profile of stage {stage} to {profile_path}")
+
+    @contextmanager
+    def stage(self, stage: str) -> Iterator[None]:
+        """
+        Times (and profiles) the block it wraps as a stage.
+
+        Args:
+            stage (str): Stage name, e.g. "fetch".
+        """
+        self.start(stage)
+        try:
+            yield
+        finally:
+            self.stop(stage)
+
+    def attach(self, notion) -> "Metrics":
+        """
+        Fills the counters from a client's request lifecycle hooks.
+
+        Args:
+            notion (NotionAPIBase): NotionAPI or AsyncNotionAPI instance.
+
+        Returns:
+            Metrics: The metrics themselves, to chain calls.
+        """
+        notion.add_hook("request", self._on_request)
+        notion.add_hook("response", self._on_response)
+        notion.add_hook("retry", self._on_retry)
+        notion.add_hook("error", self._on_error)
+        notion.add_hook("page", self._on_page)
+        notion.add_hook("convert", self._on_convert)
+        notion.add_hook("cache", self._on_cache)
+        return self
+
+    def _on_request(self, **details):
+        self.increment("requests")
+
+    def _on_response(self, response_bytes: int, seconds: float, **details):
+        self.increment("response_bytes", response_bytes)
+        self.increment("request_seconds", seconds)
+
+    def _on_retry(self, status_code: Optional[int], **details):
+        self.increment("retries")
+        if status_code == 429:
+            self.increment("rate_limited")
+
+    def _on_error(self, **details):
+        self.increment("errors")
+
+    def _on_page(self, rows: int, decode_seconds: float, **details):
+        self.increment("pages")
+        self.increment("rows", rows)
+        self.increment("decode_seconds", decode_seconds)
+
+    def _on_convert(self, seconds: float, **details):
+        self.increment("convert_seconds", seconds)
+
+    def _on_cache(self, hit: bool, **details):
+        self.increment("cache_hits" if hit else "cache_misses")
+
+    def to_dict(self) -> dict:
+        """
+        Returns the metrics as plain data.
+
+        Returns:
+            dict: {"stages": {stage: {"seconds", "calls"}}, "counters": {name: value}}
+        """
+        with self._lock:
+            return {
+                "stages": {stage: dict(timing) for stage, timing in self.stages.items()},
+                "counters": dict(self.counters),
+            }
+
+    def to_json(self) -> str:
+        """Returns the metrics as a JSON document, see to_dict."""
+        return json.dumps(self.to_dict(), sort_keys=True)
+
+    def to_prometheus(self, prefix: str = "notion_validation", labels: Optional[dict[str, str]] = None) -> str:
+        """
+        Returns the metrics in Prometheus' text exposition format.
+
+        Args:
+            prefix (str): Prefix of every metric name.
+            labels (Optional[dict[str, str]]): Labels added to every sample, e.g. {"db": db_id}.
+
+        Returns:
+            str: Metrics, one sample per line.
+        """
+        metrics = self.to_dict()
+        labels = labels or {}
+
+        def format_labels(extra: Optional[dict] = None) -> str:
+            merged = {**labels, **(extra or {})}
+            if not merged:
+                return ""
+            return "{" + ",".join(f'{name}="{_escape_label(value)}"' for name, value in merged.items()) + "}"
+
+        lines = []
+        for name, value in sorted(metrics["counters"].items()):
+            metric = f"{prefix}_{name}_total"
+            if name in COUNTERS:
+                lines.append(f"# HELP {metric} {COUNTERS[name]}")
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric}{format_labels()} {value}")
+
+        lines.append(f"# HELP {prefix}_stage_seconds Wall-clock seconds spent in each stage of the run.")
+        lines.append(f"# TYPE {prefix}_stage_seconds gauge")
+        for stage, timing in sorted(metrics["stages"].items()):
+            lines.append(f"{prefix}_stage_seconds{format_labels({'stage': stage})} {timing['seconds']:.6f}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str, prefix: str = "notion_validation", labels: Optional[dict[str, str]] = None):
+        """
+        Writes the metrics in Prometheus' text format, atomically, e.g. for node_exporter's textfile collector.
+
+        Args:
+            path (str): Path of the .prom file.
+            prefix (str): Prefix of every metric name.
+            labels (Optional[dict[str, str]]): Labels added to every sample.
+        """
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        with open(temporary_path, "w") as prometheus_file:
+            prometheus_file.write(self.to_prometheus(prefix, labels))
+        os.replace(temporary_path, path)
@@ -1,14 +1,22 @@
 from typing import Union
 from typing import List
 
+_NOT_DECODED = object()
+
+
 class NotionRichTextObject:
     """
     Simple wrapper class for Notion's rich text object.
 
     Official documentation:
         https://developers.notion.com/reference/rich-text
+
+    Attributes are read from the wrapped dictionary on access instead of
+    being copied, and __slots__ avoids a per-instance __dict__.
     """
 
+    __slots__ = ("_rich_text_object",)
+
     def __init__(self, rich_text_object: dict):
         """
         Initializes Notion's rich text object attributes.
@@ -17,10 +25,23 @@ class NotionRichTextObject:
             rich_text_object (dict): Dictionary with attributes.
                                     Comes from a NotionPageProperty's value attribute.
         """
-        self.plain_text = rich_text_object["plain_text"]
-        self.href = rich_text_object["href"]
-        self.annotations = rich_text_object["annotations"]
-        self.type = rich_text_object["type"]
+        self._rich_text_object = rich_text_object
+
+    @property
+    def plain_text(self) -> str:
+        return self._rich_text_object["plain_text"]
+
+    @property
+    def href(self) -> Union[str, None]:
+        return self._rich_text_object["href"]
+
+    @property
+    def annotations(self) -> dict:
+        return self._rich_text_object["annotations"]
+
+    @property
+    def type(self) -> str:
+        return self._rich_text_object["type"]
 
     def get_plain_text(self) -> str:
         """
@@ -41,8 +62,28 @@ class NotionPageProperty:
 
     The property attribute in a Notion Page is the one that has all the
     custom information in the page.
+
+    The property is decoded lazily: get_value() decodes the wrapped
+    dictionary the first time it is called and caches the result.
     """
 
+    __slots__ = ("_page_property", "_decoded_value")
+
+    _TYPE_TO_FUNCTION = {
+        "title": "_get_title_value",
+        "rich_text": "_get_rich_text_value",
+        "relation": "_get_relation_value",
+        "multi_select": "_get_multi_select_value",
+        "phone_number": "_get_string_value",
+        "rollup": "_get_rollup_value",
+        "url": "_get_string_value",
+        "date": "_get_string_value",
+        "select": "_get_select_value",
+        "email": "_get_string_value",
+        "files": "_get_files_value",
+        "number": "_get_number_value",
+    }
+
     def __init__(self, page_property: dict):
         """
         Initializes a Notion page property class given its dictionary.
@@ -51,69 +92,48 @@ class NotionPageProperty:
             page_property (dict): Dictionary with attributes.
                                   Comes from a Notion Page's property attribute.
         """
-        self.value = page_property["value"]
-        self.type = page_property["type"]
-        self.id = page_property["id"]
-
-    def get_value(self):
-        """
-        Getter for the value attribute.
-
-        Returns:
-            Union[str, NotionRichTextObject]: Value attribute.
-        """
-        if self.type == "rich_text":
-            return NotionRichTextObject(self.value)
-        else:
-            return self.value
+        self._page_property = page_property
+        self._decoded_value = _NOT_DECODED
 
+    @property
+    def id(self) -> str:
+        return self._page_property["id"]
 
-    def __init__(self, page_property: dict):
-        """
-        Initializes a Notion page property class given its dictionary.
+    @property
+    def type(self) -> str:
+        return self._page_property["type"]
 
-        Args:
-            page_property (dict): Dictionary with attributes.
-                                  Comes from a Notion Page's property attribute.
-        """
-        self.id = page_property["id"]
-        self.type = page_property["type"]
-        self.value = page_property.get(self.type)
+    @property
+    def value(self):
+        """Raw value of the property, as returned by Notion's API."""
+        return self._page_property.get(self._page_property["type"])
 
-    def get_value(self) -> Union[str, list[str], None]:
+    def get_value(self) -> Union[str, List[str], int, bool, None]:
         """
         Returns the page property's value either as a
-        string or a list of strings.
+        string, a list of strings, a number or a boolean.
 
         Returns:
-            Union[str, list[str], None]: Page's property value.
+            Union[str, List[str], int, bool, None]: Page's property value.
         """
+        if self._decoded_value is _NOT_DECODED:
+            self._decoded_value = self._decode_value()
+        return self._decoded_value
 
+    def _decode_value(self) -> Union[str, List[str], int, bool, None]:
+        """Decodes the raw value according to the property type."""
         if self.type == "checkbox":
             return self._get_checkbox_value()
 
-        if not self.value:
+        value = self.value
+        if value is None:
             return None
         if self.type not in ["number"]:
-            if len(self.value) == 0:
+            if len(value) == 0:
                 return None
 
-        type_to_function = {
-            "title": self._get_title_value,
-            "rich_text": self._get_rich_text_value,
-            "relation": self._get_relation_value,
-            "multi_select": self._get_multi_select_value,
-            "phone_number": self._get_string_value,
-            "rollup": self._get_rollup_value,
-            "url": self._get_string_value,
-            "date": self._get_string_value,
-            "select": self._get_select_value,
-            "email": self._get_string_value,
-            "files": self._get_files_value,
-            "number": self._get_number_value,
-        }
-
-        return type_to_function.get(self.type, self._default_value)()
+        function_name = self._TYPE_TO_FUNCTION.get(self.type, "_default_value")
+        return getattr(self, function_name)()
 
     def _default_value(self) -> None:
         """Returns None for unsupported property types."""
@@ -127,69 +147,101 @@ class NotionPageProperty:
         """Returns the value of a property of type select as a string."""
         return self.value["name"]
 
-    # Add other helper methods for different property types here
-
-    def _get_checkbox_value(self) -> bool:
-        """Returns the value of a property of type checkbox as a boolean."""
-        return self.value
-    
-    
-    def get_value(self) -> Union[str, List[str], int, bool, None]:
-        type_to_function = {
-            "title": self._get_title_value,
-            "rich_text": self._get_rich_text_value,
-            "relation": self._get_relation_value,
-            "multi_select": self._get_multi_select_value,
-            "phone_number": self._get_string_value,
-            "rollup": self._get_rollup_value,
-            "url": self._get_string_value,
-            "date": self._get_string_value,
-            "select": self._get_select_value,
-            "email": self._get_string_value,
-            "files": self._get_files_value,
-            "number": self._get_number_value,
-            "checkbox": self._get_checkbox_value,
-        }
-        
-        return type_to_function.get(self.type, self._default_value)()
-
-    def _default_value(self) -> None:
-        return None
-
-    def _get_files_value(self) -> str:
-        return self.value[0]["name"]
-
-    def _get_select_value(self) -> str:
-        return self.value["name"]
-
     def _get_rollup_value(self) -> str:
-        property_type = self.value["type"]
-        return self.value[property_type]
+        """Returns the value of a property of type rollup."""
+        value = self.value
+        return value[value["type"]]
 
     def _get_number_value(self) -> int:
+        """Returns the value of a property of type number."""
         return self.value
 
     def _get_checkbox_value(self) -> bool:
+        """Returns the value of a property of type checkbox as a boolean."""
         return self.value
 
     def _get_string_value(self) -> str:
+        """Returns the value of a string-like property (url, email, phone_number, date)."""
         return self.value
 
     def _get_multi_select_value(self) -> List[str]:
+        """Returns the value of a property of type multi_select as a list of strings."""
         return [selection["name"] for selection in self.value]
 
     def _get_relation_value(self) -> List[str]:
+        """Returns the value of a property of type relation as a list of page ids."""
         return [relation["id"] for relation in self.value]
 
     def _get_rich_text_value(self) -> str:
-        rich_text_object = NotionRichTextObject(self.value[0])
-        return rich_text_object.get_plain_text()
+        """Returns the plain text of a property of type rich_text."""
+        return self.value[0]["plain_text"]
 
     def _get_title_value(self) -> str:
-        rich_text_object = NotionRichTextObject(self.value[0])
-        return rich_text_object.get_plain_text()
-    
-    
-    
-    
-    
\ No newline at end of file
+        """Returns the plain text of a property of type title."""
+        return self.value[0]["plain_text"]
+
+
+class NotionPage:
+    """
+    Wrapper for a Notion Page object as returned by a database query.
+
+    Official documentation:
+        https://developers.notion.com/reference/page
+
+    Attributes are read from the wrapped dictionary on access and the
+    NotionPageProperty objects are only built when properties is first used.
+    """
+
+    __slots__ = ("_page", "_properties")
+
+    def __init__(self, page: dict):
+        """
+        Initializes a Notion page given its dictionary.
+
+        Args:
+            page (dict): Page object returned by Notion's API.
+        """
+        self._page = page
+        self._properties = None
+
+    @property
+    def id(self) -> str:
+        return self._page["id"]
+
+    @property
+    def created_time(self) -> Union[str, None]:
+        return self._page.get("created_time")
+
+    @property
+    def last_edited_time(self) -> Union[str, None]:
+        return self._page.get("last_edited_time")
+
+    @property
+    def archived(self) -> bool:
+        return self._page.get("archived", False)
+
+    @property
+    def url(self) -> Union[str, None]:
+        return self._page.get("url")
+
+    @property
+    def properties(self) -> dict:
+        """Property name to NotionPageProperty, built on first access."""
+        if self._properties is None:
+            self._properties = {
+                name: NotionPageProperty(page_property)
+                for name, page_property in self._page["properties"].items()
+            }
+        return self._properties
+
+    def get_property_values(self) -> dict:
+        """
+        Returns the values of all the page's properties.
+
+        Returns:
+            dict: Property name to property value.
+        """
+        return {
+            name: page_property.get_value()
+            for name, page_property in self.properties.items()
+        }
@@ -0,0 +1,277 @@
+import json
+import sqlite3
+import threading
+from typing import Iterable, Optional
+
+
+class NotionPageCache:
+    """
+    Local SQLite store of database pages, keyed by page id.
+
+    Used by NotionAPI.sync_db to only download the pages edited since the
+    previous sync. Each synced database (and query) is stored under its own
+    scope so differently filtered syncs of the same database do not mix.
+    """
+
+    def __init__(self, path: str):
+        """
+        Opens (or creates) the cache.
+
+        Args:
+            path (str): Path of the SQLite file. ":memory:" keeps the cache in memory.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._create_tables()
+
+    def __enter__(self) -> "NotionPageCache":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Closes the underlying SQLite connection."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _create_tables(self):
+        """Creates the cache tables if they do not exist yet."""
+        with self._lock, self._connection:
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS pages (
+                    scope TEXT NOT NULL,
+                    page_id TEXT NOT NULL,
+                    created_time TEXT,
+                    last_edited_time TEXT,
+                    page_json TEXT NOT NULL,
+                    PRIMARY KEY (scope, page_id)
+                )
+                """
+            )
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS sync_state (
+                    scope TEXT PRIMARY KEY,
+                    last_edited_time TEXT
+                )
+                """
+            )
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS reconcile_state (
+                    scope TEXT PRIMARY KEY,
+                    reconciled_at REAL
+                )
+                """
+            )
+
+    def get_last_edited_time(self, scope: str) -> Optional[str]:
+        """
+        Returns the high-water mark of the last sync of a scope.
+
+        Args:
+            scope (str): Cache scope, usually the database id.
+
+        Returns:
+            Optional[str]: Latest last_edited_time seen, None if the scope was never synced.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT last_edited_time FROM sync_state WHERE scope = ?", (scope,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def set_last_edited_time(self, scope: str, last_edited_time: str):
+        """
+        Stores the high-water mark of a scope.
+
+        Args:
+            scope (str): Cache scope, usually the database id.
+            last_edited_time (str): Latest last_edited_time seen.
+        """
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO sync_state (scope, last_edited_time) VALUES (?, ?)",
+                (scope, last_edited_time),
+            )
+
+    def get_reconciled_at(self, scope: str) -> Optional[float]:
+        """
+        Returns when the cached page ids of a scope were last checked against the database.
+
+        Args:
+            scope (str): Cache scope, usually the database id.
+
+        Returns:
+            Optional[float]: Unix time of the last reconciliation, None if there was none.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT reconciled_at FROM reconcile_state WHERE scope = ?", (scope,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def set_reconciled_at(self, scope: str, reconciled_at: float):
+        """
+        Stores when the cached page ids of a scope were checked against the database.
+
+        Args:
+            scope (str): Cache scope, usually the database id.
+            reconciled_at (float): Unix time of the reconciliation.
+        """
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO reconcile_state (scope, reconciled_at) VALUES (?, ?)",
+                (scope, reconciled_at),
+            )
+
+    def merge_pages(self, scope: str, pages: Iterable[dict]) -> tuple[int, int]:
+        """
+        Upserts fetched pages. Archived (or trashed) pages are removed instead.
+
+        Database queries never return archived pages, so removals of pages that
+        were queried before are only found by remove_missing_pages.
+
+        Args:
+            scope (str): Cache scope, usually the database id.
+            pages (Iterable[dict]): Page objects returned by Notion's API.
+
+        Returns:
+            tuple[int, int]: Number of pages upserted and number of pages removed.
+        """
+        upserts = []
+        removals = []
+        for page in pages:
+            if page.get("archived") or page.get("in_trash"):
+                removals.append((scope, page["id"]))
+            else:
+                upserts.append(
+                    (
+                        scope,
+                        page["id"],
+                        page.get("created_time"),
+                        page.get("last_edited_time"),
+                        json.dumps(page),
+                    )
+                )
+
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO pages "
+                "(scope, page_id, created_time, last_edited_time, page_json) VALUES (?, ?, ?, ?, ?)",
+                upserts,
+            )
+            self._connection.executemany(
+                "DELETE FROM pages WHERE scope = ? AND page_id = ?", removals
+            )
+
+        return len(upserts), len(removals)
+
+    def remove_missing_pages(self, scope: str, page_ids: set[str]) -> int:
+        """
+        Removes the cached pages that are not in page_ids, e.g. pages deleted
+        from the database since they were cached.
+
+        Args:
+            scope (str): Cache scope, usually the database id.
+            page_ids (set[str]): Ids of the pages currently in the database.
+
+        Returns:
+            int: Number of pages removed.
+        """
+        stale = [(scope, page_id) for page_id in self.get_page_ids(scope) if page_id not in page_ids]
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "DELETE FROM pages WHERE scope = ? AND page_id = ?", stale
+            )
+        return len(stale)
+
+    def get_page_ids(self, scope: str) -> set[str]:
+        """
+        Returns the ids of the cached pages of a scope.
+
+        Args:
+            scope (str): Cache scope, usually the database id.
+
+        Returns:
+            set[str]: Cached page ids.
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT page_id FROM pages WHERE scope = ?", (scope,)
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def get_page_versions(self, scope: str) -> dict[str, Optional[str]]:
+        """
+        Returns the last_edited_time of every cached page of a scope, without decoding the pages.
+
+        Args:
+            scope (str): Cache scope, usually the database id.
+
+        Returns:
+            dict[str, Optional[str]]: Page id to last_edited_time.
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT page_id, last_edited_time FROM pages WHERE scope = ?", (scope,)
+            ).fetchall()
+        return dict(rows)
+
+    def get_pages_by_id(self, scope: str, page_ids: Iterable[str]) -> list[dict]:
+        """
+        Returns some cached pages of a scope, oldest first. Unknown ids are skipped.
+
+        Args:
+            scope (str): Cache scope, usually the database id.
+            page_ids (Iterable[str]): Ids of the pages to return.
+
+        Returns:
+            list[dict]: Page objects as returned by Notion's API.
+        """
+        page_ids = list(page_ids)
+        rows = []
+        with self._lock:
+            # Stay under SQLite's limit on the number of bound parameters.
+            for start in range(0, len(page_ids), 500):
+                batch = page_ids[start:start + 500]
+                rows += self._connection.execute(
+                    "SELECT created_time, page_id, page_json FROM pages "
+                    f"WHERE scope = ? AND page_id IN ({', '.join('?' * len(batch))})",
+                    (scope, *batch),
+                ).fetchall()
+        rows.sort(key=lambda row: (row[0] or "", row[1]))
+        return [json.loads(row[2]) for row in rows]
+
+    def get_pages(self, scope: str) -> list[dict]:
+        """
+        Returns the cached pages of a scope, oldest first.
+
+        Args:
+            scope (str): Cache scope, usually the database id.
+
+        Returns:
+            list[dict]: Page objects as returned by Notion's API.
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT page_json FROM pages WHERE scope = ? ORDER BY created_time, page_id",
+                (scope,),
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def clear(self, scope: str):
+        """
+        Removes every cached page and the sync state of a scope.
+
+        Args:
+            scope (str): Cache scope, usually the database id.
+        """
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM pages WHERE scope = ?", (scope,))
+            self._connection.execute("DELETE FROM sync_state WHERE scope = ?", (scope,))
+            self._connection.execute("DELETE FROM reconcile_state WHERE scope = ?", (scope,))
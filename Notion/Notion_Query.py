@@ -0,0 +1,205 @@
+import copy
+import json
+from typing import Optional, Union
+
+
+class NotionQuery:
+    """
+    Builder for the body and parameters of a database query.
+
+    Official documentation:
+        https://developers.notion.com/reference/post-database-query
+
+    The same filter, sorts and filter_properties are sent on every paginated
+    request, so the API only returns (and transfers) the rows and properties
+    that are needed.
+
+    Usage:
+        query = (
+            NotionQuery()
+            .where("Name", "title", "is_not_empty", True)
+            .where("Calories", "number", "greater_than", 100)
+            .sort_by("Name")
+            .select("Name", "Calories")
+        )
+        df = notion.query_db(db, query)
+    """
+
+    def __init__(
+        self,
+        filter: Optional[dict] = None,
+        sorts: Optional[list[dict]] = None,
+        filter_properties: Optional[list[str]] = None,
+        page_size: int = 100,
+    ):
+        """
+        Initializes the query.
+
+        Args:
+            filter (Optional[dict]): Filter object, as documented by Notion.
+            sorts (Optional[list[dict]]): Sort objects, as documented by Notion.
+            filter_properties (Optional[list[str]]): Property ids (or names) to return. All by default.
+            page_size (int): Number of results per request, at most 100.
+        """
+        if not 1 <= page_size <= 100:
+            raise ValueError("page_size must be between 1 and 100")
+
+        self.filter = copy.deepcopy(filter)
+        self.sorts = copy.deepcopy(sorts) or []
+        self.filter_properties = list(filter_properties or [])
+        self.page_size = page_size
+
+    @classmethod
+    def parse(cls, query: Union[str, dict, "NotionQuery", None]) -> "NotionQuery":
+        """
+        Builds a query from any of the accepted forms.
+
+        Args:
+            query (Union[str, dict, NotionQuery, None]): A NotionQuery, a request body
+                as a dict or as a JSON string, or an empty string / None for no query.
+
+        Returns:
+            NotionQuery: Equivalent query.
+        """
+        if isinstance(query, NotionQuery):
+            return query
+        if not query:
+            return cls()
+        if isinstance(query, str):
+            query = json.loads(query)
+        if not isinstance(query, dict):
+            raise ValueError(f"Unsupported query: {query!r}")
+
+        unsupported = set(query) - {"filter", "sorts", "filter_properties", "page_size"}
+        if unsupported:
+            raise ValueError(f"Unsupported query fields: {sorted(unsupported)}")
+
+        return cls(
+            filter=query.get("filter"),
+            sorts=query.get("sorts"),
+            filter_properties=query.get("filter_properties"),
+            page_size=query.get("page_size", 100),
+        )
+
+    def copy(self) -> "NotionQuery":
+        """Returns an independent copy of the query."""
+        return NotionQuery(self.filter, self.sorts, self.filter_properties, self.page_size)
+
+    def add_filter(self, condition: dict) -> "NotionQuery":
+        """
+        Adds a filter condition, combined with the existing ones with "and".
+
+        Args:
+            condition (dict): Filter object, as documented by Notion.
+
+        Returns:
+            NotionQuery: The query itself, to chain calls.
+        """
+        if self.filter is None:
+            self.filter = condition
+        elif list(self.filter) == ["and"]:
+            self.filter["and"].append(condition)
+        else:
+            self.filter = {"and": [self.filter, condition]}
+        return self
+
+    def where(self, property_name: str, property_type: str, operator: str, value=True) -> "NotionQuery":
+        """
+        Adds a property filter condition.
+
+        Args:
+            property_name (str): Property name or id.
+            property_type (str): Property type, e.g. "rich_text", "number", "select".
+            operator (str): Filter operator, e.g. "equals", "contains", "is_not_empty".
+            value: Operand of the operator (True for is_empty / is_not_empty).
+
+        Returns:
+            NotionQuery: The query itself, to chain calls.
+        """
+        return self.add_filter({"property": property_name, property_type: {operator: value}})
+
+    def where_timestamp(self, timestamp: str, operator: str, value: str) -> "NotionQuery":
+        """
+        Adds a created_time / last_edited_time filter condition.
+
+        Args:
+            timestamp (str): "created_time" or "last_edited_time".
+            operator (str): Date operator, e.g. "on_or_after".
+            value (str): ISO 8601 date or datetime.
+
+        Returns:
+            NotionQuery: The query itself, to chain calls.
+        """
+        return self.add_filter({"timestamp": timestamp, timestamp: {operator: value}})
+
+    def sort_by(
+        self, property_name: Optional[str] = None, direction: str = "ascending", timestamp: Optional[str] = None
+    ) -> "NotionQuery":
+        """
+        Adds a sort, applied after the existing ones.
+
+        Args:
+            property_name (Optional[str]): Property to sort by.
+            direction (str): "ascending" or "descending".
+            timestamp (Optional[str]): "created_time" or "last_edited_time", instead of a property.
+
+        Returns:
+            NotionQuery: The query itself, to chain calls.
+        """
+        if (property_name is None) == (timestamp is None):
+            raise ValueError("Give exactly one of property_name and timestamp")
+
+        if property_name is not None:
+            self.sorts.append({"property": property_name, "direction": direction})
+        else:
+            self.sorts.append({"timestamp": timestamp, "direction": direction})
+        return self
+
+    def select(self, *properties: str) -> "NotionQuery":
+        """
+        Restricts the properties returned for each page (filter_properties).
+
+        Args:
+            *properties (str): Property ids (or names).
+
+        Returns:
+            NotionQuery: The query itself, to chain calls.
+        """
+        for page_property in properties:
+            if page_property not in self.filter_properties:
+                self.filter_properties.append(page_property)
+        return self
+
+    def to_body(self, start_cursor: Optional[str] = None) -> dict:
+        """
+        Returns the JSON body of a query request.
+
+        Args:
+            start_cursor (Optional[str]): Cursor of the page of results to request.
+
+        Returns:
+            dict: Request body.
+        """
+        body = {"page_size": self.page_size}
+        if self.filter is not None:
+            body["filter"] = self.filter
+        if self.sorts:
+            body["sorts"] = self.sorts
+        if start_cursor is not None:
+            body["start_cursor"] = start_cursor
+        return body
+
+    def to_params(self) -> list[tuple[str, str]]:
+        """
+        Returns the URL query parameters of a query request.
+
+        Returns:
+            list[tuple[str, str]]: One filter_properties parameter per selected property.
+        """
+        return [("filter_properties", page_property) for page_property in self.filter_properties]
+
+    def to_json(self) -> str:
+        """Returns a canonical JSON representation, e.g. to use as a cache key."""
+        return json.dumps(
+            {**self.to_body(), "filter_properties": self.filter_properties}, sort_keys=True
+        )
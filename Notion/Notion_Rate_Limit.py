@@ -0,0 +1,189 @@
+import asyncio
+import hashlib
+import random
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Tokens are refilled continuously at `rate` per second up to `capacity`.
+    Callers reserve a token and wait for the returned delay, so concurrent
+    callers are spaced out instead of all waking up at the same time.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Initializes a full token bucket.
+
+        Args:
+            rate (float): Tokens added per second.
+            capacity (float): Maximum number of tokens (allowed burst size).
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._last_refill = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Takes one token, possibly ahead of time.
+
+        Returns:
+            float: Seconds the caller must wait before sending its request.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate)
+            self._last_refill = now
+            self._tokens -= 1
+
+            wait = 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+            return max(wait, self._paused_until - now)
+
+    def get_delay(self) -> float:
+        """
+        Returns how long a token reserved now would have to wait, without taking it.
+
+        Returns:
+            float: Seconds, 0 if a token is available.
+        """
+        with self._lock:
+            now = time.monotonic()
+            tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate) - 1
+            wait = 0.0 if tokens >= 0 else -tokens / self.rate
+            return max(wait, self._paused_until - now)
+
+    def pause(self, seconds: float):
+        """
+        Blocks every caller of this bucket for the given number of seconds,
+        e.g. after the API answered 429 with a Retry-After header.
+
+        Args:
+            seconds (float): Seconds to pause for.
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def acquire(self):
+        """Waits until a token is available."""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """Waits until a token is available without blocking the event loop."""
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class RequestScheduler:
+    """
+    Schedules requests to Notion's API under its rate limit.
+
+    Every integration key gets its own token bucket, shared by all the clients
+    using the same scheduler, so several NotionAPI/AsyncNotionAPI instances with
+    the same key stay under the integration's budget together.
+
+    Official documentation:
+        https://developers.notion.com/reference/request-limits
+    """
+
+    def __init__(
+        self,
+        rate: float = 3.0,
+        burst: float = 3.0,
+        max_retries: int = 5,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+    ):
+        """
+        Initializes the scheduler.
+
+        Args:
+            rate (float): Requests per second allowed per integration key.
+            burst (float): Requests that can be sent at once after being idle.
+            max_retries (int): Retries for 429, 5xx and connection errors before giving up.
+            backoff_base (float): Base delay in seconds for exponential backoff.
+            backoff_max (float): Maximum delay in seconds for exponential backoff.
+        """
+        self.rate = rate
+        self.burst = burst
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def get_bucket(self, api_key: str) -> TokenBucket:
+        """
+        Returns the token bucket of an integration key, creating it if needed.
+
+        Args:
+            api_key (str): Notion API key.
+
+        Returns:
+            TokenBucket: Bucket shared by every request made with this key.
+        """
+        key_id = hashlib.sha256(api_key.encode()).hexdigest()
+        with self._lock:
+            if key_id not in self._buckets:
+                self._buckets[key_id] = TokenBucket(self.rate, self.burst)
+            return self._buckets[key_id]
+
+    def get_retry_delay(
+        self, attempt: int, status_code: Optional[int] = None, retry_after: Optional[str] = None
+    ) -> Optional[float]:
+        """
+        Decides whether a failed request should be retried and after how long.
+
+        429 responses honor the Retry-After header; 5xx responses and connection
+        errors (status_code None) use exponential backoff with full jitter.
+
+        Args:
+            attempt (int): Number of retries already made for this request.
+            status_code (Optional[int]): HTTP status code, None for connection errors.
+            retry_after (Optional[str]): Value of the Retry-After header, if any.
+
+        Returns:
+            Optional[float]: Seconds to wait before retrying, or None to give up.
+        """
+        if attempt >= self.max_retries:
+            return None
+
+        if status_code == 429:
+            delay = self._parse_retry_after(retry_after)
+            if delay is not None:
+                return delay
+        elif status_code is not None and status_code < 500:
+            return None
+
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def _parse_retry_after(self, retry_after: Optional[str]) -> Optional[float]:
+        """Parses a Retry-After header given in seconds."""
+        if not retry_after:
+            return None
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            return None
+
+
+_default_scheduler = RequestScheduler()
+
+
+def get_default_scheduler() -> RequestScheduler:
+    """Returns the process-wide scheduler used when a client is not given one."""
+    return _default_scheduler
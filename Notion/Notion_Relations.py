@@ -0,0 +1,131 @@
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Optional
+import pandas as pd
+from Notion.Notion_Cache import TTLCache
+
+
+class RelationResolver:
+    """
+    Resolves related page ids (relation and rollup properties) to page titles.
+
+    Ids are de-duplicated across the whole result set, looked up in a cache
+    shared across queries, and the missing ones are fetched concurrently with
+    NotionAPI.get_page (every request still goes through the client's rate
+    limit scheduler).
+    """
+
+    def __init__(self, notion_api, max_workers: int = 3, cache: Optional[TTLCache] = None):
+        """
+        Initializes the resolver.
+
+        Args:
+            notion_api (NotionAPI): Client used to fetch the related pages.
+            max_workers (int): Maximum number of pages fetched at the same time.
+            cache (Optional[TTLCache]): Page id to title cache. Defaults to a new
+                                        10000 entries, 1 hour TTL cache.
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+
+        self.logger = logging.getLogger("notion")
+        self.notion_api = notion_api
+        self.max_workers = max_workers
+        self.cache = cache if cache is not None else TTLCache(maxsize=10000, ttl=3600.0)
+
+    def resolve(self, page_ids: Iterable[str]) -> dict:
+        """
+        Returns the title of every given page.
+
+        Args:
+            page_ids (Iterable[str]): Page ids, possibly repeated.
+
+        Returns:
+            dict: Page id to page title. The title is None if the page could not be fetched.
+        """
+        titles = {}
+        missing = []
+        for page_id in dict.fromkeys(page_ids):
+            title = self.cache.get(page_id, default=self)
+            if title is self:
+                missing.append(page_id)
+            else:
+                titles[page_id] = title
+
+        if missing:
+            self.logger.info(f"Fetching {len(missing)} related pages ({len(titles)} cached)")
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(missing))) as executor:
+                for page_id, title in zip(missing, executor.map(self._fetch_title, missing)):
+                    # Failed lookups are not cached so they are retried by the next query.
+                    if title is not None:
+                        self.cache.set(page_id, title)
+                    titles[page_id] = title
+
+        return titles
+
+    def resolve_columns(
+        self, df: pd.DataFrame, columns: list[str], suffix: str = " (resolved)"
+    ) -> pd.DataFrame:
+        """
+        Adds a resolved column next to every relation/rollup column of a DataFrame.
+
+        The ids of all the columns are resolved together, so each related page
+        is fetched at most once.
+
+        Args:
+            df (pd.DataFrame): Query results as returned by query_db.
+            columns (list[str]): Relation or rollup columns holding page ids.
+            suffix (str): Suffix of the resolved columns' names.
+
+        Returns:
+            pd.DataFrame: New DataFrame with a list of titles per row in each resolved column.
+        """
+        ids_per_column = {column: [self._extract_ids(cell) for cell in df[column]] for column in columns}
+        titles = self.resolve(
+            page_id for cells in ids_per_column.values() for ids in cells if ids for page_id in ids
+        )
+
+        resolved = df.copy()
+        for column, cells in ids_per_column.items():
+            resolved[column + suffix] = pd.Series(
+                [[titles[page_id] for page_id in ids] if ids else None for ids in cells],
+                index=df.index,
+                dtype=object,
+            )
+        return resolved
+
+    def _extract_ids(self, cell) -> Optional[list[str]]:
+        """
+        Returns the page ids held in a cell: a relation's list of ids, or a
+        rollup array of relation values.
+        """
+        if not isinstance(cell, list):
+            return None
+
+        ids = []
+        for item in cell:
+            if isinstance(item, str):
+                ids.append(item)
+            elif isinstance(item, dict) and item.get("type") == "relation":
+                ids += [relation["id"] for relation in item["relation"]]
+        return ids
+
+    def _fetch_title(self, page_id: str) -> Optional[str]:
+        """Fetches a page and returns its title, None if it could not be fetched."""
+        try:
+            # Notion answers 404 (or 403) for pages that are not shared with the integration.
+            response = self.notion_api.get_page(page_id, expected_statuses=(403, 404))
+        except (ConnectionError, ValueError) as e:
+            self.logger.warning(f"Could not resolve related page {page_id}: {e}")
+            return None
+        if response.status_code != 200:
+            self.logger.debug(f"Related page {page_id} is not accessible (response {response.status_code})")
+            return None
+
+        page = json.loads(response.content)
+
+        for page_property in page["properties"].values():
+            if page_property["type"] == "title":
+                return "".join(text["plain_text"] for text in page_property["title"])
+        return None
@@ -0,0 +1,188 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Optional
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+
+
+class ResponseCache:
+    """
+    Persistent (SQLite) cache of Notion API GET responses.
+
+    Entries are keyed by request URL, Notion-Version and integration key, are
+    fresh for ttl seconds and are evicted least recently used first once the
+    cache grows over max_bytes. Stale entries that came with an ETag are
+    revalidated with If-None-Match instead of being downloaded again.
+    """
+
+    def __init__(self, path: str, ttl: float = 3600.0, max_bytes: int = 50 * 1024 * 1024):
+        """
+        Opens (or creates) the cache.
+
+        Args:
+            path (str): Path of the SQLite file. ":memory:" keeps the cache in memory.
+            ttl (float): Seconds a cached response is served without contacting the API.
+            max_bytes (int): Maximum total size of the cached bodies.
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    url TEXT NOT NULL,
+                    headers TEXT NOT NULL,
+                    content BLOB NOT NULL,
+                    etag TEXT,
+                    stored_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    size INTEGER NOT NULL
+                )
+                """
+            )
+
+    def __enter__(self) -> "ResponseCache":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Closes the underlying SQLite connection."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def get_key(self, request_url: str, headers: dict) -> str:
+        """
+        Returns the cache key of a request.
+
+        The integration key is part of it (hashed) because two integrations
+        may not have access to the same pages.
+
+        Args:
+            request_url (str): Request URL.
+            headers (dict): Request headers.
+
+        Returns:
+            str: Cache key.
+        """
+        parts = [request_url, headers.get("Notion-Version", ""), headers.get("Authorization", "")]
+        return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+    def get(self, key: str) -> tuple[Optional[Response], Optional[str]]:
+        """
+        Looks a request up.
+
+        Args:
+            key (str): Cache key, see get_key.
+
+        Returns:
+            tuple[Optional[Response], Optional[str]]: The cached response if it is
+                still fresh, otherwise None and the ETag to revalidate with, if any.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT url, headers, content, etag, stored_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None, None
+
+            url, headers, content, etag, stored_at = row
+            if time.time() - stored_at > self.ttl:
+                self.misses += 1
+                return None, etag
+
+            self.hits += 1
+            with self._connection:
+                self._connection.execute(
+                    "UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key)
+                )
+        return self._build_response(url, headers, content), None
+
+    def refresh(self, key: str) -> Optional[Response]:
+        """
+        Marks a stale entry as fresh again, after the API answered 304 Not Modified.
+
+        Args:
+            key (str): Cache key, see get_key.
+
+        Returns:
+            Optional[Response]: The cached response, None if it was evicted meanwhile.
+        """
+        now = time.time()
+        with self._lock:
+            with self._connection:
+                self._connection.execute(
+                    "UPDATE responses SET stored_at = ?, accessed_at = ? WHERE key = ?", (now, now, key)
+                )
+            row = self._connection.execute(
+                "SELECT url, headers, content FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            self.revalidations += 1
+        return self._build_response(*row) if row else None
+
+    def set(self, key: str, response) -> None:
+        """
+        Stores a successful response and evicts old entries if the cache is too big.
+
+        Args:
+            key (str): Cache key, see get_key.
+            response (Union[requests.Response, httpx.Response]): Response to store.
+        """
+        content = response.content
+        if len(content) > self.max_bytes:
+            return
+
+        headers = json.dumps({"Content-Type": response.headers.get("Content-Type", "application/json")})
+        now = time.time()
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, url, headers, content, etag, stored_at, accessed_at, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, str(response.url), headers, content, response.headers.get("ETag"), now, now, len(content)),
+            )
+            self._evict()
+
+    def clear(self):
+        """Removes every cached response."""
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM responses")
+
+    def _evict(self):
+        """Deletes least recently used entries until the cache fits in max_bytes. Expects the lock."""
+        total_size = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total_size <= self.max_bytes:
+            return
+
+        rows = self._connection.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall()
+        evicted = []
+        for key, size in rows:
+            if total_size <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total_size -= size
+        self._connection.executemany("DELETE FROM responses WHERE key = ?", evicted)
+
+    def _build_response(self, url: str, headers: str, content: bytes) -> Response:
+        """Rebuilds a requests Response from a cached entry."""
+        response = Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.url = url
+        response.headers = CaseInsensitiveDict(json.loads(headers))
+        response.encoding = "utf-8"
+        response._content = content
+        return response
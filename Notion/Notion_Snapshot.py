@@ -0,0 +1,338 @@
+import json
+import logging
+import os
+from datetime import datetime, timezone
+from typing import Iterator, Optional
+import numpy as np
+import pandas as pd
+
+# Bumped whenever the layout of the snapshot files changes.
+SNAPSHOT_VERSION = 1
+
+# Key of the snapshot description in the Arrow schema metadata.
+_METADATA_KEY = b"notion"
+
+# File extensions written as Arrow IPC files; anything else is written as Parquet.
+ARROW_EXTENSIONS = (".arrow", ".feather", ".ipc")
+
+# Property types stored as list<string> columns.
+LIST_TYPES = ("multi_select", "relation")
+
+
+def _import_pyarrow():
+    """Imports pyarrow, which snapshots need but the rest of the package does not."""
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError("Snapshots require the 'pyarrow' package to be installed.") from e
+    return pyarrow
+
+
+def is_arrow_path(path: str) -> bool:
+    """Returns whether a snapshot path is written as an Arrow IPC file rather than Parquet."""
+    return path.lower().endswith(ARROW_EXTENSIONS)
+
+
+def get_arrow_schema(schema: dict[str, str]):
+    """
+    Returns the Arrow schema of a database's snapshot.
+
+    Columns are typed from the Notion property types, as ColumnarConverter
+    decodes them: float64 for number, bool for checkbox, dictionary-encoded
+    strings for select, UTC timestamps for date and list<string> for
+    multi_select and relation. Rollups are stored as JSON strings, since
+    their type depends on the rolled up property; the remaining types
+    (text, url, email, phone_number, files) are strings.
+
+    Args:
+        schema (dict[str, str]): Property name to Notion property type, in column order.
+
+    Returns:
+        pyarrow.Schema: Arrow schema, without metadata.
+    """
+    pa = _import_pyarrow()
+    type_to_arrow = {
+        "number": pa.float64(),
+        "checkbox": pa.bool_(),
+        "select": pa.dictionary(pa.int32(), pa.string()),
+        "multi_select": pa.list_(pa.string()),
+        "relation": pa.list_(pa.string()),
+        "date": pa.timestamp("us", tz="UTC"),
+    }
+    return pa.schema(
+        [pa.field(name, type_to_arrow.get(property_type, pa.string())) for name, property_type in schema.items()]
+    )
+
+
+def _to_arrow_array(series: pd.Series, property_type: str, arrow_type):
+    """Converts a column decoded by ColumnarConverter to an Arrow array of its snapshot type."""
+    pa = _import_pyarrow()
+    if property_type == "rollup":
+        series = series.map(lambda value: None if value is None else json.dumps(value))
+    elif property_type == "date":
+        series = series.dt.as_unit("us")
+    elif property_type not in LIST_TYPES and pd.api.types.is_object_dtype(series.dtype):
+        series = series.map(lambda value: None if value is None else str(value))
+    return pa.array(series, type=arrow_type, from_pandas=True)
+
+
+class SnapshotWriter:
+    """
+    Writes the pages of a database to a typed columnar snapshot, chunk by chunk.
+
+    Paths ending in .arrow, .feather or .ipc are written as uncompressed Arrow
+    IPC files, which are memory-mapped without any decoding when read back.
+    Anything else is written as a (zstd-compressed) Parquet file: smaller on
+    disk, decoded column by column on read. Only one chunk is held in memory
+    at a time. The file is written next to its final path and moved in place
+    on close(), so readers never see a partial snapshot.
+
+    Usage:
+        with SnapshotWriter("db.parquet", converter.schema, {"db": db_id}) as writer:
+            for chunk in notion.iter_db(db_id, return_type="dataframe"):
+                writer.write(chunk)
+    """
+
+    def __init__(self, path: str, schema: dict[str, str], metadata: Optional[dict] = None):
+        """
+        Opens the snapshot file.
+
+        Args:
+            path (str): Path of the snapshot.
+            schema (dict[str, str]): Property name to Notion property type, in column order.
+            metadata (Optional[dict]): JSON-serializable description stored in the file,
+                                       e.g. the database id and title.
+        """
+        pa = _import_pyarrow()
+        self.logger = logging.getLogger("notion")
+        self.path = path
+        self.schema = dict(schema)
+        self.rows = 0
+        # Option name to dictionary index of each select column. The dictionaries only
+        # grow, so every chunk's dictionary extends the previous one (an IPC "delta").
+        self._dictionaries = {name: {} for name, property_type in self.schema.items() if property_type == "select"}
+        self.metadata = {
+            **(metadata or {}),
+            "version": SNAPSHOT_VERSION,
+            "properties": self.schema,
+            "created_time": datetime.now(timezone.utc).isoformat(),
+        }
+        self.arrow_schema = get_arrow_schema(self.schema).with_metadata(
+            {_METADATA_KEY: json.dumps(self.metadata).encode()}
+        )
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._temporary_path = f"{path}.{os.getpid()}.tmp"
+        if is_arrow_path(path):
+            self._sink = pa.OSFile(self._temporary_path, "wb")
+            options = pa.ipc.IpcWriteOptions(emit_dictionary_deltas=True)
+            self._writer = pa.ipc.new_file(self._sink, self.arrow_schema, options=options)
+        else:
+            self._sink = None
+            self._writer = pa.parquet.ParquetWriter(self._temporary_path, self.arrow_schema, compression="zstd")
+
+    def __enter__(self) -> "SnapshotWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def write(self, df: pd.DataFrame):
+        """
+        Appends rows to the snapshot.
+
+        Args:
+            df (pd.DataFrame): Rows decoded by ColumnarConverter with the writer's schema.
+        """
+        pa = _import_pyarrow()
+        missing = [name for name in self.schema if name not in df.columns]
+        if missing:
+            raise ValueError(f"Snapshot chunk is missing the columns {missing}")
+
+        arrays = [
+            self._encode_select(name, df[name]) if property_type == "select"
+            else _to_arrow_array(df[name], property_type, self.arrow_schema.field(name).type)
+            for name, property_type in self.schema.items()
+        ]
+        self._writer.write_table(pa.Table.from_arrays(arrays, schema=self.arrow_schema))
+        self.rows += len(df)
+
+    def _encode_select(self, name: str, series: pd.Series):
+        """Dictionary-encodes a select column against the options seen in the previous chunks."""
+        pa = _import_pyarrow()
+        if not isinstance(series.dtype, pd.CategoricalDtype):
+            series = series.astype("category")
+
+        dictionary = self._dictionaries[name]
+        for option in series.cat.categories:
+            dictionary.setdefault(option, len(dictionary))
+        lookup = np.array([dictionary[option] for option in series.cat.categories] or [0], dtype=np.int32)
+        codes = series.cat.codes.to_numpy()
+        indices = pa.array(lookup[np.maximum(codes, 0)], type=pa.int32(), mask=codes < 0)
+        return pa.DictionaryArray.from_arrays(indices, pa.array(list(dictionary), type=pa.string()))
+
+    def close(self):
+        """Finishes the file and moves it to its final path."""
+        if self._writer is None:
+            return
+        self._close_file()
+        os.replace(self._temporary_path, self.path)
+        self.logger.info(f"Wrote snapshot {self.path} ({self.rows} rows)")
+
+    def abort(self):
+        """Closes and removes the partially written file, leaving any previous snapshot in place."""
+        if self._writer is None:
+            return
+        self._close_file()
+        try:
+            os.remove(self._temporary_path)
+        except FileNotFoundError:
+            pass
+
+    def _close_file(self):
+        self._writer.close()
+        if self._sink is not None:
+            self._sink.close()
+        self._writer = None
+        self._sink = None
+
+
+def write_snapshot(path: str, df: pd.DataFrame, schema: dict[str, str], metadata: Optional[dict] = None) -> dict:
+    """
+    Writes an already fetched database to a snapshot in one go, see SnapshotWriter.
+
+    Args:
+        path (str): Path of the snapshot.
+        df (pd.DataFrame): Rows decoded by ColumnarConverter.
+        schema (dict[str, str]): Property name to Notion property type, e.g. from ColumnarConverter.from_db.
+        metadata (Optional[dict]): JSON-serializable description stored in the file.
+
+    Returns:
+        dict: The snapshot's metadata, see read_snapshot_metadata.
+    """
+    with SnapshotWriter(path, schema, metadata) as writer:
+        if len(df):
+            writer.write(df)
+    return {**writer.metadata, "rows": writer.rows}
+
+
+def _read_table(path: str, columns: Optional[list[str]] = None):
+    """Reads a snapshot as an Arrow table, memory-mapping the file."""
+    pa = _import_pyarrow()
+    if is_arrow_path(path):
+        # Zero-copy: the table's buffers point into the mapped file.
+        table = pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+        return table if columns is None else table.select(_get_known_columns(table.schema, columns))
+    if columns is not None:
+        columns = _get_known_columns(pa.parquet.read_schema(path, memory_map=True), columns)
+    return pa.parquet.read_table(path, columns=columns, memory_map=True)
+
+
+def _get_known_columns(arrow_schema, columns: list[str]) -> list[str]:
+    """Returns the columns present in a snapshot, logging the others."""
+    unknown = [name for name in columns if name not in arrow_schema.names]
+    if unknown:
+        logging.getLogger("notion").warning(f"Snapshot has no columns named {unknown}")
+    return [name for name in columns if name in arrow_schema.names]
+
+
+def _get_metadata(arrow_schema) -> dict:
+    """Returns the snapshot description stored in an Arrow schema."""
+    metadata = arrow_schema.metadata or {}
+    if _METADATA_KEY not in metadata:
+        raise ValueError("File is not a Notion snapshot")
+    return json.loads(metadata[_METADATA_KEY])
+
+
+def _to_dataframe(table, properties: dict[str, str]) -> pd.DataFrame:
+    """
+    Converts a snapshot table to a DataFrame with the columns query_db returns:
+    list columns hold Python lists and rollups their decoded JSON value.
+    """
+    df = table.to_pandas()
+    for name in table.column_names:
+        property_type = properties.get(name)
+        if property_type in LIST_TYPES:
+            df[name] = pd.Series(table.column(name).to_pylist(), index=df.index, dtype=object)
+        elif property_type == "rollup":
+            values = table.column(name).to_pylist()
+            df[name] = pd.Series(
+                [None if value is None else json.loads(value) for value in values], index=df.index, dtype=object
+            )
+    return df
+
+
+def read_snapshot(path: str, columns: Optional[list[str]] = None) -> pd.DataFrame:
+    """
+    Reads a snapshot written by SnapshotWriter (see NotionAPI.snapshot_db).
+
+    Args:
+        path (str): Path of the snapshot.
+        columns (Optional[list[str]]): Only read these columns. The others are never decoded.
+
+    Returns:
+        pd.DataFrame: The snapshot's rows, typed as query_db would return them.
+    """
+    table = _read_table(path, columns)
+    return _to_dataframe(table, _get_metadata(table.schema)["properties"])
+
+
+def iter_snapshot(path: str, chunk_size: int = 100, columns: Optional[list[str]] = None) -> Iterator[pd.DataFrame]:
+    """
+    Reads a snapshot in DataFrame chunks, like NotionAPI.iter_db(return_type="dataframe").
+
+    Args:
+        path (str): Path of the snapshot.
+        chunk_size (int): Maximum number of rows per chunk.
+        columns (Optional[list[str]]): Only read these columns.
+
+    Yields:
+        pd.DataFrame: Chunk of the snapshot's rows.
+    """
+    pa = _import_pyarrow()
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+
+    if is_arrow_path(path):
+        table = _read_table(path, columns)
+        properties = _get_metadata(table.schema)["properties"]
+        batches = table.to_batches(max_chunksize=chunk_size)
+    else:
+        parquet_file = pa.parquet.ParquetFile(path, memory_map=True)
+        properties = _get_metadata(parquet_file.schema_arrow)["properties"]
+        if columns is not None:
+            columns = _get_known_columns(parquet_file.schema_arrow, columns)
+        batches = parquet_file.iter_batches(batch_size=chunk_size, columns=columns)
+
+    for batch in batches:
+        yield _to_dataframe(pa.Table.from_batches([batch]), properties)
+
+
+def read_snapshot_metadata(path: str) -> dict:
+    """
+    Returns the description stored in a snapshot, without reading its rows.
+
+    Args:
+        path (str): Path of the snapshot.
+
+    Returns:
+        dict: The metadata given to SnapshotWriter (db, title, query...), plus
+              "version", "properties" (name to Notion type), "created_time" and "rows".
+    """
+    pa = _import_pyarrow()
+    if is_arrow_path(path):
+        with pa.memory_map(path, "r") as source:
+            reader = pa.ipc.open_file(source)
+            metadata = _get_metadata(reader.schema)
+            metadata["rows"] = sum(reader.get_batch(index).num_rows for index in range(reader.num_record_batches))
+    else:
+        parquet_file = pa.parquet.ParquetFile(path, memory_map=True)
+        metadata = _get_metadata(parquet_file.schema_arrow)
+        metadata["rows"] = parquet_file.metadata.num_rows
+    return metadata
@@ -1,7 +1,8 @@
 import os
 
-from Notion.NotionAPI import NotionAPI
+from Notion.Notion_API import NotionAPI
 
 if __name__ == "__main__":
-    notion = NotionAPI(os.environ.get("NOTION_API_KEY"))
+    with NotionAPI(os.environ.get("NOTION_API_KEY")):
+        pass
     print("Success!")
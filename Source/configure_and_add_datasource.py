@@ -1,28 +1,13 @@
-from ruamel import yaml
 import great_expectations as ge
+from Validation.Validation_GE import ensure_datasource, get_datasource_config
 
 def configure_and_add_datasource():
     context = ge.get_context()
 
-    datasource_config = {
-        "name": "my_notion_pandas_data_source",
-        "class_name": "Datasource",
-        "module_name": "great_expectations.datasource",
-        "execution_engine": {
-            "module_name": "great_expectations.execution_engine",
-            "class_name": "PandasExecutionEngine",
-        },
-        "data_connectors": {
-            "my_notion_pandas_data_connector": {
-                "class_name": "RuntimeDataConnector",
-                "module_name": "great_expectations.datasource.data_connector",
-                "batch_identifiers": ["default_identifier_name"],
-            },
-        },
-    }
+    datasource_config = get_datasource_config()
 
-    context.test_yaml_config(yaml.dump(datasource_config))
-    context.add_datasource(**datasource_config)
+    # Does nothing if the datasource is already configured, so it is safe to re-run.
+    ensure_datasource(context, datasource_config)
 
 if __name__ == "__main__":
-    configure_and_add_datasource()
+    configure_and_add_datasource()
\ No newline at end of file
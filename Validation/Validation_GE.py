@@ -0,0 +1,150 @@
+import logging
+import threading
+import time
+from typing import Optional
+
+DATASOURCE_NAME = "my_notion_pandas_data_source"
+DATA_CONNECTOR_NAME = "my_notion_pandas_data_connector"
+
+
+def get_datasource_config(
+    name: str = DATASOURCE_NAME, data_connector: str = DATA_CONNECTOR_NAME
+) -> dict:
+    """
+    Returns the configuration of the runtime pandas datasource the runners validate through.
+
+    Args:
+        name (str): Datasource name.
+        data_connector (str): Name of its runtime data connector.
+
+    Returns:
+        dict: Datasource configuration, as accepted by context.add_datasource.
+    """
+    return {
+        "name": name,
+        "class_name": "Datasource",
+        "module_name": "great_expectations.datasource",
+        "execution_engine": {
+            "module_name": "great_expectations.execution_engine",
+            "class_name": "PandasExecutionEngine",
+        },
+        "data_connectors": {
+            data_connector: {
+                "class_name": "RuntimeDataConnector",
+                "module_name": "great_expectations.datasource.data_connector",
+                "batch_identifiers": ["default_identifier_name"],
+            },
+        },
+    }
+
+
+def ensure_datasource(context, datasource_config: Optional[dict] = None) -> bool:
+    """
+    Adds a datasource to a data context unless an identical one is already configured.
+
+    test_yaml_config instantiates the datasource and add_datasource rewrites
+    great_expectations.yml, so both are skipped when nothing would change.
+
+    Args:
+        context: Great Expectations data context.
+        datasource_config (Optional[dict]): Datasource configuration. Defaults to get_datasource_config().
+
+    Returns:
+        bool: Whether the datasource was added (or updated).
+    """
+    logger = logging.getLogger("notion")
+    datasource_config = datasource_config or get_datasource_config()
+    name = datasource_config["name"]
+
+    for existing in context.list_datasources():
+        if existing.get("name") != name:
+            continue
+        if _is_configured(existing, datasource_config):
+            logger.info(f"Datasource {name} is already configured")
+            return False
+        logger.info(f"Datasource {name} is configured differently, updating it")
+        break
+
+    from ruamel import yaml
+
+    context.test_yaml_config(yaml.dump(datasource_config))
+    context.add_datasource(**datasource_config)
+    return True
+
+
+def _is_configured(existing: dict, datasource_config: dict) -> bool:
+    """Returns whether an existing datasource has the configuration's class, engine and data connectors."""
+    if existing.get("class_name") != datasource_config["class_name"]:
+        return False
+    engine = existing.get("execution_engine") or {}
+    if engine.get("class_name") != datasource_config["execution_engine"]["class_name"]:
+        return False
+
+    existing_connectors = existing.get("data_connectors") or {}
+    for connector_name, connector in datasource_config["data_connectors"].items():
+        existing_connector = existing_connectors.get(connector_name) or {}
+        if existing_connector.get("class_name") != connector["class_name"]:
+            return False
+        if list(existing_connector.get("batch_identifiers") or []) != connector["batch_identifiers"]:
+            return False
+    return True
+
+
+class GreatExpectationsLoader:
+    """
+    Imports Great Expectations and loads the data context in a background thread.
+
+    Importing great_expectations and parsing great_expectations.yml take
+    seconds; started before querying Notion, they overlap with the fetch
+    instead of delaying it. get_context() then only waits for whatever is left.
+
+    Usage:
+        loader = GreatExpectationsLoader().start()
+        df = notion.query_db(db)
+        context = loader.get_context()
+        batch = loader.ge.from_pandas(df)
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger("notion")
+        self.ge = None
+        self.load_seconds = None
+        self._context = None
+        self._error = None
+        self._thread = None
+
+    def start(self) -> "GreatExpectationsLoader":
+        """Starts loading in the background. Returns the loader itself."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._load, name="great-expectations-loader", daemon=True)
+            self._thread.start()
+        return self
+
+    def get_context(self):
+        """
+        Returns the data context, waiting for it to be loaded (or loading it now if start() was not called).
+
+        Returns:
+            Great Expectations data context.
+        """
+        if self._thread is None:
+            self._load()
+        else:
+            started = time.perf_counter()
+            self._thread.join()
+            self.logger.info(f"Waited {time.perf_counter() - started:.2f}s for Great Expectations")
+
+        if self._error is not None:
+            raise self._error
+        return self._context
+
+    def _load(self):
+        started = time.perf_counter()
+        try:
+            import great_expectations as ge
+
+            self.ge = ge
+            self._context = ge.get_context()
+        except Exception as e:
+            self._error = e
+        self.load_seconds = time.perf_counter() - started
@@ -0,0 +1,178 @@
+import hashlib
+import logging
+import pickle
+import sqlite3
+import threading
+from functools import reduce
+from typing import Optional
+from Notion.Notion_Columnar import ColumnarConverter
+from Notion.Notion_Page_Cache import NotionPageCache
+from Validation.Validation_Native import NativeValidator, get_suite_hash
+
+
+class IncrementalValidator:
+    """
+    Re-validates a synced database in time proportional to what changed.
+
+    The pages of a NotionPageCache scope are split in buckets by a hash of
+    their id. The suite's metrics (counts, min/max, HyperLogLog and t-digest
+    sketches) are computed per bucket and persisted, together with a
+    fingerprint of the bucket's page ids and last_edited_times. On the next
+    run only the buckets whose fingerprint changed (a page was added, edited
+    or removed) are decoded and evaluated again; the metrics of every bucket
+    are then merged into the suite result.
+
+    The metrics are stored in their own table, so they can live in the same
+    SQLite file as the page cache.
+
+    Usage:
+        with NotionPageCache("pages.db") as cache:
+            notion.sync_db(db, cache, return_type=None)
+            with IncrementalValidator(validator, "pages.db") as incremental:
+                result = incremental.validate(cache, notion.get_cache_scope(db))
+    """
+
+    def __init__(self, validator: NativeValidator, path: str, buckets: int = 64):
+        """
+        Opens (or creates) the metrics store.
+
+        Args:
+            validator (NativeValidator): Suite to validate against. Every expectation
+                                         must be evaluated natively.
+            path (str): Path of the SQLite file, e.g. the page cache's.
+            buckets (int): Number of buckets the pages are split in. More buckets
+                           means less to recompute per change, and more metrics to store.
+        """
+        if validator.fallback:
+            raise ValueError("Incremental validation only supports natively evaluated expectations")
+        if buckets < 1:
+            raise ValueError("buckets must be at least 1")
+
+        self.logger = logging.getLogger("notion")
+        self.validator = validator
+        self.suite_hash = get_suite_hash(validator.suite)
+        self.path = path
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS bucket_metrics (
+                    scope TEXT NOT NULL,
+                    suite_hash TEXT NOT NULL,
+                    bucket INTEGER NOT NULL,
+                    fingerprint TEXT NOT NULL,
+                    metrics BLOB NOT NULL,
+                    PRIMARY KEY (scope, suite_hash, bucket)
+                )
+                """
+            )
+
+    def __enter__(self) -> "IncrementalValidator":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Closes the underlying SQLite connection."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def validate(self, cache: NotionPageCache, scope: str, run_name: Optional[str] = None) -> dict:
+        """
+        Validates the cached pages of a scope, recomputing only the changed buckets.
+
+        Args:
+            cache (NotionPageCache): Page cache, already synced (see NotionAPI.sync_db).
+            scope (str): Cache scope, see NotionAPI.get_cache_scope.
+            run_name (Optional[str]): Run name stored in the result's meta.
+
+        Returns:
+            dict: Validation result, in Great Expectations' JSON format, with an
+                  "incremental" entry in meta describing what was recomputed.
+        """
+        page_ids_per_bucket = [[] for _ in range(self.buckets)]
+        versions = cache.get_page_versions(scope)
+        for page_id in versions:
+            page_ids_per_bucket[self._get_bucket(page_id)].append(page_id)
+
+        fingerprints = [self._get_fingerprint(page_ids, versions) for page_ids in page_ids_per_bucket]
+        stored = self._load(scope)
+
+        bucket_metrics = []
+        recomputed_rows = 0
+        dirty = [
+            bucket for bucket in range(self.buckets)
+            if bucket not in stored or stored[bucket][0] != fingerprints[bucket]
+        ]
+        for bucket in range(self.buckets):
+            if bucket not in dirty:
+                bucket_metrics.append(stored[bucket][1])
+                continue
+
+            pages = cache.get_pages_by_id(scope, page_ids_per_bucket[bucket])
+            metrics = self._compute_metrics(pages)
+            self._store(scope, bucket, fingerprints[bucket], metrics)
+            bucket_metrics.append(metrics)
+            recomputed_rows += len(pages)
+
+        self.logger.info(
+            f"Recomputed {len(dirty)} of {self.buckets} buckets ({recomputed_rows} of {len(versions)} pages)"
+        )
+        metrics = reduce(self.validator.merge_metrics, bucket_metrics)
+        results = [self.validator.build_expectation_result(index, metrics[index]) for index in self.validator.native]
+        result = self.validator.build_suite_result(results, run_name)
+        result["meta"]["incremental"] = {
+            "buckets": self.buckets,
+            "recomputed_buckets": len(dirty),
+            "rows": len(versions),
+            "recomputed_rows": recomputed_rows,
+        }
+        return result
+
+    def clear(self, scope: str):
+        """
+        Removes the stored metrics of a scope, for every suite.
+
+        Args:
+            scope (str): Cache scope, usually the database id.
+        """
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM bucket_metrics WHERE scope = ?", (scope,))
+
+    def _compute_metrics(self, pages: list[dict]) -> dict:
+        """Computes the suite's metrics over some pages."""
+        if not pages:
+            return {index: self.validator.get_empty_metrics(index) for index in self.validator.native}
+        return self.validator.compute_metrics(ColumnarConverter.from_pages(pages).convert(pages))
+
+    def _get_bucket(self, page_id: str) -> int:
+        """Returns the bucket of a page. Stable across runs and processes, unlike hash()."""
+        return int.from_bytes(hashlib.blake2b(page_id.encode(), digest_size=8).digest(), "big") % self.buckets
+
+    def _get_fingerprint(self, page_ids: list[str], versions: dict) -> str:
+        """Returns a fingerprint of a bucket's pages and their versions."""
+        content = "\n".join(f"{page_id} {versions[page_id]}" for page_id in sorted(page_ids))
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    def _load(self, scope: str) -> dict:
+        """Returns the stored fingerprint and metrics of every bucket of a scope."""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT bucket, fingerprint, metrics FROM bucket_metrics WHERE scope = ? AND suite_hash = ?",
+                (scope, self.suite_hash),
+            ).fetchall()
+        # The metrics are only ever written by this class, to a local file.
+        return {bucket: (fingerprint, pickle.loads(metrics)) for bucket, fingerprint, metrics in rows}
+
+    def _store(self, scope: str, bucket: int, fingerprint: str, metrics: dict):
+        """Stores the fingerprint and metrics of a bucket."""
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO bucket_metrics (scope, suite_hash, bucket, fingerprint, metrics) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (scope, self.suite_hash, bucket, fingerprint, pickle.dumps(metrics)),
+            )
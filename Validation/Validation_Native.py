@@ -0,0 +1,630 @@
+import copy
+import datetime
+import hashlib
+import json
+import logging
+import re
+import uuid
+from typing import Optional
+import numpy as np
+import pandas as pd
+from Validation.Validation_Sketches import HyperLogLog, TDigest
+
+_NATIVE_RESULT_FORMATS = ("BOOLEAN_ONLY", "BASIC")
+
+
+def load_suite(path: str) -> dict:
+    """
+    Loads an expectation suite file, as stored in Expectations/.
+
+    Args:
+        path (str): Path of a .json or .jsonc suite. Full-line // comments are allowed in .jsonc.
+
+    Returns:
+        dict: The suite.
+    """
+    with open(path) as suite_file:
+        return parse_suite(suite_file.read(), path)
+
+
+def parse_suite(content: str, path: str = "") -> dict:
+    """
+    Parses the content of an expectation suite file.
+
+    Args:
+        content (str): JSON content of the suite.
+        path (str): Path the content comes from. Full-line // comments are allowed in .jsonc.
+
+    Returns:
+        dict: The suite.
+    """
+    if path.endswith(".jsonc"):
+        content = re.sub(r"^\s*//.*$", "", content, flags=re.MULTILINE)
+    suite = json.loads(content)
+
+    if "expectations" not in suite:
+        raise ValueError(f"{path} is not an expectation suite")
+    return suite
+
+
+def get_suite_hash(suite: dict) -> str:
+    """Returns a hash of a suite's content, independent of key order and formatting."""
+    return hashlib.sha256(json.dumps(suite, sort_keys=True).encode()).hexdigest()
+
+
+def _get_result_format(kwargs: dict) -> tuple[str, int]:
+    """Returns the result format name and partial_unexpected_count of an expectation."""
+    result_format = kwargs.get("result_format", "BASIC")
+    if isinstance(result_format, dict):
+        return result_format.get("result_format", "BASIC"), result_format.get("partial_unexpected_count", 20)
+    return result_format, 20
+
+
+def _percent(count: int, total: int) -> Optional[float]:
+    return 100.0 * count / total if total else None
+
+
+def _coerce_bound(bound, like):
+    """Parses a string bound as a timestamp when compared with dates (e.g. "2021-01-01")."""
+    if not isinstance(bound, str):
+        return bound
+    tz = getattr(like, "tz", None)
+    if tz is None and isinstance(getattr(like, "dtype", None), pd.DatetimeTZDtype):
+        tz = like.dtype.tz
+    if tz is None and not (isinstance(like, pd.Timestamp) or pd.api.types.is_datetime64_any_dtype(like)):
+        return bound
+
+    bound = pd.Timestamp(bound)
+    if tz is not None and bound.tz is None:
+        bound = bound.tz_localize(tz)
+    return bound
+
+
+def _to_json_value(value):
+    """Converts numpy and pandas scalars to their JSON counterpart."""
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    if hasattr(value, "item"):
+        return value.item()
+    return value
+
+
+def _min(left, right):
+    return right if left is None else left if right is None else min(left, right)
+
+
+def _max(left, right):
+    return right if left is None else left if right is None else max(left, right)
+
+
+class NativeValidator:
+    """
+    Evaluates an expectation suite on a DataFrame without Great Expectations.
+
+    The expectation types our suites are made of are evaluated natively, all
+    in one pass over the frame: the null mask of every referenced column is
+    computed once and each column is converted to strings once for all the
+    regexes applied to it. Every other expectation (or result format) is
+    handed to Great Expectations, imported only when needed.
+
+    Every native expectation is computed from mergeable metrics: counts for
+    the per-value expectations, and min, max or a HyperLogLog sketch for the
+    aggregate ones, a t-digest for the median and quantiles. The sketches are
+    only used for metrics of chunks that get merged (streams, incremental
+    buckets), whose distinct count (about 1.6% standard error), median and
+    quantiles are estimates, flagged as approximate in the result's meta.
+    validate() sees the whole frame and computes them exactly.
+
+    Results follow Great Expectations' validation result JSON, so they can be
+    stored, compared or rendered like the ones from a Checkpoint.
+
+    Usage:
+        validator = NativeValidator(load_suite("Expectations/expectation_suite.json"))
+        result = validator.validate(df)
+        result["success"], result["statistics"]
+    """
+
+    _TYPE_TO_FUNCTION = {
+        "expect_column_values_to_not_be_null": "_unexpected_null",
+        "expect_column_values_to_match_regex": "_unexpected_regex",
+        "expect_column_values_to_be_between": "_unexpected_between",
+    }
+    _AGGREGATE_TYPE_TO_FUNCTION = {
+        "expect_column_min_to_be_between": "_observe_min",
+        "expect_column_max_to_be_between": "_observe_max",
+        "expect_column_unique_value_count_to_be_between": "_observe_distinct",
+        "expect_column_median_to_be_between": "_observe_distribution",
+        "expect_column_quantile_values_to_be_between": "_observe_distribution",
+    }
+    _AGGREGATE_TYPE_TO_MERGE = {
+        "expect_column_min_to_be_between": _min,
+        "expect_column_max_to_be_between": _max,
+        "expect_column_unique_value_count_to_be_between": HyperLogLog.merge,
+        "expect_column_median_to_be_between": TDigest.merge,
+        "expect_column_quantile_values_to_be_between": TDigest.merge,
+    }
+    # Exact counterparts of the sketches, used when the metrics are not merged.
+    _EXACT_TYPE_TO_FUNCTION = {
+        "expect_column_unique_value_count_to_be_between": "_count_distinct",
+        "expect_column_median_to_be_between": "_exact_distribution",
+        "expect_column_quantile_values_to_be_between": "_exact_distribution",
+    }
+
+    # Native expectations are evaluated cheapest first, so fail-fast streams
+    # can stop before the regexes run on a chunk that already failed.
+    _FUNCTION_COST = {
+        "_unexpected_null": 0,
+        "_observe_min": 1,
+        "_observe_max": 1,
+        "_unexpected_between": 2,
+        "_observe_distribution": 3,
+        "_observe_distinct": 4,
+        "_unexpected_regex": 5,
+    }
+
+    def __init__(self, suite: dict, plan: Optional[dict] = None):
+        """
+        Splits the suite in natively supported expectations and fallback ones.
+
+        Args:
+            suite (dict): Expectation suite, e.g. from load_suite.
+            plan (Optional[dict]): Execution plan previously returned by get_plan for
+                                   this same suite, to skip compiling it again.
+        """
+        self.logger = logging.getLogger("notion")
+        self.suite = suite
+        self.suite_name = suite.get("expectation_suite_name", "default")
+        self.expectations = suite["expectations"]
+
+        plan = plan or self._compile_plan()
+        self.native = plan["native"]
+        self.fallback = plan["fallback"]
+        self.check_order = plan["check_order"]
+        self.columns = plan["columns"]
+        self.table_level = plan["table_level"]
+        self._regexes = {int(index): re.compile(regex) for index, regex in plan["regexes"].items()}
+
+    def get_plan(self) -> dict:
+        """
+        Returns the suite's execution plan: which expectations run natively, in
+        which order, on which columns, and the regexes to compile.
+
+        Returns:
+            dict: JSON-serializable plan, to pass back to the constructor.
+        """
+        return {
+            "native": self.native,
+            "fallback": self.fallback,
+            "check_order": self.check_order,
+            "columns": self.columns,
+            "table_level": self.table_level,
+            "regexes": {str(index): regex.pattern for index, regex in self._regexes.items()},
+        }
+
+    def _compile_plan(self) -> dict:
+        """Builds the suite's execution plan, see get_plan."""
+        native = [index for index, expectation in enumerate(self.expectations) if self.supports(expectation)]
+        function_names = {**self._TYPE_TO_FUNCTION, **self._AGGREGATE_TYPE_TO_FUNCTION}
+        columns = []
+        table_level = False
+        for expectation in self.expectations:
+            kwargs = expectation["kwargs"]
+            referenced = [kwargs.get("column"), kwargs.get("column_A"), kwargs.get("column_B")]
+            referenced += kwargs.get("column_list") or []
+            referenced = [column for column in referenced if column is not None]
+            # Expectations on the table itself (column count, column names...) need every column.
+            table_level = table_level or not referenced
+            columns += referenced
+        return {
+            "native": native,
+            "fallback": [index for index in range(len(self.expectations)) if index not in native],
+            "check_order": sorted(
+                native,
+                key=lambda index: self._FUNCTION_COST[function_names[self.expectations[index]["expectation_type"]]],
+            ),
+            "columns": list(dict.fromkeys(columns)),
+            "table_level": table_level,
+            "regexes": {
+                str(index): self.expectations[index]["kwargs"]["regex"]
+                for index in native
+                if "regex" in self.expectations[index]["kwargs"]
+            },
+        }
+
+    def supports(self, expectation: dict) -> bool:
+        """Returns whether an expectation is evaluated natively."""
+        result_format, _ = _get_result_format(expectation["kwargs"])
+        expectation_type = expectation["expectation_type"]
+        return (
+            (expectation_type in self._TYPE_TO_FUNCTION or expectation_type in self._AGGREGATE_TYPE_TO_FUNCTION)
+            and result_format in _NATIVE_RESULT_FORMATS
+            and not expectation["kwargs"].get("row_condition")
+        )
+
+    def get_columns(self) -> Optional[list[str]]:
+        """
+        Returns the columns the suite needs, in order of first use.
+
+        Returns:
+            Optional[list[str]]: Referenced columns, None if an expectation is about
+                                 the whole table and every column is needed.
+        """
+        return None if self.table_level else list(self.columns)
+
+    def validate(self, df: pd.DataFrame, run_name: Optional[str] = None) -> dict:
+        """
+        Validates a DataFrame against the suite.
+
+        Args:
+            df (pd.DataFrame): Data to validate, e.g. as returned by query_db.
+            run_name (Optional[str]): Run name stored in the result's meta.
+
+        Returns:
+            dict: Validation result, in Great Expectations' JSON format.
+        """
+        metrics = self.compute_metrics(df, exact=True)
+        results = {index: self.build_expectation_result(index, metrics[index]) for index in self.native}
+
+        results.update(self.validate_fallback(df))
+        return self.build_suite_result([results[index] for index in range(len(self.expectations))], run_name)
+
+    def validate_fallback(self, df: pd.DataFrame) -> dict[int, dict]:
+        """
+        Validates a DataFrame against the expectations that are not evaluated natively.
+
+        Args:
+            df (pd.DataFrame): Data to validate.
+
+        Returns:
+            dict[int, dict]: Expectation index to validation result, empty if every
+                             expectation is evaluated natively.
+        """
+        if not self.fallback:
+            return {}
+        self.logger.info(f"Validating {len(self.fallback)} expectations with Great Expectations")
+        return dict(zip(self.fallback, self._validate_with_ge(df, self.fallback)))
+
+    def compute_metrics(self, df: pd.DataFrame, exact: bool = False) -> dict:
+        """
+        Computes the metrics every native expectation's result is built from.
+
+        Metrics are mergeable (counts, a bounded list of examples, min/max or a
+        sketch), so the metrics of consecutive chunks of a database can be
+        combined with merge_metrics.
+
+        Args:
+            df (pd.DataFrame): Data to validate.
+            exact (bool): Compute the aggregates exactly instead of with sketches, when df is
+                          all the data. Such metrics cannot be merged.
+
+        Returns:
+            dict: Expectation index to {"element_count", "missing_count",
+                  "unexpected_count", "partial_unexpected_list"} for per-value
+                  expectations, {"element_count", "missing_count", "observed"}
+                  for aggregate ones, or {"exception"}.
+        """
+        columns = [column for column in self.columns if column in df.columns]
+        null_mask = df[columns].isna()
+        null_counts = null_mask.sum()
+        as_strings = {}
+
+        metrics = {}
+        for index in self.check_order:
+            expectation = self.expectations[index]
+            column = expectation["kwargs"]["column"]
+            if column not in df.columns:
+                metrics[index] = {"exception": f"Column {column!r} is not in the data"}
+                continue
+
+            expectation_type = expectation["expectation_type"]
+            try:
+                if expectation_type in self._AGGREGATE_TYPE_TO_FUNCTION:
+                    function_name = self._AGGREGATE_TYPE_TO_FUNCTION[expectation_type]
+                    if exact:
+                        function_name = self._EXACT_TYPE_TO_FUNCTION.get(expectation_type, function_name)
+                    function = getattr(self, function_name)
+                    metrics[index] = {
+                        "element_count": len(df),
+                        "missing_count": int(null_counts[column]),
+                        "observed": function(index, df[column][~null_mask[column].to_numpy()]),
+                    }
+                    continue
+
+                function = getattr(self, self._TYPE_TO_FUNCTION[expectation_type])
+                _, partial_unexpected_count = _get_result_format(expectation["kwargs"])
+                missing_count, unexpected_count, partial_unexpected_list = function(
+                    index, df[column], null_mask[column], int(null_counts[column]), as_strings, partial_unexpected_count
+                )
+            except (TypeError, ValueError) as e:
+                metrics[index] = {"exception": f"{expectation_type} on column {column!r}: {str(e).splitlines()[0]}"}
+                continue
+
+            metrics[index] = {
+                "element_count": len(df),
+                "missing_count": missing_count,
+                "unexpected_count": unexpected_count,
+                "partial_unexpected_list": partial_unexpected_list,
+            }
+        return metrics
+
+    def merge_metrics(self, metrics: dict, other: dict) -> dict:
+        """
+        Combines the metrics of two disjoint chunks of the same data.
+
+        Args:
+            metrics (dict): Metrics from compute_metrics (or a previous merge).
+            other (dict): Metrics of another chunk.
+
+        Returns:
+            dict: Metrics of both chunks together.
+        """
+        merged = {}
+        for index in self.native:
+            left, right = metrics.get(index), other.get(index)
+            if left is None or right is None or "exception" in left or "exception" in right:
+                # A missing column fails the expectation whatever the other chunk holds.
+                merged[index] = right if left is None or "exception" in (right or {}) else left
+                continue
+
+            if "observed" in left:
+                merge = self._AGGREGATE_TYPE_TO_MERGE[self.expectations[index]["expectation_type"]]
+                merged[index] = {
+                    "element_count": left["element_count"] + right["element_count"],
+                    "missing_count": left["missing_count"] + right["missing_count"],
+                    "observed": merge(left["observed"], right["observed"]),
+                }
+                continue
+
+            _, partial_unexpected_count = _get_result_format(self.expectations[index]["kwargs"])
+            merged[index] = {
+                "element_count": left["element_count"] + right["element_count"],
+                "missing_count": left["missing_count"] + right["missing_count"],
+                "unexpected_count": left["unexpected_count"] + right["unexpected_count"],
+                "partial_unexpected_list": (
+                    left["partial_unexpected_list"] + right["partial_unexpected_list"]
+                )[:partial_unexpected_count],
+            }
+        return merged
+
+    def get_empty_metrics(self, index: int) -> dict:
+        """Returns the metrics of a native expectation over no rows at all."""
+        expectation_type = self.expectations[index]["expectation_type"]
+        if expectation_type == "expect_column_unique_value_count_to_be_between":
+            return {"element_count": 0, "missing_count": 0, "observed": HyperLogLog()}
+        if self._AGGREGATE_TYPE_TO_FUNCTION.get(expectation_type) == "_observe_distribution":
+            return {"element_count": 0, "missing_count": 0, "observed": TDigest()}
+        if expectation_type in self._AGGREGATE_TYPE_TO_FUNCTION:
+            return {"element_count": 0, "missing_count": 0, "observed": None}
+        return {"element_count": 0, "missing_count": 0, "unexpected_count": 0, "partial_unexpected_list": []}
+
+    def build_expectation_result(self, index: int, metrics: dict) -> dict:
+        """
+        Builds one expectation's validation result from its metrics.
+
+        Args:
+            index (int): Position of the expectation in the suite.
+            metrics (dict): The expectation's metrics, see compute_metrics.
+
+        Returns:
+            dict: Expectation validation result, in Great Expectations' JSON format.
+        """
+        expectation = self.expectations[index]
+        expectation_result = {
+            "success": False,
+            "expectation_config": copy.deepcopy(expectation),
+            "result": {},
+            "meta": {},
+            "exception_info": {"raised_exception": False, "exception_message": None, "exception_traceback": None},
+        }
+        if "exception" in metrics:
+            expectation_result["exception_info"].update(raised_exception=True, exception_message=metrics["exception"])
+            return expectation_result
+        if "observed" in metrics:
+            return self._build_aggregate_result(expectation_result, metrics)
+
+        element_count = metrics["element_count"]
+        missing_count = metrics["missing_count"]
+        unexpected_count = metrics["unexpected_count"]
+        nonmissing_count = element_count - missing_count
+
+        # Like Great Expectations, "mostly" is relative to the non-missing values
+        # (all values for the null check itself, which has no missing values).
+        unexpected_percent = _percent(unexpected_count, nonmissing_count)
+        mostly = expectation["kwargs"].get("mostly", 1.0)
+        if unexpected_percent is None:
+            expectation_result["success"] = True
+        else:
+            expectation_result["success"] = (100.0 - unexpected_percent) / 100.0 >= mostly
+
+        result_format, _ = _get_result_format(expectation["kwargs"])
+        if result_format == "BOOLEAN_ONLY":
+            return expectation_result
+
+        result = {"element_count": element_count}
+        if expectation["expectation_type"] != "expect_column_values_to_not_be_null":
+            result.update(missing_count=missing_count, missing_percent=_percent(missing_count, element_count))
+        result.update(
+            unexpected_count=unexpected_count,
+            unexpected_percent=unexpected_percent,
+            partial_unexpected_list=metrics["partial_unexpected_list"],
+        )
+        if expectation["expectation_type"] != "expect_column_values_to_not_be_null":
+            result.update(
+                unexpected_percent_total=_percent(unexpected_count, element_count),
+                unexpected_percent_nonmissing=unexpected_percent,
+            )
+        expectation_result["result"] = result
+        return expectation_result
+
+    def _build_aggregate_result(self, expectation_result: dict, metrics: dict) -> dict:
+        """Fills the result of an aggregate expectation (min, max, distinct count...) from its metrics."""
+        kwargs = expectation_result["expectation_config"]["kwargs"]
+        observed = metrics["observed"]
+        if isinstance(observed, (HyperLogLog, TDigest)):
+            expectation_result["meta"]["approximate"] = True
+        if isinstance(observed, HyperLogLog):
+            observed = observed.count()
+        elif isinstance(observed, TDigest) and "quantile_ranges" in kwargs:
+            quantiles = kwargs["quantile_ranges"]["quantiles"]
+            observed = {"quantiles": quantiles, "values": [observed.quantile(quantile) for quantile in quantiles]}
+        elif isinstance(observed, TDigest):
+            observed = observed.quantile(0.5)
+
+        if "quantile_ranges" in kwargs:
+            values = observed["values"] if observed is not None else []
+            ranges = kwargs["quantile_ranges"]["value_ranges"]
+            expectation_result["success"] = bool(values) and all(
+                value is not None
+                and (value_range[0] is None or value >= value_range[0])
+                and (value_range[1] is None or value <= value_range[1])
+                for value, value_range in zip(values, ranges)
+            )
+        elif observed is not None:
+            min_value = _coerce_bound(kwargs.get("min_value"), observed)
+            max_value = _coerce_bound(kwargs.get("max_value"), observed)
+            above_min = min_value is None or (
+                observed > min_value if kwargs.get("strict_min") else observed >= min_value
+            )
+            below_max = max_value is None or (
+                observed < max_value if kwargs.get("strict_max") else observed <= max_value
+            )
+            expectation_result["success"] = bool(above_min and below_max)
+
+        result_format, _ = _get_result_format(kwargs)
+        if result_format != "BOOLEAN_ONLY":
+            expectation_result["result"] = {
+                "observed_value": _to_json_value(observed),
+                "element_count": metrics["element_count"],
+                "missing_count": metrics["missing_count"],
+                "missing_percent": _percent(metrics["missing_count"], metrics["element_count"]),
+            }
+        return expectation_result
+
+    def build_suite_result(self, results: list[dict], run_name: Optional[str] = None) -> dict:
+        """
+        Wraps expectation results into a suite validation result with statistics.
+
+        Args:
+            results (list[dict]): Expectation validation results, in suite order.
+            run_name (Optional[str]): Run name stored in the result's meta.
+
+        Returns:
+            dict: Validation result, in Great Expectations' JSON format.
+        """
+        successful = sum(1 for result in results if result["success"])
+        run_time = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%S.%fZ")
+        return {
+            "success": successful == len(results),
+            "results": results,
+            "evaluation_parameters": {},
+            "statistics": {
+                "evaluated_expectations": len(results),
+                "successful_expectations": successful,
+                "unsuccessful_expectations": len(results) - successful,
+                "success_percent": _percent(successful, len(results)),
+            },
+            "meta": {
+                "great_expectations_version": self.suite.get("meta", {}).get("great_expectations_version"),
+                "expectation_suite_name": self.suite_name,
+                "run_id": {"run_name": run_name, "run_time": run_time},
+                "validation_time": run_time,
+                "validation_id": uuid.uuid4().hex,
+                "engine": "native",
+            },
+        }
+
+    def _unexpected_null(
+        self, index: int, values: pd.Series, null_mask: pd.Series, null_count: int, as_strings: dict, limit: int
+    ) -> tuple[int, int, list]:
+        """expect_column_values_to_not_be_null: nulls are the unexpected values."""
+        return 0, null_count, [None] * min(null_count, limit)
+
+    def _unexpected_regex(
+        self, index: int, values: pd.Series, null_mask: pd.Series, null_count: int, as_strings: dict, limit: int
+    ) -> tuple[int, int, list]:
+        """
+        expect_column_values_to_match_regex: non-null values the regex is not
+        found in (re.search, as Great Expectations' pandas engine does).
+        """
+        column = values.name
+        if column not in as_strings:
+            # Great Expectations matches against str(value), e.g. "['English', 'Spanish']" for lists.
+            as_strings[column] = values[~null_mask].astype(str)
+        strings = as_strings[column]
+
+        matches = strings.str.contains(self._regexes[index], na=False)
+        unexpected = strings[~matches.to_numpy()]
+        return null_count, len(unexpected), values.loc[unexpected.index[:limit]].tolist()
+
+    def _unexpected_between(
+        self, index: int, values: pd.Series, null_mask: pd.Series, null_count: int, as_strings: dict, limit: int
+    ) -> tuple[int, int, list]:
+        """expect_column_values_to_be_between: non-null values outside [min_value, max_value]."""
+        kwargs = self.expectations[index]["kwargs"]
+        min_value = _coerce_bound(kwargs.get("min_value"), values)
+        max_value = _coerce_bound(kwargs.get("max_value"), values)
+        if min_value is None and max_value is None:
+            raise ValueError("min_value and max_value cannot both be None")
+
+        present = values[~null_mask.to_numpy()]
+        inside = np.ones(len(present), dtype=bool)
+        if min_value is not None:
+            inside &= (present > min_value if kwargs.get("strict_min") else present >= min_value).to_numpy()
+        if max_value is not None:
+            inside &= (present < max_value if kwargs.get("strict_max") else present <= max_value).to_numpy()
+
+        unexpected = present[~inside]
+        return null_count, len(unexpected), [_to_json_value(value) for value in unexpected.iloc[:limit]]
+
+    def _observe_min(self, index: int, present: pd.Series):
+        """expect_column_min_to_be_between: minimum of the non-null values, None if there are none."""
+        return present.min() if len(present) else None
+
+    def _observe_max(self, index: int, present: pd.Series):
+        """expect_column_max_to_be_between: maximum of the non-null values, None if there are none."""
+        return present.max() if len(present) else None
+
+    def _observe_distinct(self, index: int, present: pd.Series) -> HyperLogLog:
+        """expect_column_unique_value_count_to_be_between: sketch of the distinct non-null values."""
+        return HyperLogLog().add(present)
+
+    def _count_distinct(self, index: int, present: pd.Series) -> int:
+        """expect_column_unique_value_count_to_be_between: exact number of distinct non-null values."""
+        if present.dtype == object:
+            # Lists (multi_select, relation) are not hashable, they are compared as strings like in hash_values.
+            present = present.astype(str)
+        return int(present.nunique())
+
+    def _observe_distribution(self, index: int, present: pd.Series) -> TDigest:
+        """expect_column_median/quantile_values_to_be_between: t-digest of the non-null values."""
+        if not pd.api.types.is_numeric_dtype(present) or pd.api.types.is_bool_dtype(present):
+            raise TypeError(f"column of type {present.dtype} is not numeric")
+        return TDigest().add(present)
+
+    def _exact_distribution(self, index: int, present: pd.Series):
+        """
+        expect_column_median/quantile_values_to_be_between: exact median, or quantiles
+        with the "nearest" interpolation Great Expectations' pandas engine uses.
+        """
+        if not pd.api.types.is_numeric_dtype(present) or pd.api.types.is_bool_dtype(present):
+            raise TypeError(f"column of type {present.dtype} is not numeric")
+
+        kwargs = self.expectations[index]["kwargs"]
+        if "quantile_ranges" not in kwargs:
+            return present.median() if len(present) else None
+        quantiles = kwargs["quantile_ranges"]["quantiles"]
+        if not len(present):
+            return {"quantiles": quantiles, "values": [None] * len(quantiles)}
+        values = present.quantile(quantiles, interpolation="nearest")
+        return {"quantiles": quantiles, "values": [_to_json_value(value) for value in values]}
+
+    def _validate_with_ge(self, df: pd.DataFrame, indexes: list[int]) -> list[dict]:
+        """Validates some of the suite's expectations with Great Expectations."""
+        import great_expectations as ge
+
+        suite = {
+            "expectation_suite_name": self.suite_name,
+            "expectations": [self.expectations[index] for index in indexes],
+        }
+        result = ge.from_pandas(df).validate(expectation_suite=suite, catch_exceptions=True)
+        return result.to_json_dict()["results"]
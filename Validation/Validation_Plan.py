@@ -0,0 +1,114 @@
+import glob
+import hashlib
+import json
+import logging
+import os
+from typing import Optional
+from Notion.Notion_Cache import TTLCache
+from Validation.Validation_Native import NativeValidator, parse_suite
+
+# Bumped whenever the plan format (NativeValidator.get_plan) changes.
+PLAN_VERSION = 2
+
+
+class PlanCache:
+    """
+    Cache of compiled expectation suites, keyed by a hash of the suite file's content.
+
+    Loading a suite parses its JSON, classifies every expectation (native or
+    Great Expectations fallback), orders the checks and compiles the regexes.
+    The resulting NativeValidator is kept in memory for the life of the
+    process, and its plan is written to directory so other processes and
+    later runs skip the classification. A changed suite file hashes
+    differently, so its stale plan is never used (and is deleted when the new
+    one is written).
+
+    Compiled regexes cannot be persisted by Python, so they are compiled
+    again once per process from the cached patterns.
+
+    Usage:
+        plans = PlanCache(".plan_cache")
+        validator = plans.load("Expectations/expectation_suite.json")
+    """
+
+    def __init__(self, directory: Optional[str] = None, maxsize: int = 128):
+        """
+        Initializes the cache.
+
+        Args:
+            directory (Optional[str]): Directory the plans are written to. None only caches in memory.
+            maxsize (int): Maximum number of validators kept in memory.
+        """
+        self.logger = logging.getLogger("notion")
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self._validators = TTLCache(maxsize=maxsize, ttl=None)
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def load(self, path: str) -> NativeValidator:
+        """
+        Returns the validator of a suite file, compiling it only if its content is new.
+
+        Args:
+            path (str): Path of a .json or .jsonc suite.
+
+        Returns:
+            NativeValidator: Validator of the suite.
+        """
+        with open(path, "rb") as suite_file:
+            content = suite_file.read()
+        content_hash = hashlib.sha256(b"%d\n" % PLAN_VERSION + content).hexdigest()
+
+        validator = self._validators.get(content_hash)
+        if validator is not None:
+            self.hits += 1
+            return validator
+
+        plan_path = self._get_plan_path(path, content_hash)
+        if plan_path is not None and os.path.exists(plan_path):
+            with open(plan_path) as plan_file:
+                entry = json.load(plan_file)
+            validator = NativeValidator(entry["suite"], entry["plan"])
+            self.hits += 1
+        else:
+            validator = NativeValidator(parse_suite(content.decode(), path))
+            self.misses += 1
+            if plan_path is not None:
+                self._write(path, plan_path, validator)
+
+        self._validators.set(content_hash, validator)
+        return validator
+
+    def _get_plan_path(self, path: str, content_hash: str) -> Optional[str]:
+        """Returns where the plan of a suite file's content is stored, None without a directory."""
+        if self.directory is None:
+            return None
+        return os.path.join(self.directory, f"{self._get_path_key(path)}-{content_hash[:32]}.json")
+
+    def _get_path_key(self, path: str) -> str:
+        return hashlib.sha256(os.path.abspath(path).encode()).hexdigest()[:16]
+
+    def _write(self, path: str, plan_path: str, validator: NativeValidator):
+        """Writes a plan atomically and removes the plans of previous versions of the suite file."""
+        for stale_path in glob.glob(os.path.join(self.directory, f"{self._get_path_key(path)}-*.json")):
+            if stale_path != plan_path:
+                self.logger.info(f"Removing stale suite plan {stale_path}")
+                try:
+                    os.remove(stale_path)
+                except FileNotFoundError:
+                    pass  # Removed by another process meanwhile
+
+        temporary_path = f"{plan_path}.{os.getpid()}.tmp"
+        with open(temporary_path, "w") as plan_file:
+            json.dump({"source": os.path.abspath(path), "suite": validator.suite, "plan": validator.get_plan()}, plan_file)
+        os.replace(temporary_path, plan_path)
+
+
+_default_plan_cache = PlanCache()
+
+
+def get_default_plan_cache() -> PlanCache:
+    """Returns the process-wide in-memory plan cache used when no cache directory is given."""
+    return _default_plan_cache
@@ -0,0 +1,141 @@
+import math
+from statistics import NormalDist
+from typing import Optional
+import numpy as np
+import pandas as pd
+
+
+def cochran_sample_size(
+    population: Optional[int] = None, margin_of_error: float = 0.05, confidence: float = 0.95, proportion: float = 0.5
+) -> int:
+    """
+    Returns the number of rows to sample to estimate a proportion (e.g. of null values).
+
+    Uses Cochran's formula, n0 = z^2 * p * (1 - p) / e^2, with the finite
+    population correction n = n0 / (1 + (n0 - 1) / N) when N is known.
+
+    Args:
+        population (Optional[int]): Number of rows of the database, if known.
+        margin_of_error (float): Accepted absolute error of the estimated proportion.
+        confidence (float): Confidence level of the estimate.
+        proportion (float): Expected proportion. 0.5 gives the largest (safest) sample.
+
+    Returns:
+        int: Sample size.
+    """
+    if not 0 < margin_of_error < 1 or not 0 < confidence < 1:
+        raise ValueError("margin_of_error and confidence must be between 0 and 1")
+
+    z = NormalDist().inv_cdf(1 - (1 - confidence) / 2)
+    sample_size = z**2 * proportion * (1 - proportion) / margin_of_error**2
+    if population is not None:
+        sample_size = sample_size / (1 + (sample_size - 1) / population)
+    return max(1, math.ceil(sample_size))
+
+
+class ReservoirSampler:
+    """
+    Uniform random sample of fixed size over a stream of DataFrame chunks.
+
+    Reservoir sampling (algorithm R), vectorized per chunk: every row seen so
+    far has the same probability of being in the sample, without knowing the
+    number of rows in advance, and memory stays bounded by the sample size.
+    """
+
+    def __init__(self, size: int, seed: Optional[int] = None):
+        """
+        Initializes an empty sample.
+
+        Args:
+            size (int): Number of rows to keep.
+            seed (Optional[int]): Seed of the random generator, for reproducible samples.
+        """
+        if size < 1:
+            raise ValueError("size must be at least 1")
+
+        self.size = size
+        self.rows_seen = 0
+        self._rng = np.random.default_rng(seed)
+        self._sample = None
+
+    def add(self, chunk: pd.DataFrame):
+        """Offers the rows of a chunk to the sample."""
+        if chunk.empty:
+            return
+
+        # Row i of the stream (0-based) replaces slot j ~ U[0, i] if j < size.
+        # The first rows fill the reservoir: their slot is their own position.
+        positions = np.arange(self.rows_seen, self.rows_seen + len(chunk))
+        slots = np.where(
+            positions < self.size, positions, self._rng.integers(0, positions + 1)
+        )
+        self.rows_seen += len(chunk)
+
+        accepted = np.flatnonzero(slots < self.size)
+        if not len(accepted):
+            return
+
+        # When several rows of the chunk land on the same slot, the last one wins.
+        accepted_slots, last = np.unique(slots[accepted][::-1], return_index=True)
+        accepted = accepted[::-1][last]
+
+        incoming = chunk.iloc[accepted].set_axis(accepted_slots)
+        if self._sample is None:
+            self._sample = incoming
+        else:
+            kept = self._sample[~self._sample.index.isin(accepted_slots)]
+            self._sample = pd.concat([kept, incoming])
+
+    def get_sample(self) -> pd.DataFrame:
+        """Returns the sampled rows, in slot order."""
+        if self._sample is None:
+            return pd.DataFrame()
+        return self._sample.sort_index().reset_index(drop=True)
+
+
+class StratifiedSampler:
+    """
+    Random sample with one reservoir per value of a column (e.g. a select property).
+
+    Every stratum gets up to size rows, so rare values are represented as
+    well as common ones. Rows where the column is empty form their own stratum.
+    """
+
+    def __init__(self, column: str, size: int, seed: Optional[int] = None):
+        """
+        Initializes an empty sample.
+
+        Args:
+            column (str): Column whose values define the strata.
+            size (int): Number of rows to keep per stratum.
+            seed (Optional[int]): Seed of the random generators, for reproducible samples.
+        """
+        if size < 1:
+            raise ValueError("size must be at least 1")
+
+        self.column = column
+        self.size = size
+        self.rows_seen = 0
+        self._seeds = np.random.SeedSequence(seed)
+        self._reservoirs = {}
+
+    def add(self, chunk: pd.DataFrame):
+        """Offers the rows of a chunk to the sample of their stratum."""
+        if self.column not in chunk.columns:
+            raise ValueError(f"Column {self.column!r} to stratify by is not in the data")
+
+        self.rows_seen += len(chunk)
+        # Grouped by str(value) so list values (multi_select, relation) can define strata too.
+        strata = chunk[self.column].astype(str)
+        for stratum, rows in chunk.groupby(strata, sort=False, dropna=False):
+            stratum = stratum if isinstance(stratum, str) else None
+            if stratum not in self._reservoirs:
+                self._reservoirs[stratum] = ReservoirSampler(self.size, self._seeds.spawn(1)[0])
+            self._reservoirs[stratum].add(rows)
+
+    def get_sample(self) -> pd.DataFrame:
+        """Returns the sampled rows of every stratum."""
+        samples = [reservoir.get_sample() for reservoir in self._reservoirs.values()]
+        if not samples:
+            return pd.DataFrame()
+        return pd.concat(samples, ignore_index=True)
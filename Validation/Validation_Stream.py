@@ -0,0 +1,202 @@
+import logging
+from typing import Iterable, Optional, Union
+import pandas as pd
+from Validation.Validation_Native import NativeValidator
+from Validation.Validation_Sampling import ReservoirSampler, StratifiedSampler
+
+
+class StreamValidator:
+    """
+    Validates a database chunk by chunk while it is being fetched.
+
+    Each chunk (e.g. from NotionAPI.iter_db(..., return_type="dataframe"))
+    is evaluated natively as soon as it arrives and its metrics (counts,
+    min/max, distinct count sketches) are merged into the running total, so
+    only one chunk is held in memory and validation ends when the last cursor
+    page lands. iter_db fetches the next cursor page in the background while a
+    chunk is being evaluated.
+
+    Optionally, chunks feed a random or stratified sample instead, and the
+    final result is computed on that sample.
+
+    With fail_fast, or an error budget, add() asks the caller to stop once
+    every expectation has already failed or once more unexpected values than
+    the budget have been found, so an obviously broken database is not
+    downloaded in full. Only natively evaluated expectations can be tracked
+    while streaming: after an early stop, the ones Great Expectations
+    evaluates are validated on the rows sampled so far, and fail_fast cannot
+    be used with them.
+
+    Usage:
+        stream = StreamValidator(validator, fail_fast=True)
+        for chunk in notion.iter_db(db, return_type="dataframe"):
+            if not stream.add(chunk):
+                break
+        result = stream.get_result()
+    """
+
+    def __init__(
+        self,
+        validator: NativeValidator,
+        sampler: Optional[Union[ReservoirSampler, StratifiedSampler]] = None,
+        fail_fast: bool = False,
+        error_budget: Optional[int] = None,
+    ):
+        """
+        Initializes the stream.
+
+        Args:
+            validator (NativeValidator): Suite to validate against.
+            sampler (Optional[Union[ReservoirSampler, StratifiedSampler]]): If given, the
+                final result is computed on the sampled rows instead of on every row.
+            fail_fast (bool): Stop as soon as every expectation has failed.
+            error_budget (Optional[int]): Stop once more unexpected values (of the natively
+                                          evaluated expectations) than this were found.
+        """
+        if validator.fallback and sampler is None:
+            raise ValueError(
+                "Streaming validation without a sample only supports natively evaluated expectations"
+            )
+        if validator.fallback and fail_fast:
+            raise ValueError(
+                "fail_fast only supports natively evaluated expectations, the suite has "
+                f"{len(validator.fallback)} expectations evaluated by Great Expectations"
+            )
+        if error_budget is not None and error_budget < 0:
+            raise ValueError("error_budget must be at least 0")
+
+        self.logger = logging.getLogger("notion")
+        self.validator = validator
+        self.sampler = sampler
+        self.fail_fast = fail_fast
+        self.error_budget = error_budget
+        self.rows = 0
+        self.chunks = 0
+        self.stop_reason = None
+        self._metrics = None
+
+    def add(self, chunk: pd.DataFrame) -> bool:
+        """
+        Validates (or samples) one chunk.
+
+        Args:
+            chunk (pd.DataFrame): Next rows of the database.
+
+        Returns:
+            bool: False once the caller can stop fetching.
+        """
+        self.rows += len(chunk)
+        self.chunks += 1
+        if self.sampler is not None:
+            self.sampler.add(chunk)
+        # Metrics are only needed to answer from every row, or to decide to stop.
+        if self.sampler is None or self.fail_fast or self.error_budget is not None:
+            chunk_metrics = self.validator.compute_metrics(chunk)
+            if self._metrics is None:
+                self._metrics = chunk_metrics
+            else:
+                self._metrics = self.validator.merge_metrics(self._metrics, chunk_metrics)
+
+        self.stop_reason = self._get_stop_reason()
+        if self.stop_reason:
+            self.logger.info(f"Stopping validation after {self.rows} rows: {self.stop_reason}")
+            return False
+        return True
+
+    def get_result(self, run_name: Optional[str] = None) -> dict:
+        """
+        Returns the validation result of the rows seen so far.
+
+        Args:
+            run_name (Optional[str]): Run name stored in the result's meta.
+
+        Returns:
+            dict: Validation result, in Great Expectations' JSON format, with a
+                  "streaming" entry in meta describing what was validated.
+        """
+        sampled_rows = None
+        if self.sampler is not None and self.stop_reason is None:
+            sample = self.sampler.get_sample()
+            result = self.validator.validate(sample, run_name=run_name)
+            validated_rows = len(sample)
+        else:
+            metrics = self._metrics or {
+                index: self.validator.get_empty_metrics(index) for index in self.validator.native
+            }
+            results = {
+                index: self.validator.build_expectation_result(index, metrics[index]) for index in self.validator.native
+            }
+            if self.validator.fallback:
+                # Stopped early with a sampler: the other expectations get the rows sampled so far.
+                sample = self.sampler.get_sample()
+                results.update(self.validator.validate_fallback(sample))
+                sampled_rows = len(sample)
+            result = self.validator.build_suite_result([results[index] for index in sorted(results)], run_name)
+            validated_rows = self.rows
+
+        if self.stop_reason == "error budget exceeded":
+            result["success"] = False
+        result["meta"]["streaming"] = {
+            "rows_fetched": self.rows,
+            "rows_validated": validated_rows,
+            "chunks": self.chunks,
+            "sampled": self.sampler is not None and self.stop_reason is None,
+            "stopped_early": self.stop_reason is not None,
+            "stop_reason": self.stop_reason,
+            "fallback_rows_validated": sampled_rows,
+        }
+        return result
+
+    def _get_stop_reason(self) -> Optional[str]:
+        """Returns why fetching can stop, None if it should go on."""
+        if self._metrics is None:
+            return None
+
+        if self.error_budget is not None:
+            unexpected = sum(metrics.get("unexpected_count", 0) for metrics in self._metrics.values())
+            if unexpected > self.error_budget:
+                return "error budget exceeded"
+
+        if self.fail_fast and self._metrics and all(
+            self._has_failed(index, metrics) for index, metrics in self._metrics.items()
+        ):
+            return "every expectation failed"
+        return None
+
+    def _has_failed(self, index: int, metrics: dict) -> bool:
+        """Returns whether an expectation fails whatever the remaining rows hold."""
+        if "exception" in metrics:
+            return True
+        if "observed" in metrics:
+            # Aggregates (min, max, distinct count) may still move back into range.
+            return False
+        # With "mostly" below 1, the remaining rows could still make it succeed.
+        mostly = self.validator.expectations[index]["kwargs"].get("mostly", 1.0)
+        return mostly >= 1.0 and metrics["unexpected_count"] > 0
+
+
+def validate_stream(stream: StreamValidator, chunks: Iterable[pd.DataFrame], run_name: Optional[str] = None) -> dict:
+    """
+    Feeds chunks to a StreamValidator until they run out or it asks to stop.
+
+    Stopping closes the chunks' iterator, which for NotionAPI.iter_db stops
+    fetching further cursor pages.
+
+    Args:
+        stream (StreamValidator): Stream to feed.
+        chunks (Iterable[pd.DataFrame]): DataFrame chunks of the database.
+        run_name (Optional[str]): Run name stored in the result's meta.
+
+    Returns:
+        dict: Validation result, see StreamValidator.get_result.
+    """
+    chunks = iter(chunks)
+    try:
+        for chunk in chunks:
+            if not stream.add(chunk):
+                break
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+    return stream.get_result(run_name)
@@ -0,0 +1,10 @@
+import os
+import sys
+
+REPOSITORY_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The packages are imported from the repository root (Notion.Notion_API) and
+# the runner scripts from their directory (run_manifest), like they run.
+for path in (REPOSITORY_ROOT, os.path.join(REPOSITORY_ROOT, "Data Validation")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
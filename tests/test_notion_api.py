@@ -0,0 +1,110 @@
+import asyncio
+import logging
+import pytest
+from Benchmarks.notion_server import NotionStandIn
+from Notion.Notion_API import NotionAPI
+from Notion.Notion_Async_API import AsyncNotionAPI
+from Notion.Notion_Rate_Limit import RequestScheduler
+
+KEYS = ["secret_" + str(index) * 43 for index in range(1, 4)]
+
+
+@pytest.fixture
+def server():
+    # Database 0 is shared with the first two keys, database 1 only with the third.
+    with NotionStandIn.synthetic(rows=500, columns=5, databases=2, key_access={}) as server:
+        server.key_access = {
+            KEYS[0]: {server.db_ids[0]},
+            KEYS[1]: {server.db_ids[0]},
+            KEYS[2]: {server.db_ids[1]},
+        }
+        yield server
+
+
+def make_scheduler() -> RequestScheduler:
+    return RequestScheduler(rate=1000, burst=1000)
+
+
+def make_client(server, keys=KEYS) -> NotionAPI:
+    return NotionAPI(keys, base_url=server.base_url, scheduler=make_scheduler())
+
+
+def test_queries_are_spread_across_the_keys_with_access(server):
+    with make_client(server) as notion:
+        df = notion.query_db(server.db_ids[0])
+
+    assert len(df) == 500
+    # One GET /users per key, then the probe of every key, then the 5 cursor pages.
+    queries = {key: server.requests_per_key[key] - 2 for key in KEYS}
+    assert queries[KEYS[2]] == 0
+    assert queries[KEYS[0]] + queries[KEYS[1]] == 5
+    assert queries[KEYS[0]] >= 2 and queries[KEYS[1]] >= 2
+
+
+def test_comma_separated_keys_are_a_pool(server):
+    with make_client(server, ",".join(KEYS)) as notion:
+        assert notion.NOTION_API_KEYS == KEYS
+        notion.query_db(server.db_ids[1])
+
+    assert server.requests_per_key[KEYS[2]] == 7
+
+
+def test_key_probe_does_not_report_databases_it_cannot_access(server, caplog):
+    errors = []
+    with make_client(server) as notion:
+        notion.add_hook("error", lambda **details: errors.append(details))
+        with caplog.at_level(logging.DEBUG, logger="notion"):
+            assert notion.get_db_title(server.db_ids[1]) == "Synthetic database 1"
+
+    assert errors == []
+    assert not [record for record in caplog.records if record.levelno >= logging.WARNING]
+
+
+def test_key_probe_fails_when_no_key_has_access(server):
+    server.key_access[KEYS[0]] = set()
+    server.key_access[KEYS[1]] = set()
+    server.key_access[KEYS[2]] = set()
+    with make_client(server) as notion:
+        with pytest.raises(ValueError, match="None of the 3 API keys"):
+            notion.get_db(server.db_ids[0])
+
+
+def test_async_client_spreads_queries_across_the_keys_with_access(server):
+    errors = []
+
+    async def run():
+        async with AsyncNotionAPI(",".join(KEYS), base_url=server.base_url, scheduler=make_scheduler()) as notion:
+            notion.add_hook("error", lambda **details: errors.append(details))
+            return await notion.query_dbs(server.db_ids, max_concurrency=2)
+
+    dfs = asyncio.run(run())
+
+    assert [len(df) for df in dfs.values()] == [500, 500]
+    assert errors == []
+    # One GET /users and one probe per key and database, then the 5 cursor pages of each database.
+    queries = {key: server.requests_per_key[key] - 3 for key in KEYS}
+    assert queries[KEYS[2]] == 5
+    assert queries[KEYS[0]] + queries[KEYS[1]] == 5
+    assert queries[KEYS[0]] >= 2 and queries[KEYS[1]] >= 2
+
+
+@pytest.mark.parametrize(
+    "db",
+    [
+        "0123456789abcdef0123456789abcdef",
+        "01234567-89ab-cdef-0123-456789abcdef",
+        "https://www.notion.so/0123456789abcdef0123456789abcdef?v=fedcba9876543210fedcba9876543210",
+        "https://www.notion.so/workspace/Tasks-0123456789abcdef0123456789abcdef",
+        "https://www.notion.so/01234567-89ab-cdef-0123-456789abcdef",
+    ],
+)
+def test_parse_db_accepts_ids_and_links(server, db):
+    with make_client(server) as notion:
+        assert notion._parse_db(db).replace("-", "") == "0123456789abcdef0123456789abcdef"
+
+
+@pytest.mark.parametrize("db", ["", "my database", "0123456789abcdef", "0123456789abcdef0123456789abcdeg"])
+def test_parse_db_rejects_invalid_ids(server, db):
+    with make_client(server) as notion:
+        with pytest.raises(ValueError, match="Invalid database id"):
+            notion._parse_db(db)
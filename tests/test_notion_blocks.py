@@ -0,0 +1,94 @@
+import pytest
+from Benchmarks.notion_server import NotionStandIn
+from Notion.Notion_API import NotionAPI
+from Notion.Notion_Blocks import BLOCK_COLUMNS, BlockTreeFetcher
+from Notion.Notion_Rate_Limit import RequestScheduler
+
+API_KEY = "secret_" + "0" * 43
+
+
+@pytest.fixture
+def server():
+    with NotionStandIn.synthetic(rows=6, columns=3, block_fanout=4, block_depth=2, seed=1) as server:
+        yield server
+
+
+@pytest.fixture
+def notion(server):
+    with NotionAPI(API_KEY, base_url=server.base_url, scheduler=RequestScheduler(rate=1000, burst=1000)) as notion:
+        yield notion
+
+
+@pytest.fixture
+def pages(server) -> list[dict]:
+    return server.databases[server.db_ids[0]][1]
+
+
+def walk(server, page_id: str, parent_id: str = None, depth: int = 0) -> list[tuple]:
+    """Returns the (block id, parent id, depth) of a page's blocks in document order, depth first."""
+    rows = []
+    for block in server.blocks.get((parent_id or page_id).replace("-", ""), []):
+        rows.append((block["id"], parent_id or page_id, depth))
+        rows += walk(server, page_id, block["id"], depth + 1)
+    return rows
+
+
+def test_blocks_are_flattened_in_document_order(server, notion, pages):
+    blocks = BlockTreeFetcher(notion).fetch(reversed(pages))
+
+    assert list(blocks.columns) == BLOCK_COLUMNS
+    assert list(blocks["page_id"].drop_duplicates()) == [page["id"] for page in reversed(pages)]
+    for page in pages:
+        page_blocks = blocks[blocks["page_id"] == page["id"]]
+        expected = walk(server, page["id"])
+        assert list(zip(page_blocks["block_id"], page_blocks["parent_id"], page_blocks["depth"])) == expected
+    assert blocks["depth"].max() == 2
+    # The first block of every page is a heading.
+    assert (blocks.groupby("page_id")["type"].first() == "heading_2").all()
+
+
+def test_max_depth_limits_the_levels_fetched(server, notion, pages):
+    blocks = BlockTreeFetcher(notion).fetch(pages[:2], max_depth=0)
+
+    assert list(blocks["depth"].unique()) == [0]
+    assert len(blocks) == 8
+    assert server.requests == 3  # GET /users, then one listing per page
+
+
+def test_unchanged_pages_are_served_from_the_cache(server, notion, pages):
+    fetcher = BlockTreeFetcher(notion)
+    first = fetcher.fetch(pages)
+    requests = server.requests
+
+    assert fetcher.fetch(pages).equals(first)
+    assert server.requests == requests
+    # Partial trees of cached pages are cut from the complete ones.
+    assert fetcher.fetch(pages, max_depth=0).equals(first[first["depth"] == 0].reset_index(drop=True))
+    assert server.requests == requests
+
+    server.touch_page(server.db_ids[0], 2, "2030-01-01T00:00:00.000Z")
+    fetcher.fetch(pages)
+    # Only the edited page is listed again: its own blocks, then the children of each toggle.
+    edited = first[first["page_id"] == pages[2]["id"]]
+    assert server.requests - requests == 1 + edited["has_children"].sum()
+
+
+def test_page_ids_are_checked_with_get_page(server, notion, pages):
+    fetcher = BlockTreeFetcher(notion)
+    fetcher.fetch(pages)
+    requests = server.requests
+
+    blocks = fetcher.fetch([page["id"] for page in pages])
+
+    assert server.requests - requests == len(pages)
+    assert set(blocks["page_id"]) == {page["id"] for page in pages}
+
+
+def test_partial_trees_are_not_cached(server, notion, pages):
+    fetcher = BlockTreeFetcher(notion)
+    fetcher.fetch(pages[:1], max_depth=1)
+    requests = server.requests
+
+    fetcher.fetch(pages[:1])
+
+    assert server.requests > requests
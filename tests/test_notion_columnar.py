@@ -0,0 +1,100 @@
+import json
+import random
+import numpy as np
+import pandas as pd
+from Benchmarks.synthetic_notion import make_database, make_page, make_pages, make_schema
+from Notion.Notion_Columnar import ColumnarConverter, decode_and_convert
+
+SCHEMA = make_schema(13)
+
+
+def make_property(property_type: str, value) -> dict:
+    return {"id": "x", "type": property_type, property_type: value}
+
+
+def test_columns_are_typed():
+    pages = make_pages(200, SCHEMA, seed=1)
+
+    df = ColumnarConverter.from_db(make_database("db", SCHEMA)).convert(pages)
+
+    assert list(df.columns) == list(SCHEMA)
+    dtypes = {SCHEMA[name]: dtype for name, dtype in df.dtypes.items()}
+    assert dtypes["number"] == np.float64
+    assert dtypes["checkbox"] == np.bool_
+    assert isinstance(dtypes["select"], pd.CategoricalDtype)
+    assert isinstance(dtypes["date"], pd.DatetimeTZDtype) and str(dtypes["date"].tz) == "UTC"
+    for property_type in ("title", "rich_text", "relation", "multi_select", "url", "email", "files", "rollup"):
+        assert dtypes[property_type] == object
+
+
+def test_values_and_empty_cells():
+    pages = [
+        {"properties": {
+            "Name": make_property("title", [{"plain_text": "a"}, {"plain_text": "ignored"}]),
+            "Count": make_property("number", 3),
+            "Done": make_property("checkbox", True),
+            "Country": make_property("select", {"name": "Spain"}),
+            "Languages": make_property("multi_select", [{"name": "English"}, {"name": "Spanish"}]),
+            "Related": make_property("relation", [{"id": "page-1"}]),
+            "When": make_property("date", {"start": "2024-03-01T10:00:00.000+02:00", "end": None}),
+            "Total": make_property("rollup", {"type": "number", "number": 7}),
+        }},
+        {"properties": {
+            "Name": make_property("title", []),
+            "Count": make_property("number", None),
+            "Done": make_property("checkbox", False),
+            "Country": make_property("select", None),
+            "Languages": make_property("multi_select", []),
+            "Related": make_property("relation", []),
+            "When": make_property("date", None),
+            "Total": make_property("rollup", None),
+        }},
+    ]
+    converter = ColumnarConverter.from_pages(pages)
+
+    df = converter.convert(pages)
+
+    assert df["Name"].tolist() == ["a", None]
+    assert df["Count"].iloc[0] == 3.0 and np.isnan(df["Count"].iloc[1])
+    assert df["Done"].tolist() == [True, False]
+    assert df["Country"].iloc[0] == "Spain" and pd.isna(df["Country"].iloc[1])
+    assert df["Languages"].tolist() == [["English", "Spanish"], None]
+    assert df["Related"].tolist() == [["page-1"], None]
+    assert df["When"].iloc[0] == pd.Timestamp("2024-03-01T08:00:00", tz="UTC")
+    assert pd.isna(df["When"].iloc[1])
+    assert df["Total"].tolist() == [7, None]
+
+
+def test_pages_missing_a_property_get_an_empty_cell():
+    pages = [
+        {"properties": {"Count": make_property("number", 1), "Name": make_property("title", [{"plain_text": "a"}])}},
+        {"properties": {"Name": make_property("title", [{"plain_text": "b"}])}},
+    ]
+
+    df = ColumnarConverter({"Name": "title", "Count": "number", "Unknown": "formula"}).convert(pages)
+
+    assert df["Name"].tolist() == ["a", "b"]
+    assert df["Count"].iloc[0] == 1.0 and np.isnan(df["Count"].iloc[1])
+    assert df["Unknown"].tolist() == [None, None]
+
+
+def test_select_only_decodes_the_selected_columns():
+    pages = make_pages(50, SCHEMA, seed=2)
+    converter = ColumnarConverter.from_pages(pages)
+
+    projected = converter.select(["number 10", "Name", "missing"]).convert(pages)
+
+    assert list(projected.columns) == ["number 10", "Name"]
+    pd.testing.assert_frame_equal(projected, converter.convert(pages)[["number 10", "Name"]])
+
+
+def test_decode_and_convert_matches_convert():
+    pages = [make_page(index, SCHEMA, random.Random(index)) for index in range(30)]
+    content = json.dumps({"results": pages, "has_more": False}).encode()
+
+    pd.testing.assert_frame_equal(decode_and_convert(content), ColumnarConverter.from_pages(pages).convert(pages))
+    pd.testing.assert_frame_equal(
+        decode_and_convert(content, {"Name": "title"}, json_backend="json"),
+        ColumnarConverter({"Name": "title"}).convert(pages),
+    )
+    assert decode_and_convert(json.dumps({"results": []}).encode()).empty
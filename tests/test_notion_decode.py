@@ -0,0 +1,63 @@
+import json
+import pandas as pd
+import pytest
+from Benchmarks.notion_server import NotionStandIn
+from Notion.Notion_API import NotionAPI
+from Notion.Notion_JSON import JSON_BACKENDS, get_available_backends, get_json_backend
+from Notion.Notion_Rate_Limit import RequestScheduler
+
+API_KEY = "secret_" + "0" * 43
+
+
+@pytest.fixture(scope="module")
+def server():
+    with NotionStandIn.synthetic(rows=450, columns=13) as server:
+        yield server
+
+
+def make_client(server, **kwargs) -> NotionAPI:
+    return NotionAPI(API_KEY, base_url=server.base_url, scheduler=RequestScheduler(rate=1000, burst=1000), **kwargs)
+
+
+@pytest.fixture(scope="module")
+def expected(server) -> pd.DataFrame:
+    with make_client(server, json_backend="json") as notion:
+        return notion.query_db(server.db_ids[0])
+
+
+def test_default_backend_is_the_first_one_installed():
+    available = get_available_backends()
+
+    assert available[-1] == "json"
+    assert get_json_backend().name == available[0]
+    assert [name for name in JSON_BACKENDS if name in available] == available
+
+
+def test_unknown_backends_are_rejected():
+    with pytest.raises(ValueError, match="Unknown JSON backend"):
+        get_json_backend("ujson")
+
+
+@pytest.mark.parametrize("name", get_available_backends())
+def test_backends_decode_the_same_objects(server, name):
+    content = json.dumps(server.databases[server.db_ids[0]][1][:20]).encode()
+
+    assert get_json_backend(name).loads(content) == json.loads(content)
+
+
+@pytest.mark.parametrize("name", get_available_backends())
+def test_decode_workers_return_the_same_dataframe(server, expected, name):
+    with make_client(server, decode_workers=2, json_backend=name) as notion:
+        df = notion.query_db(server.db_ids[0])
+
+    pd.testing.assert_frame_equal(df, expected)
+
+
+def test_decode_workers_stream_the_same_chunks(server, expected):
+    with make_client(server, decode_workers=2) as notion:
+        chunks = list(notion.iter_db(server.db_ids[0], return_type="dataframe", chunk_size=200))
+        projected = notion.query_db(server.db_ids[0], columns=["Name", "number 10"])
+
+    assert [len(chunk) for chunk in chunks] == [200, 200, 50]
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), expected)
+    pd.testing.assert_frame_equal(projected, expected[["Name", "number 10"]])
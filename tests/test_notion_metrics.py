@@ -0,0 +1,60 @@
+import os
+import threading
+import pytest
+from Notion.Notion_Metrics import Metrics
+
+
+def test_stage_stops_timing_and_profiling_when_it_raises(tmp_path):
+    metrics = Metrics(profile_dir=str(tmp_path))
+
+    with pytest.raises(ConnectionError):
+        with metrics.stage("fetch"):
+            raise ConnectionError("Notion is down")
+
+    assert metrics.stages["fetch"]["calls"] == 1
+    assert metrics._started == {}
+    assert metrics._profiler is None
+    assert os.path.exists(tmp_path / "fetch.prof")
+
+    # The next stage gets its own profile.
+    with metrics.stage("validation"):
+        pass
+    assert os.path.exists(tmp_path / "validation.prof")
+
+
+def test_nested_stages_are_part_of_the_outer_profile(tmp_path):
+    metrics = Metrics(profile_dir=str(tmp_path))
+
+    with metrics.stage("fetch"):
+        with metrics.stage("decode"):
+            pass
+
+    assert sorted(metrics.stages) == ["decode", "fetch"]
+    assert os.listdir(tmp_path) == ["fetch.prof"]
+
+
+def test_concurrent_stages_only_profile_the_first_one(tmp_path):
+    metrics = Metrics(profile_dir=str(tmp_path))
+    fetching = threading.Event()
+    validated = threading.Event()
+
+    def fetch():
+        with metrics.stage("fetch"):
+            fetching.set()
+            validated.wait(5)
+
+    thread = threading.Thread(target=fetch)
+    thread.start()
+    fetching.wait(5)
+    # Another thread's stage neither replaces nor stops the fetch profiler.
+    with metrics.stage("validation"):
+        pass
+    with metrics.stage("fetch"):
+        pass
+    assert metrics._profiler is not None and metrics._profiler[1] == thread.ident
+    validated.set()
+    thread.join()
+
+    assert metrics._profiler is None
+    assert metrics.stages["fetch"]["calls"] == 2
+    assert os.listdir(tmp_path) == ["fetch.prof"]
@@ -0,0 +1,60 @@
+import pytest
+from Benchmarks.synthetic_notion import make_pages, make_schema
+from Notion.Notion_Page import _NOT_DECODED, NotionPage, NotionPageProperty
+
+
+@pytest.fixture
+def page() -> dict:
+    return make_pages(1, make_schema(13), seed=3)[0]
+
+
+def test_properties_are_built_on_first_access(page):
+    notion_page = NotionPage(page)
+
+    assert notion_page._properties is None
+    assert notion_page.id == page["id"]
+    assert notion_page.last_edited_time == page["last_edited_time"]
+    assert notion_page._properties is None
+
+    properties = notion_page.properties
+    assert list(properties) == list(page["properties"])
+    assert notion_page.properties is properties
+
+
+def test_values_are_decoded_once(page):
+    page_property = NotionPage(page).properties["multi_select 2"]
+
+    assert page_property._decoded_value is _NOT_DECODED
+    value = page_property.get_value()
+    # Later changes to the wrapped dictionary do not show up in the cached value.
+    page["properties"]["multi_select 2"]["multi_select"] = [{"name": "Klingon"}]
+    assert page_property.get_value() is value
+
+
+@pytest.mark.parametrize(
+    "page_property, value",
+    [
+        ({"id": "a", "type": "title", "title": [{"plain_text": "Task"}]}, "Task"),
+        ({"id": "a", "type": "title", "title": []}, None),
+        ({"id": "a", "type": "relation", "relation": [{"id": "1"}, {"id": "2"}]}, ["1", "2"]),
+        ({"id": "a", "type": "multi_select", "multi_select": [{"name": "English"}]}, ["English"]),
+        ({"id": "a", "type": "select", "select": {"name": "Spain"}}, "Spain"),
+        ({"id": "a", "type": "select", "select": None}, None),
+        ({"id": "a", "type": "rollup", "rollup": {"type": "number", "number": 7}}, 7),
+        ({"id": "a", "type": "number", "number": 0}, 0),
+        ({"id": "a", "type": "checkbox", "checkbox": False}, False),
+        ({"id": "a", "type": "files", "files": [{"name": "cv.pdf"}]}, "cv.pdf"),
+        ({"id": "a", "type": "formula", "formula": {"type": "string", "string": "x"}}, None),
+    ],
+)
+def test_get_value(page_property, value):
+    assert NotionPageProperty(page_property).get_value() == value
+
+
+def test_wrappers_have_no_instance_dict(page):
+    notion_page = NotionPage(page)
+
+    with pytest.raises(AttributeError):
+        notion_page.title = "Task"
+    with pytest.raises(AttributeError):
+        notion_page.properties["Name"].cached = True
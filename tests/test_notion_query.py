@@ -0,0 +1,148 @@
+import json
+import pytest
+from Benchmarks.notion_server import NotionStandIn
+from Notion.Notion_API import NotionAPI
+from Notion.Notion_Query import NotionQuery
+from Notion.Notion_Rate_Limit import RequestScheduler
+
+API_KEY = "secret_" + "0" * 43
+
+
+@pytest.fixture
+def server():
+    with NotionStandIn.synthetic(rows=300, columns=20) as server:
+        yield server
+
+
+@pytest.fixture
+def notion(server):
+    with NotionAPI(API_KEY, base_url=server.base_url, scheduler=RequestScheduler(rate=1000, burst=1000)) as notion:
+        yield notion
+
+
+def test_to_body_combines_filters_with_and():
+    query = (
+        NotionQuery(page_size=50)
+        .where("Name", "title", "is_not_empty")
+        .where("Calories", "number", "greater_than", 100)
+        .where_timestamp("last_edited_time", "on_or_after", "2024-01-01T00:00:00.000Z")
+    )
+
+    assert query.to_body() == {
+        "page_size": 50,
+        "filter": {
+            "and": [
+                {"property": "Name", "title": {"is_not_empty": True}},
+                {"property": "Calories", "number": {"greater_than": 100}},
+                {"timestamp": "last_edited_time", "last_edited_time": {"on_or_after": "2024-01-01T00:00:00.000Z"}},
+            ]
+        },
+    }
+
+
+def test_to_body_keeps_an_or_filter_intact():
+    query = NotionQuery(filter={"or": [{"property": "A", "checkbox": {"equals": True}}]})
+    query.where("B", "checkbox", "equals", False)
+
+    assert query.to_body()["filter"] == {
+        "and": [
+            {"or": [{"property": "A", "checkbox": {"equals": True}}]},
+            {"property": "B", "checkbox": {"equals": False}},
+        ]
+    }
+
+
+def test_to_body_sends_sorts_and_cursor_but_not_filter_properties():
+    query = NotionQuery().sort_by("Name").sort_by(timestamp="created_time", direction="descending").select("title")
+
+    assert query.to_body("cursor-1") == {
+        "page_size": 100,
+        "sorts": [
+            {"property": "Name", "direction": "ascending"},
+            {"timestamp": "created_time", "direction": "descending"},
+        ],
+        "start_cursor": "cursor-1",
+    }
+    assert query.to_params() == [("filter_properties", "title")]
+
+
+def test_parse_round_trips_a_body():
+    body = {
+        "filter": {"property": "Name", "title": {"contains": "a"}},
+        "sorts": [{"property": "Name", "direction": "ascending"}],
+        "filter_properties": ["title", "%3AUPp"],
+        "page_size": 10,
+    }
+
+    query = NotionQuery.parse(json.dumps(body))
+
+    assert query.to_body() == {key: body[key] for key in ("filter", "sorts", "page_size")}
+    assert query.filter_properties == ["title", "%3AUPp"]
+    assert NotionQuery.parse(body).to_json() == query.to_json()
+    assert NotionQuery.parse("").to_body() == {"page_size": 100}
+    with pytest.raises(ValueError, match="Unsupported query fields"):
+        NotionQuery.parse({"start_cursor": "x"})
+
+
+def test_copy_is_independent():
+    query = NotionQuery().where("Name", "title", "is_not_empty")
+    copy = query.copy().where("Done", "checkbox", "equals", True).select("title")
+
+    assert query.to_body()["filter"] == {"property": "Name", "title": {"is_not_empty": True}}
+    assert query.filter_properties == []
+    assert list(copy.to_body()["filter"]) == ["and"]
+
+
+def test_filters_and_sorts_are_sent_on_every_page(server, notion):
+    db = server.db_ids[0]
+    _, pages, _ = server.databases[db]
+    since = sorted(page["last_edited_time"] for page in pages)[100]
+    query = (
+        NotionQuery(page_size=30)
+        .where_timestamp("last_edited_time", "on_or_after", since)
+        .sort_by(timestamp="last_edited_time", direction="descending")
+    )
+
+    requests = server.requests
+    results = notion.query_db(db, query, return_type="json")
+
+    expected = sorted(
+        (page for page in pages if page["last_edited_time"] >= since),
+        key=lambda page: page["last_edited_time"],
+        reverse=True,
+    )
+    assert [page["id"] for page in results] == [page["id"] for page in expected]
+    assert server.requests - requests == -(-len(expected) // 30)
+
+
+def get_query_bytes(server, fetch) -> int:
+    sent = server.bytes_sent
+    fetch()
+    return server.bytes_sent - sent
+
+
+def test_projected_query_transfers_only_the_selected_columns(server, notion):
+    db = server.db_ids[0]
+    columns = ["Name", "number 10"]
+
+    full = notion.query_db(db)
+    full_bytes = get_query_bytes(server, lambda: notion.query_db(db))
+    projected = notion.query_db(db, columns=columns)
+    projected_bytes = get_query_bytes(server, lambda: notion.query_db(db, columns=columns))
+
+    assert list(projected.columns) == columns
+    assert projected.equals(full[columns])
+    # 2 of 20 properties; the page metadata and the schema lookup (get_db) are still transferred.
+    assert projected_bytes < full_bytes / 4
+
+
+def test_last_edited_probe_transfers_a_single_projected_page(server, notion):
+    db = server.db_ids[0]
+    _, pages, _ = server.databases[db]
+    server.touch_page(db, 42, "2030-01-01T00:00:00.000Z")
+
+    probe_bytes = get_query_bytes(server, lambda: notion.get_last_edited(db))
+
+    assert notion.get_last_edited(db) == ("2030-01-01T00:00:00.000Z", pages[42]["id"])
+    full_bytes = get_query_bytes(server, lambda: notion.query_db(db, return_type="json"))
+    assert probe_bytes < full_bytes / len(pages)
@@ -0,0 +1,111 @@
+import time
+import pytest
+from Benchmarks.notion_server import NotionStandIn
+from Notion.Notion_API import NotionAPI
+from Notion.Notion_Rate_Limit import RequestScheduler, TokenBucket
+
+API_KEY = "secret_" + "0" * 43
+
+
+def test_bucket_allows_a_burst_then_spaces_requests_out():
+    bucket = TokenBucket(rate=10, capacity=3)
+
+    waits = [bucket.reserve() for _ in range(6)]
+
+    assert waits[:3] == [0.0, 0.0, 0.0]
+    for index, expected in enumerate([0.1, 0.2, 0.3], start=3):
+        assert waits[index] == pytest.approx(expected, abs=0.01)
+
+
+def test_bucket_refills_over_time():
+    bucket = TokenBucket(rate=100, capacity=1)
+    bucket.reserve()
+
+    assert bucket.get_delay() == pytest.approx(0.01, abs=0.005)
+    time.sleep(0.02)
+    assert bucket.get_delay() == 0.0
+    assert bucket.reserve() == 0.0
+
+
+def test_get_delay_does_not_take_a_token():
+    bucket = TokenBucket(rate=1, capacity=1)
+
+    assert bucket.get_delay() == 0.0
+    assert bucket.get_delay() == 0.0
+    assert bucket.reserve() == 0.0
+    assert bucket.get_delay() == pytest.approx(1.0, abs=0.01)
+
+
+def test_pause_delays_every_caller():
+    bucket = TokenBucket(rate=1000, capacity=10)
+    bucket.pause(0.5)
+
+    assert bucket.reserve() == pytest.approx(0.5, abs=0.01)
+    assert bucket.get_delay() == pytest.approx(0.5, abs=0.01)
+    # A shorter pause does not shorten a longer one.
+    bucket.pause(0.1)
+    assert bucket.reserve() == pytest.approx(0.5, abs=0.01)
+
+
+def test_acquire_waits_for_a_token():
+    bucket = TokenBucket(rate=20, capacity=1)
+
+    started = time.perf_counter()
+    for _ in range(3):
+        bucket.acquire()
+
+    # The first token is there, the next two come 0.05s apart.
+    assert 0.09 <= time.perf_counter() - started < 0.5
+
+
+def test_scheduler_shares_one_bucket_per_key():
+    scheduler = RequestScheduler()
+
+    assert scheduler.get_bucket("secret_a") is scheduler.get_bucket("secret_a")
+    assert scheduler.get_bucket("secret_a") is not scheduler.get_bucket("secret_b")
+
+
+def test_rate_limited_responses_honor_retry_after():
+    scheduler = RequestScheduler(max_retries=3)
+
+    assert scheduler.get_retry_delay(0, 429, "2") == 2.0
+    assert scheduler.get_retry_delay(2, 429, "0.5") == 0.5
+    assert scheduler.get_retry_delay(3, 429, "0.5") is None
+
+
+def test_server_errors_back_off_exponentially_with_jitter():
+    scheduler = RequestScheduler(max_retries=10, backoff_base=0.5, backoff_max=4.0)
+
+    for attempt, ceiling in enumerate([0.5, 1.0, 2.0, 4.0, 4.0, 4.0]):
+        delays = [scheduler.get_retry_delay(attempt, 503) for _ in range(200)]
+        assert all(0 <= delay <= ceiling for delay in delays)
+        assert max(delays) > ceiling / 2
+
+    # Connection errors, and 429s without a usable Retry-After, back off the same way.
+    assert 0 <= scheduler.get_retry_delay(1, None) <= 1.0
+    assert 0 <= scheduler.get_retry_delay(1, 429, "soon") <= 1.0
+
+
+def test_client_errors_are_not_retried():
+    scheduler = RequestScheduler()
+
+    for status_code in (400, 401, 403, 404):
+        assert scheduler.get_retry_delay(0, status_code) is None
+
+
+def test_client_retries_rate_limited_requests():
+    with NotionStandIn.synthetic(rows=500, columns=5, rate_limit_every=3, retry_after=0.1) as server:
+        scheduler = RequestScheduler(rate=1000, burst=1000)
+        retries = []
+        started = time.perf_counter()
+        with NotionAPI(API_KEY, base_url=server.base_url, scheduler=scheduler) as notion:
+            notion.add_hook("retry", lambda **details: retries.append(details))
+            df = notion.query_db(server.db_ids[0])
+        elapsed = time.perf_counter() - started
+
+    assert len(df) == 500
+    assert server.rate_limited > 0
+    assert len(retries) == server.rate_limited
+    assert all(retry["status_code"] == 429 and retry["delay"] == 0.1 for retry in retries)
+    # Each 429 paused the key's bucket for Retry-After seconds.
+    assert elapsed >= 0.1 * server.rate_limited
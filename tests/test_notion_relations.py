@@ -0,0 +1,72 @@
+import logging
+import pytest
+from Benchmarks.notion_server import NotionStandIn
+from Notion.Notion_API import NotionAPI
+from Notion.Notion_Rate_Limit import RequestScheduler
+from Notion.Notion_Relations import RelationResolver
+
+API_KEY = "secret_" + "0" * 43
+MISSING_ID = "f" * 32
+
+
+@pytest.fixture
+def server():
+    with NotionStandIn.synthetic(rows=50, columns=5) as server:
+        yield server
+
+
+@pytest.fixture
+def notion(server):
+    with NotionAPI(API_KEY, base_url=server.base_url, scheduler=RequestScheduler(rate=1000, burst=1000)) as notion:
+        yield notion
+
+
+def get_title(page: dict) -> str:
+    return "".join(text["plain_text"] for text in page["properties"]["Name"]["title"])
+
+
+def test_resolve_relations_adds_the_titles_of_the_related_pages(server, notion):
+    df = notion.query_db(server.db_ids[0], resolve_relations=True)
+
+    resolved = 0
+    for ids, titles in zip(df["relation 1"], df["relation 1 (resolved)"]):
+        if not ids:
+            assert titles is None
+            continue
+        for page_id, title in zip(ids, titles):
+            page = server.pages.get(page_id.replace("-", ""))
+            assert title == (get_title(page) if page is not None else None)
+            resolved += page is not None
+    assert resolved > 0
+
+
+def test_resolved_titles_are_cached(server, notion):
+    _, pages, _ = server.databases[server.db_ids[0]]
+    page_ids = [page["id"] for page in pages[:10]]
+    resolver = RelationResolver(notion)
+
+    assert resolver.resolve(page_ids + page_ids) == {page["id"]: get_title(page) for page in pages[:10]}
+    requests = server.requests
+    assert resolver.resolve(page_ids[:5])
+    assert server.requests == requests
+
+    resolver.resolve(page_ids + [pages[10]["id"]])
+    assert server.requests == requests + 1
+
+
+def test_inaccessible_pages_are_unresolved_without_errors(server, notion, caplog):
+    errors = []
+    notion.add_hook("error", lambda **details: errors.append(details))
+    _, pages, _ = server.databases[server.db_ids[0]]
+    resolver = RelationResolver(notion)
+
+    with caplog.at_level(logging.DEBUG, logger="notion"):
+        titles = resolver.resolve([pages[0]["id"], MISSING_ID])
+
+    assert titles == {pages[0]["id"]: get_title(pages[0]), MISSING_ID: None}
+    assert errors == []
+    assert not [record for record in caplog.records if record.levelno >= logging.WARNING]
+    # Unresolved pages are not cached, so they are retried by the next query.
+    requests = server.requests
+    resolver.resolve([MISSING_ID])
+    assert server.requests == requests + 1
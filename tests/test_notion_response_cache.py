@@ -0,0 +1,115 @@
+import itertools
+import json
+import pytest
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+from Benchmarks.notion_server import NotionStandIn
+from Notion.Notion_API import NotionAPI
+from Notion.Notion_Rate_Limit import RequestScheduler
+from Notion.Notion_Response_Cache import ResponseCache
+
+API_KEY = "secret_" + "0" * 43
+HEADERS = {"Notion-Version": "2022-06-28", "Authorization": f"Bearer {API_KEY}"}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Makes every time.time() call of the cache one second later than the previous one."""
+    ticks = itertools.count(1000)
+    monkeypatch.setattr("Notion.Notion_Response_Cache.time.time", lambda: float(next(ticks)))
+
+
+@pytest.fixture
+def cache():
+    with ResponseCache(":memory:", ttl=60) as cache:
+        yield cache
+
+
+def make_response(url: str, content: bytes, status_code: int = 200, etag: str = None) -> Response:
+    response = Response()
+    response.status_code = status_code
+    response.url = url
+    response.headers = CaseInsensitiveDict({"Content-Type": "application/json", **({"ETag": etag} if etag else {})})
+    response._content = content
+    return response
+
+
+def test_keys_depend_on_the_integration(cache):
+    other_headers = {**HEADERS, "Authorization": "Bearer secret_other"}
+
+    assert cache.get_key("https://api.notion.com/v1/pages/1", HEADERS) == cache.get_key(
+        "https://api.notion.com/v1/pages/1", dict(HEADERS)
+    )
+    assert cache.get_key("https://api.notion.com/v1/pages/1", HEADERS) != cache.get_key(
+        "https://api.notion.com/v1/pages/1", other_headers
+    )
+
+
+def test_stale_entries_return_their_etag(cache, clock):
+    cache.set("page", make_response("https://api.notion.com/v1/pages/1", b'{"id": "1"}', etag='"v1"'))
+
+    response, etag = cache.get("page")
+    assert response.json() == {"id": "1"} and etag is None
+
+    cache.ttl = 0.5
+    assert cache.get("page") == (None, '"v1"')
+    assert cache.refresh("page").json() == {"id": "1"}
+    cache.ttl = 60
+    assert cache.get("page")[0] is not None
+    assert (cache.hits, cache.misses, cache.revalidations) == (2, 1, 1)
+
+
+def test_least_recently_used_entries_are_evicted(clock):
+    with ResponseCache(":memory:", max_bytes=25) as cache:
+        for key in "abc":
+            cache.set(key, make_response(f"https://api.notion.com/v1/pages/{key}", b"0123456789"))
+            if key == "b":
+                cache.get("a")
+
+        assert cache.get("a")[0] is not None
+        assert cache.get("b") == (None, None)
+        assert cache.get("c")[0] is not None
+
+
+def test_oversized_responses_are_not_cached():
+    with ResponseCache(":memory:", max_bytes=5) as cache:
+        cache.set("a", make_response("https://api.notion.com/v1/pages/a", b"0123456789"))
+        assert cache.get("a") == (None, None)
+
+
+def test_client_serves_get_page_from_the_cache(clock):
+    with NotionStandIn.synthetic(rows=5, columns=3) as server, ResponseCache(":memory:") as cache:
+        page = server.databases[server.db_ids[0]][1][0]
+        with NotionAPI(
+            API_KEY, base_url=server.base_url, scheduler=RequestScheduler(rate=1000, burst=1000), response_cache=cache
+        ) as notion:
+            requests = server.requests
+            assert json.loads(notion.get_page(page["id"]).content)["id"] == page["id"]
+            assert json.loads(notion.get_page(page["id"]).content)["id"] == page["id"]
+
+    assert server.requests - requests == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_client_revalidates_stale_entries_with_their_etag(cache, clock, monkeypatch):
+    with NotionStandIn.synthetic(rows=5, columns=3) as server, NotionAPI(
+        API_KEY, base_url=server.base_url, scheduler=RequestScheduler(rate=1000, burst=1000), response_cache=cache
+    ) as notion:
+        # The stand-in does not send ETags, so the responses are faked.
+        url = server.base_url + "pages/1"
+        sent = []
+
+        def send_request(method, request_url, headers, **kwargs):
+            sent.append(headers)
+            if headers.get("If-None-Match") == '"v1"':
+                return make_response(request_url, b"", status_code=304)
+            return make_response(request_url, b'{"id": "1"}', etag='"v1"')
+
+        monkeypatch.setattr(notion, "_send_request", send_request)
+        notion._get_request(url, HEADERS, cacheable=True)
+        cache.ttl = 0.5
+        response = notion._get_request(url, HEADERS, cacheable=True)
+
+    assert response.status_code == 200 and response.json() == {"id": "1"}
+    assert [headers.get("If-None-Match") for headers in sent] == [None, '"v1"']
+    assert cache.revalidations == 1
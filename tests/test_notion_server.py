@@ -0,0 +1,90 @@
+import pytest
+import requests
+from Benchmarks.notion_server import NotionStandIn
+from Notion.Notion_API import NotionAPI
+from Notion.Notion_Rate_Limit import RequestScheduler
+
+API_KEY = "secret_" + "0" * 43
+HEADERS = {"Authorization": f"Bearer {API_KEY}", "Notion-Version": "2022-06-28"}
+
+
+@pytest.fixture
+def server():
+    with NotionStandIn.synthetic(rows=250, columns=5, block_fanout=2, block_depth=1) as server:
+        yield server
+
+
+def query(server, body=None, params=None, db=None) -> requests.Response:
+    return requests.post(
+        f"{server.base_url}databases/{db or server.db_ids[0]}/query", json=body or {}, params=params, headers=HEADERS
+    )
+
+
+def test_query_pages_through_the_database_with_cursors(server):
+    pages = server.databases[server.db_ids[0]][1]
+    ids = []
+    body = {"page_size": 100}
+    while True:
+        content = query(server, body).json()
+        ids += [page["id"] for page in content["results"]]
+        if not content["has_more"]:
+            break
+        body["start_cursor"] = content["next_cursor"]
+
+    assert ids == [page["id"] for page in pages]
+    assert server.requests == 3
+
+
+def test_query_applies_filter_properties_timestamp_filters_and_sorts(server):
+    server.touch_page(server.db_ids[0], 7, "2030-01-01T00:00:00.000Z")
+    server.touch_page(server.db_ids[0], 3, "2030-01-02T00:00:00.000Z")
+    body = {
+        "filter": {"timestamp": "last_edited_time", "last_edited_time": {"on_or_after": "2030-01-01T00:00:00.000Z"}},
+        "sorts": [{"timestamp": "last_edited_time", "direction": "descending"}],
+    }
+
+    results = query(server, body, params={"filter_properties": ["title"]}).json()["results"]
+
+    pages = server.databases[server.db_ids[0]][1]
+    assert [page["id"] for page in results] == [pages[3]["id"], pages[7]["id"]]
+    assert all(list(page["properties"]) == ["Name"] for page in results)
+
+
+def test_unknown_objects_and_keys(server):
+    assert query(server, db="f" * 32).status_code == 404
+    assert requests.get(f"{server.base_url}pages/{'f' * 32}", headers=HEADERS).status_code == 404
+
+    server.key_access = {}
+    assert query(server).status_code == 401
+
+
+def test_pages_and_block_children_are_served(server):
+    page = server.databases[server.db_ids[0]][1][0]
+
+    assert requests.get(f"{server.base_url}pages/{page['id']}", headers=HEADERS).json() == page
+    children = requests.get(
+        f"{server.base_url}blocks/{page['id']}/children", params={"page_size": 1}, headers=HEADERS
+    ).json()
+    assert len(children["results"]) == 1 and children["has_more"]
+
+
+def test_every_nth_request_is_rate_limited(server):
+    server.rate_limit_every = 2
+    server.retry_after = 0.01
+
+    responses = [query(server) for _ in range(4)]
+
+    assert [response.status_code for response in responses] == [200, 429, 200, 429]
+    assert responses[1].headers["Retry-After"] == "0.01"
+    assert server.rate_limited == 2
+
+
+def test_client_retries_rate_limited_requests(server):
+    server.rate_limit_every = 3
+    server.retry_after = 0.01
+
+    with NotionAPI(API_KEY, base_url=server.base_url, scheduler=RequestScheduler(rate=1000, burst=1000)) as notion:
+        df = notion.query_db(server.db_ids[0])
+
+    assert len(df) == 250
+    assert server.rate_limited > 0
@@ -0,0 +1,65 @@
+import pandas as pd
+import pytest
+from Benchmarks.notion_server import NotionStandIn
+from Notion.Notion_API import NotionAPI
+from Notion.Notion_Rate_Limit import RequestScheduler
+from Notion.Notion_Snapshot import iter_snapshot, read_snapshot, read_snapshot_metadata
+
+pytest.importorskip("pyarrow")
+
+API_KEY = "secret_" + "0" * 43
+
+
+def to_objects(df: pd.DataFrame) -> pd.DataFrame:
+    """Returns the values of a frame as Python objects, missing values as None, to compare them across dtypes."""
+    return df.astype(object).where(df.notna(), None)
+
+
+@pytest.fixture(scope="module")
+def server():
+    with NotionStandIn.synthetic(rows=250, columns=13) as server:
+        yield server
+
+
+@pytest.fixture
+def notion(server):
+    with NotionAPI(API_KEY, base_url=server.base_url, scheduler=RequestScheduler(rate=1000, burst=1000)) as notion:
+        yield notion
+
+
+@pytest.mark.parametrize("name", ["snapshot.parquet", "snapshot.arrow"])
+def test_snapshot_round_trips_query_db(server, notion, tmp_path, name):
+    path = str(tmp_path / name)
+    metadata = notion.snapshot_db(server.db_ids[0], path, chunk_size=60)
+
+    df = read_snapshot(path)
+    expected = notion.query_db(server.db_ids[0])
+
+    assert metadata["rows"] == 250
+    assert read_snapshot_metadata(path)["title"] == "Synthetic database 0"
+    assert list(df.columns) == list(expected.columns)
+    pd.testing.assert_frame_equal(to_objects(df), to_objects(expected))
+
+
+def test_snapshot_columns_and_chunks(server, notion, tmp_path):
+    path = str(tmp_path / "snapshot.parquet")
+    notion.snapshot_db(server.db_ids[0], path)
+
+    df = read_snapshot(path, columns=["Name", "number 10", "missing"])
+    chunks = list(iter_snapshot(path, chunk_size=100, columns=["Name", "number 10"]))
+
+    assert list(df.columns) == ["Name", "number 10"]
+    assert [len(chunk) for chunk in chunks] == [100, 100, 50]
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), df)
+
+
+def test_empty_properties_keep_their_type(server, notion, tmp_path):
+    path = str(tmp_path / "snapshot.parquet")
+    query = {"filter": {"timestamp": "last_edited_time", "last_edited_time": {"after": "2100-01-01T00:00:00.000Z"}}}
+    notion.snapshot_db(server.db_ids[0], path, query=query)
+
+    df = read_snapshot(path)
+
+    assert len(df) == 0
+    assert read_snapshot_metadata(path)["properties"]["number 10"] == "number"
+    assert pd.api.types.is_numeric_dtype(df["number 10"])
@@ -0,0 +1,76 @@
+import time
+import pandas as pd
+import pytest
+from Benchmarks.notion_server import NotionStandIn
+from Notion.Notion_API import NotionAPI
+from Notion.Notion_Page import NotionPage
+from Notion.Notion_Rate_Limit import RequestScheduler
+
+API_KEY = "secret_" + "0" * 43
+
+
+@pytest.fixture
+def server():
+    with NotionStandIn.synthetic(rows=450, columns=5, latency=0.01) as server:
+        yield server
+
+
+@pytest.fixture
+def notion(server):
+    with NotionAPI(API_KEY, base_url=server.base_url, scheduler=RequestScheduler(rate=1000, burst=1000)) as notion:
+        yield notion
+
+
+def wait_for_requests(server, count: int, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while server.requests < count and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_dataframe_chunks_have_chunk_size_rows(server, notion):
+    chunks = list(notion.iter_db(server.db_ids[0], return_type="dataframe", chunk_size=120))
+
+    assert [len(chunk) for chunk in chunks] == [120, 120, 120, 90]
+    df = pd.concat(chunks, ignore_index=True)
+    pd.testing.assert_frame_equal(df, notion.query_db(server.db_ids[0]))
+
+
+@pytest.mark.parametrize("return_type, item_type", [("json", dict), ("NotionPage", NotionPage)])
+def test_iter_db_yields_every_page_in_order(server, notion, return_type, item_type):
+    items = list(notion.iter_db(server.db_ids[0], return_type=return_type))
+
+    assert all(isinstance(item, item_type) for item in items)
+    ids = [item["id"] if return_type == "json" else item.id for item in items]
+    assert ids == [page["id"] for page in server.databases[server.db_ids[0]][1]]
+
+
+def test_prefetch_fetches_a_bounded_number_of_pages_ahead(server, notion):
+    requests = server.requests
+    pages = notion.iter_db(server.db_ids[0], return_type="json", prefetch=2)
+    next(pages)
+
+    # Besides the page being consumed, the background thread buffers 2 pages
+    # and holds a third one until there is room for it.
+    wait_for_requests(server, requests + 4)
+    time.sleep(0.1)
+    assert server.requests - requests == 4
+    assert len(list(pages)) == 449
+    assert server.requests - requests == 5
+    pages.close()
+
+
+def test_prefetch_0_fetches_on_demand(server, notion):
+    requests = server.requests
+    pages = notion.iter_db(server.db_ids[0], return_type="json", prefetch=0)
+    next(pages)
+
+    time.sleep(0.1)
+    assert server.requests - requests == 1
+    pages.close()
+
+
+def test_iter_db_rejects_invalid_arguments(server, notion):
+    with pytest.raises(ValueError, match="chunk_size"):
+        next(notion.iter_db(server.db_ids[0], return_type="dataframe", chunk_size=0))
+    with pytest.raises(ValueError, match="Unsupported return_type"):
+        next(notion.iter_db(server.db_ids[0], return_type="csv"))
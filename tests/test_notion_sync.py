@@ -0,0 +1,107 @@
+import pytest
+from Benchmarks.notion_server import NotionStandIn
+from Notion.Notion_API import NotionAPI
+from Notion.Notion_Page_Cache import NotionPageCache
+from Notion.Notion_Rate_Limit import RequestScheduler
+
+API_KEY = "secret_" + "0" * 43
+
+
+@pytest.fixture
+def server():
+    with NotionStandIn.synthetic(rows=500, columns=5) as server:
+        yield server
+
+
+@pytest.fixture
+def notion(server):
+    with NotionAPI(API_KEY, base_url=server.base_url, scheduler=RequestScheduler(rate=1000, burst=1000)) as notion:
+        yield notion
+
+
+@pytest.fixture
+def cache(tmp_path):
+    with NotionPageCache(str(tmp_path / "pages.sqlite")) as cache:
+        yield cache
+
+
+def test_sync_only_fetches_changed_pages(server, notion, cache):
+    db = server.db_ids[0]
+    assert len(notion.sync_db(db, cache, return_type="json")) == 500
+    full_sync_bytes = server.bytes_sent
+
+    server.touch_page(db, 10, "2030-01-01T00:00:00.000Z")
+    server.touch_page(db, 20, "2030-01-01T00:01:00.000Z")
+    requests, sent = server.requests, server.bytes_sent
+    pages = notion.sync_db(db, cache, return_type="json")
+
+    assert len(pages) == 500
+    assert server.requests - requests == 1
+    # The timestamp filter keeps the delta's response a fraction of the full one.
+    assert server.bytes_sent - sent < full_sync_bytes / 20
+    edited = {page["id"]: page["last_edited_time"] for page in pages}
+    assert edited[server.databases[db][1][10]["id"]] == "2030-01-01T00:00:00.000Z"
+    assert cache.get_last_edited_time(notion.get_cache_scope(db)) == "2030-01-01T00:01:00.000Z"
+
+
+def test_sync_without_changes_only_refetches_the_newest_page(server, notion, cache):
+    db = server.db_ids[0]
+    notion.sync_db(db, cache, return_type=None)
+    full_sync_bytes = server.bytes_sent
+
+    notion.sync_db(db, cache, return_type=None)
+
+    # on_or_after the high water mark: only the page(s) edited in that minute come back.
+    _, pages, _ = server.databases[db]
+    newest = max(page["last_edited_time"] for page in pages)
+    assert cache.get_last_edited_time(notion.get_cache_scope(db)) == newest
+    assert server.bytes_sent - full_sync_bytes < full_sync_bytes / 100
+
+
+def test_archived_pages_are_removed_by_reconciling(server, notion, cache):
+    db = server.db_ids[0]
+    notion.sync_db(db, cache, return_type=None)
+    full_sync_bytes = server.bytes_sent
+
+    _, pages, _ = server.databases[db]
+    pages[5]["archived"] = True
+    server.touch_page(db, 5, "2030-01-01T00:00:00.000Z")
+
+    # Like Notion, the stand-in does not return archived pages, so a delta cannot see them.
+    assert len(notion.sync_db(db, cache, return_type="json")) == 500
+
+    sent = server.bytes_sent
+    synced = notion.sync_db(db, cache, return_type="json", reconcile=True)
+
+    assert len(synced) == 499
+    assert pages[5]["id"] not in {page["id"] for page in synced}
+    # The reconciliation only lists the pages' titles.
+    assert server.bytes_sent - sent < full_sync_bytes / 2
+
+
+def test_reconcile_interval(server, notion, cache):
+    db = server.db_ids[0]
+    notion.sync_db(db, cache, return_type=None)
+    _, pages, indexes = server.databases[db]
+    deleted = pages.pop()
+    del indexes[deleted["id"].replace("-", "")]
+
+    # The first (full) sync counts as a reconciliation.
+    assert len(notion.sync_db(db, cache, return_type="json", reconcile_interval=3600)) == 500
+
+    cache.set_reconciled_at(notion.get_cache_scope(db), 0)
+    assert len(notion.sync_db(db, cache, return_type="json", reconcile_interval=3600)) == 499
+
+
+def test_reconcile_removes_deleted_pages(server, notion, cache):
+    db = server.db_ids[0]
+    notion.sync_db(db, cache, return_type=None)
+
+    _, pages, indexes = server.databases[db]
+    deleted = pages.pop()
+    del indexes[deleted["id"].replace("-", "")]
+
+    assert len(notion.sync_db(db, cache, return_type="json")) == 500
+    synced = notion.sync_db(db, cache, return_type="json", reconcile=True)
+    assert len(synced) == 499
+    assert deleted["id"] not in {page["id"] for page in synced}
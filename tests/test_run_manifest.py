@@ -0,0 +1,101 @@
+import argparse
+import asyncio
+import functools
+import json
+import logging
+import pytest
+import run_manifest
+from Benchmarks.notion_server import NotionStandIn
+from Notion.Notion_Async_API import AsyncNotionAPI
+from Notion.Notion_Rate_Limit import RequestScheduler
+
+API_KEY = "secret_" + "0" * 43
+
+
+def not_null_suite(mostly: float) -> dict:
+    return {
+        "expectation_suite_name": f"not_null_{mostly}",
+        "expectations": [
+            {
+                "expectation_type": "expect_column_values_to_not_be_null",
+                "kwargs": {"column": "rich_text 0", "mostly": mostly},
+                "meta": {},
+            }
+        ],
+    }
+
+
+def write_json(path, content) -> str:
+    path.write_text(json.dumps(content))
+    return str(path)
+
+
+def test_load_manifest_applies_the_defaults(tmp_path):
+    manifest = write_json(
+        tmp_path / "manifest.json",
+        {
+            "defaults": {"data_source": "source", "plan_cache": ".plan_cache"},
+            "databases": [
+                {"db": "a" * 32, "expectation_suite": "suite"},
+                {"db": "b" * 32, "expectation_suite": "suite", "engine": "native", "suite_file": "suite.json"},
+            ],
+        },
+    )
+
+    tasks = run_manifest.load_manifest(manifest)
+
+    assert [task["engine"] for task in tasks] == ["ge", "native"]
+    assert all(task["data_source"] == "source" and task["plan_cache"] == ".plan_cache" for task in tasks)
+    assert tasks[0]["data_connector"] == "my_notion_pandas_data_connector"
+    assert tasks[0]["query"] == ""
+
+
+@pytest.mark.parametrize(
+    "database",
+    [
+        {"db": "a" * 32},
+        {"expectation_suite": "suite"},
+        {"db": "a" * 32, "expectation_suite": "suite", "engine": "native"},
+    ],
+)
+def test_load_manifest_rejects_incomplete_entries(tmp_path, database):
+    manifest = write_json(tmp_path / "manifest.json", {"databases": [database]})
+
+    with pytest.raises(ValueError, match="Manifest entry"):
+        run_manifest.load_manifest(manifest)
+
+
+def test_run_manifest_validates_every_database(tmp_path, monkeypatch):
+    with NotionStandIn.synthetic(rows=300, columns=5, databases=2) as server:
+        monkeypatch.setenv("NOTION_API_KEY", API_KEY)
+        monkeypatch.setattr(
+            run_manifest,
+            "AsyncNotionAPI",
+            functools.partial(
+                AsyncNotionAPI, base_url=server.base_url, scheduler=RequestScheduler(rate=1000, burst=1000)
+            ),
+        )
+        strict = write_json(tmp_path / "strict.json", not_null_suite(1.0))
+        lenient = write_json(tmp_path / "lenient.json", not_null_suite(0.5))
+        manifest = write_json(
+            tmp_path / "manifest.json",
+            {
+                "defaults": {"engine": "native", "plan_cache": str(tmp_path / "plans")},
+                "databases": [
+                    {"db": server.db_ids[0], "expectation_suite": "lenient", "suite_file": lenient},
+                    {"db": server.db_ids[1], "expectation_suite": "strict", "suite_file": strict},
+                    {"db": "f" * 32, "expectation_suite": "lenient", "suite_file": lenient},
+                ],
+            },
+        )
+        args = argparse.Namespace(max_concurrency=2, workers=0, run_name="test")
+
+        results = asyncio.run(
+            run_manifest.run_manifest(run_manifest.load_manifest(manifest), args, logging.getLogger("notion"))
+        )
+
+    assert [result["db"] for result in results] == [server.db_ids[0], server.db_ids[1], "f" * 32]
+    assert [result["success"] for result in results] == [True, False, False]
+    assert results[0]["title"] == "Synthetic database 0" and results[0]["rows"] == 300
+    assert results[1]["statistics"]["unsuccessful_expectations"] == 1
+    assert "error" in results[2] and "error" not in results[1]
@@ -0,0 +1,107 @@
+import json
+import logging
+import threading
+import pytest
+from Benchmarks.notion_server import NotionStandIn
+from Notion.Notion_API import NotionAPI
+from Notion.Notion_Rate_Limit import RequestScheduler
+from run_manifest import load_manifest
+from validation_daemon import ValidationDaemon
+
+API_KEY = "secret_" + "0" * 43
+
+
+@pytest.fixture
+def server():
+    with NotionStandIn.synthetic(rows=150, columns=5, databases=2) as server:
+        yield server
+
+
+@pytest.fixture
+def notion(server):
+    with NotionAPI(API_KEY, base_url=server.base_url, scheduler=RequestScheduler(rate=1000, burst=1000)) as notion:
+        yield notion
+
+
+@pytest.fixture
+def make_daemon(server, notion, tmp_path):
+    suite_file = tmp_path / "suite.json"
+    suite_file.write_text(json.dumps({
+        "expectation_suite_name": "not_null",
+        "expectations": [
+            {
+                "expectation_type": "expect_column_values_to_not_be_null",
+                "kwargs": {"column": "rich_text 0", "mostly": 0.5},
+                "meta": {},
+            }
+        ],
+    }))
+
+    def make_daemon(**database) -> ValidationDaemon:
+        manifest = tmp_path / "manifest.json"
+        defaults = {"engine": "native", "suite_file": str(suite_file), "expectation_suite": "not_null"}
+        manifest.write_text(json.dumps({
+            "defaults": {**defaults, **database},
+            "databases": [{"db": db} for db in server.db_ids],
+        }))
+        return ValidationDaemon(
+            notion, load_manifest(str(manifest)), logging.getLogger("notion"), state_file=str(tmp_path / "state.json")
+        )
+
+    return make_daemon
+
+
+def run_once(daemon: ValidationDaemon) -> list[dict]:
+    return daemon.run(threading.Event(), once=True)
+
+
+def test_only_changed_databases_are_validated_again(server, make_daemon):
+    daemon = make_daemon()
+    results = run_once(daemon)
+    assert sorted(result["db"] for result in results) == sorted(server.db_ids)
+    assert all(result["success"] and result["rows"] == 150 for result in results)
+
+    # The results of a daemon accumulate across runs.
+    assert len(run_once(daemon)) == 2
+    server.touch_page(server.db_ids[1], 40, "2030-01-01T00:00:00.000Z")
+    results = run_once(daemon)
+
+    assert [result["db"] for result in results[2:]] == [server.db_ids[1]]
+    assert daemon.metrics.counters["polls"] == 6
+    assert daemon.metrics.counters["validations"] == 3
+
+
+def test_state_survives_restarts(server, make_daemon):
+    run_once(make_daemon())
+
+    daemon = make_daemon()
+    assert run_once(daemon) == []
+    assert daemon.metrics.counters["polls"] == 2
+
+
+def test_max_age_validates_unchanged_databases(server, make_daemon):
+    run_once(make_daemon())
+
+    assert len(run_once(make_daemon(max_age=1e-6))) == 2
+
+
+def test_edits_in_the_minute_of_the_previous_fetch_are_validated_again(make_daemon):
+    daemon = make_daemon()
+    previous = {
+        "last_edited_time": "2030-01-01T10:00:00.000Z",
+        "page_id": "a",
+        "fetched_at": "2030-01-01T10:00:59+00:00",
+        "validated_at": 0,
+    }
+
+    assert daemon._get_reason({}, None, ("2030-01-01T10:00:00.000Z", "a")) == "not validated yet"
+    assert daemon._get_reason({}, previous, ("2030-01-01T10:01:00.000Z", "a")) == "its pages changed"
+    assert daemon._get_reason({}, previous, ("2030-01-01T10:00:00.000Z", "b")) == "its pages changed"
+    assert "previous fetch's minute" in daemon._get_reason({}, previous, ("2030-01-01T10:00:00.000Z", "a"))
+    previous["fetched_at"] = "2030-01-01T10:01:00+00:00"
+    assert daemon._get_reason({}, previous, ("2030-01-01T10:00:00.000Z", "a")) is None
+
+
+def test_snapshot_tasks_are_rejected(make_daemon):
+    with pytest.raises(ValueError, match="snapshot"):
+        make_daemon(snapshot="db.parquet")
@@ -0,0 +1,63 @@
+import sys
+import pytest
+from Validation.Validation_GE import GreatExpectationsLoader, ensure_datasource, get_datasource_config
+
+
+class RecordingContext:
+    """Data context holding datasource configurations, recording the calls that would change them."""
+
+    def __init__(self, datasources: list[dict]):
+        self.datasources = datasources
+        self.calls = []
+
+    def list_datasources(self) -> list[dict]:
+        return self.datasources
+
+    def test_yaml_config(self, yaml_config: str):
+        self.calls.append("test_yaml_config")
+
+    def add_datasource(self, **datasource_config):
+        self.calls.append("add_datasource")
+        self.datasources = [
+            datasource for datasource in self.datasources if datasource["name"] != datasource_config["name"]
+        ] + [datasource_config]
+
+
+def test_configured_datasources_are_left_alone():
+    # GE lists the datasources with extra, defaulted keys.
+    datasource = get_datasource_config()
+    datasource["data_connectors"]["my_notion_pandas_data_connector"]["name"] = "my_notion_pandas_data_connector"
+    context = RecordingContext([{"name": "other", "class_name": "Datasource"}, datasource])
+
+    assert not ensure_datasource(context)
+    assert context.calls == []
+
+
+@pytest.mark.parametrize(
+    "datasources",
+    [
+        [],
+        [{**get_datasource_config(), "execution_engine": {"class_name": "SparkDFExecutionEngine"}}],
+        [get_datasource_config(data_connector="another_connector")],
+    ],
+)
+def test_missing_or_different_datasources_are_added(datasources):
+    pytest.importorskip("ruamel.yaml")
+    context = RecordingContext(datasources)
+
+    assert ensure_datasource(context)
+    assert context.calls == ["test_yaml_config", "add_datasource"]
+    assert not ensure_datasource(context)
+    assert context.calls == ["test_yaml_config", "add_datasource"]
+
+
+def test_loader_raises_the_import_error_when_the_context_is_needed(monkeypatch):
+    monkeypatch.setitem(sys.modules, "great_expectations", None)
+    loader = GreatExpectationsLoader()
+
+    assert loader.start() is loader
+    thread = loader._thread
+    assert loader.start()._thread is thread
+    with pytest.raises(ImportError):
+        loader.get_context()
+    assert loader.load_seconds is not None
@@ -0,0 +1,115 @@
+import pytest
+from Benchmarks.notion_server import NotionStandIn
+from Notion.Notion_API import NotionAPI
+from Notion.Notion_Page_Cache import NotionPageCache
+from Notion.Notion_Rate_Limit import RequestScheduler
+from Validation.Validation_Incremental import IncrementalValidator
+from Validation.Validation_Native import NativeValidator
+
+API_KEY = "secret_" + "0" * 43
+NUMBER = "number 10"
+
+
+def make_validator(max_value: int = 10000) -> NativeValidator:
+    expectations = [
+        ("expect_column_values_to_not_be_null", {"column": "Name"}),
+        ("expect_column_values_to_be_between", {"column": NUMBER, "min_value": 0, "max_value": max_value}),
+        ("expect_column_max_to_be_between", {"column": NUMBER, "max_value": max_value}),
+        ("expect_column_unique_value_count_to_be_between", {"column": "Name", "min_value": 1}),
+    ]
+    return NativeValidator({
+        "expectation_suite_name": "test",
+        "expectations": [
+            {"expectation_type": expectation_type, "kwargs": kwargs, "meta": {}}
+            for expectation_type, kwargs in expectations
+        ],
+    })
+
+
+@pytest.fixture
+def server():
+    with NotionStandIn.synthetic(rows=1000, columns=12) as server:
+        yield server
+
+
+@pytest.fixture
+def sync(server, tmp_path):
+    path = str(tmp_path / "pages.sqlite")
+    scheduler = RequestScheduler(rate=1000, burst=1000)
+
+    def sync(validator: NativeValidator, reconcile: bool = False) -> dict:
+        with NotionAPI(API_KEY, base_url=server.base_url, scheduler=scheduler) as notion:
+            with NotionPageCache(path) as cache:
+                notion.sync_db(server.db_ids[0], cache, return_type=None, reconcile=reconcile)
+                with IncrementalValidator(validator, path) as incremental:
+                    return incremental.validate(cache, notion.get_cache_scope(server.db_ids[0]))
+
+    return sync
+
+
+def get_observed(result: dict) -> list:
+    return [
+        expectation["result"].get("unexpected_count", expectation["result"].get("observed_value"))
+        for expectation in result["results"]
+    ]
+
+
+def test_only_changed_buckets_are_recomputed(server, sync):
+    validator = make_validator()
+    first = sync(validator)
+    assert first["meta"]["incremental"]["recomputed_buckets"] == 64
+    assert first["meta"]["incremental"]["recomputed_rows"] == 1000
+
+    unchanged = sync(validator)
+    assert unchanged["meta"]["incremental"]["recomputed_buckets"] == 0
+    assert get_observed(unchanged) == get_observed(first)
+
+    _, pages, _ = server.databases[server.db_ids[0]]
+    pages[7]["properties"][NUMBER]["number"] = 123456
+    server.touch_page(server.db_ids[0], 7, "2030-01-01T00:00:00.000Z")
+    edited = sync(validator)
+
+    incremental = edited["meta"]["incremental"]
+    assert incremental["recomputed_buckets"] == 1
+    assert 0 < incremental["recomputed_rows"] < 1000 / 16
+    assert edited["results"][2]["result"]["observed_value"] == 123456
+    assert edited["results"][1]["result"]["unexpected_count"] == first["results"][1]["result"]["unexpected_count"] + 1
+
+
+def test_incremental_result_matches_a_full_validation(server, sync):
+    validator = make_validator()
+    sync(validator)
+    _, pages, _ = server.databases[server.db_ids[0]]
+    for index in (3, 400, 999):
+        pages[index]["properties"][NUMBER]["number"] = -index
+        server.touch_page(server.db_ids[0], index, "2030-01-01T00:00:00.000Z")
+
+    result = sync(validator)
+
+    with NotionAPI(API_KEY, base_url=server.base_url, scheduler=RequestScheduler(rate=1000, burst=1000)) as notion:
+        full = validator.validate(notion.query_db(server.db_ids[0]))
+    # Distinct counts of merged buckets are HyperLogLog estimates.
+    assert get_observed(result)[:3] == get_observed(full)[:3]
+    assert result["success"] == full["success"]
+
+
+def test_reconciled_archived_pages_invalidate_their_bucket(server, sync):
+    validator = make_validator()
+    sync(validator)
+    _, pages, _ = server.databases[server.db_ids[0]]
+    pages[10]["archived"] = True
+    server.touch_page(server.db_ids[0], 10, "2030-01-01T00:00:00.000Z")
+
+    result = sync(validator, reconcile=True)
+
+    assert result["meta"]["incremental"]["recomputed_buckets"] == 1
+    assert result["meta"]["incremental"]["rows"] == 999
+    assert result["results"][0]["result"]["element_count"] == 999
+
+
+def test_metrics_are_stored_per_suite(sync):
+    sync(make_validator())
+
+    result = sync(make_validator(max_value=20000))
+
+    assert result["meta"]["incremental"]["recomputed_buckets"] == 64
@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+import pytest
+from Validation.Validation_Native import NativeValidator
+
+
+def make_suite(*expectations: dict) -> dict:
+    return {"expectation_suite_name": "test", "expectations": list(expectations)}
+
+
+def expectation(expectation_type: str, column: str = "value", **kwargs) -> dict:
+    return {"expectation_type": expectation_type, "kwargs": {"column": column, **kwargs}, "meta": {}}
+
+
+@pytest.mark.parametrize("rows", [100, 1000, 5000, 20000])
+def test_unique_value_count_is_exact_on_the_whole_frame(rows):
+    validator = NativeValidator(make_suite(
+        expectation("expect_column_unique_value_count_to_be_between", min_value=rows, max_value=rows)
+    ))
+    df = pd.DataFrame({"value": np.arange(rows)})
+
+    result = validator.validate(df)
+
+    assert result["success"]
+    assert result["results"][0]["result"]["observed_value"] == rows
+    assert "approximate" not in result["results"][0]["meta"]
+
+
+def test_unique_value_count_compares_lists_as_strings():
+    validator = NativeValidator(make_suite(
+        expectation("expect_column_unique_value_count_to_be_between", min_value=2, max_value=2)
+    ))
+    df = pd.DataFrame({"value": [["English"], ["English"], ["English", "Spanish"], None]})
+
+    assert validator.validate(df)["success"]
+
+
+def test_unique_value_count_of_merged_chunks_is_an_estimate():
+    validator = NativeValidator(make_suite(
+        expectation("expect_column_unique_value_count_to_be_between", min_value=0, max_value=None)
+    ))
+    df = pd.DataFrame({"value": np.arange(20000)})
+
+    metrics = validator.merge_metrics(
+        validator.compute_metrics(df.iloc[:10000]), validator.compute_metrics(df.iloc[10000:])
+    )
+    result = validator.build_expectation_result(0, metrics[0])
+
+    assert result["meta"]["approximate"]
+    # Standard error of the default 2**12 registers sketch is about 1.6%.
+    assert abs(result["result"]["observed_value"] - 20000) < 20000 * 0.05
+
+
+def test_median_is_exact_on_the_whole_frame():
+    validator = NativeValidator(make_suite(
+        expectation("expect_column_median_to_be_between", min_value=4999.5, max_value=4999.5)
+    ))
+    df = pd.DataFrame({"value": np.random.default_rng(0).permutation(10000)})
+
+    result = validator.validate(df)
+
+    assert result["success"]
+    assert result["results"][0]["result"]["observed_value"] == 4999.5
+    assert "approximate" not in result["results"][0]["meta"]
+
+
+def test_quantiles_are_exact_on_the_whole_frame():
+    quantiles = [0.1, 0.5, 0.9, 0.99]
+    expected = pd.Series(np.arange(1001)).quantile(quantiles, interpolation="nearest").tolist()
+    validator = NativeValidator(make_suite(expectation(
+        "expect_column_quantile_values_to_be_between",
+        quantile_ranges={"quantiles": quantiles, "value_ranges": [[value, value] for value in expected]},
+    )))
+    df = pd.DataFrame({"value": np.random.default_rng(0).permutation(1001)})
+
+    result = validator.validate(df)
+
+    assert result["success"]
+    assert result["results"][0]["result"]["observed_value"] == {"quantiles": quantiles, "values": expected}
+    assert "approximate" not in result["results"][0]["meta"]
+
+
+def test_quantiles_of_merged_chunks_are_estimates():
+    quantiles = [0.01, 0.25, 0.5, 0.75, 0.99]
+    validator = NativeValidator(make_suite(expectation(
+        "expect_column_quantile_values_to_be_between",
+        quantile_ranges={"quantiles": quantiles, "value_ranges": [[None, None]] * len(quantiles)},
+    )))
+    values = np.random.default_rng(0).normal(size=40000)
+    df = pd.DataFrame({"value": values})
+    chunks = [df.iloc[start:start + 5000] for start in range(0, len(df), 5000)]
+
+    metrics = validator.compute_metrics(chunks[0])
+    for chunk in chunks[1:]:
+        metrics = validator.merge_metrics(metrics, validator.compute_metrics(chunk))
+    result = validator.build_expectation_result(0, metrics[0])
+
+    assert result["meta"]["approximate"]
+    # t-digest estimates are accurate to well under a percent of rank.
+    for quantile, value in zip(quantiles, result["result"]["observed_value"]["values"]):
+        assert abs((values < value).mean() - quantile) < 0.005
+
+
+def test_median_of_a_non_numeric_column_is_an_exception():
+    validator = NativeValidator(make_suite(expectation("expect_column_median_to_be_between", min_value=0)))
+
+    result = validator.validate(pd.DataFrame({"value": ["a", "b"]}))
+
+    assert not result["success"]
+    assert result["results"][0]["exception_info"]["raised_exception"]
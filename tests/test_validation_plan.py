@@ -0,0 +1,66 @@
+import json
+import os
+import pandas as pd
+from Validation.Validation_Plan import PlanCache
+
+
+def write_suite(path, mostly: float):
+    path.write_text(json.dumps({
+        "expectation_suite_name": "test",
+        "expectations": [
+            {
+                "expectation_type": "expect_column_values_to_not_be_null",
+                "kwargs": {"column": "value", "mostly": mostly},
+                "meta": {},
+            }
+        ],
+    }))
+
+
+def test_unchanged_suites_are_compiled_once(tmp_path):
+    suite = tmp_path / "suite.json"
+    write_suite(suite, 1.0)
+    plans = PlanCache(str(tmp_path / "plans"))
+
+    validator = plans.load(str(suite))
+
+    assert plans.load(str(suite)) is validator
+    assert (plans.hits, plans.misses) == (1, 1)
+
+
+def test_plans_are_shared_through_the_directory(tmp_path):
+    suite = tmp_path / "suite.json"
+    write_suite(suite, 1.0)
+    PlanCache(str(tmp_path / "plans")).load(str(suite))
+
+    # A new process (here, a new cache) reads the plan instead of compiling the suite.
+    plans = PlanCache(str(tmp_path / "plans"))
+    validator = plans.load(str(suite))
+
+    assert (plans.hits, plans.misses) == (1, 0)
+    assert not validator.validate(pd.DataFrame({"value": [1, None]}))["success"]
+
+
+def test_changed_suites_are_recompiled(tmp_path):
+    suite = tmp_path / "suite.json"
+    df = pd.DataFrame({"value": [1, 2, 3, None]})
+    write_suite(suite, 1.0)
+    plans = PlanCache(str(tmp_path / "plans"))
+    assert not plans.load(str(suite)).validate(df)["success"]
+
+    write_suite(suite, 0.5)
+
+    assert plans.load(str(suite)).validate(df)["success"]
+    assert (plans.hits, plans.misses) == (0, 2)
+    # The plan of the previous content was replaced.
+    assert len(os.listdir(tmp_path / "plans")) == 1
+    assert PlanCache(str(tmp_path / "plans")).load(str(suite)).validate(df)["success"]
+
+
+def test_suites_with_the_same_content_share_their_validator(tmp_path):
+    for name in ("a.json", "b.json"):
+        write_suite(tmp_path / name, 1.0)
+    plans = PlanCache()
+
+    assert plans.load(str(tmp_path / "b.json")) is plans.load(str(tmp_path / "a.json"))
+    assert (plans.hits, plans.misses) == (1, 1)
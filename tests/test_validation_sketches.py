@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+from Validation.Validation_Sketches import HyperLogLog, TDigest
+
+
+def merge_chunks(sketch_type, values: np.ndarray, chunks: int, **kwargs):
+    merged = None
+    for chunk in np.array_split(values, chunks):
+        sketch = sketch_type(**kwargs).add(pd.Series(chunk))
+        merged = sketch if merged is None else merged.merge(sketch)
+    return merged
+
+
+@pytest.mark.parametrize("distinct", [10, 1000, 100000])
+def test_merged_hyperloglog_is_within_its_error_bound(distinct):
+    values = np.random.default_rng(distinct).permutation(np.tile(np.arange(distinct), 2))
+
+    estimate = merge_chunks(HyperLogLog, values, chunks=16).count()
+
+    # About 1.6% standard error with the default precision: 4 standard errors.
+    assert abs(estimate - distinct) <= max(1, 0.065 * distinct)
+
+
+def test_hyperloglog_merge_is_a_union():
+    left = HyperLogLog().add(pd.Series(np.arange(0, 6000)))
+    right = HyperLogLog().add(pd.Series(np.arange(4000, 10000)))
+
+    merged = left.merge(right)
+
+    assert np.array_equal(merged.registers, HyperLogLog().add(pd.Series(np.arange(10000))).registers)
+    assert merged.merge(merged).count() == merged.count()
+    with pytest.raises(ValueError):
+        left.merge(HyperLogLog(precision=14))
+
+
+def test_hyperloglog_hashes_lists_like_their_strings():
+    sketch = HyperLogLog().add(pd.Series([["a"], ["a"], ["a", "b"], None]))
+
+    assert sketch.count() == 2
+
+
+@pytest.mark.parametrize("distribution", ["uniform", "normal", "exponential"])
+def test_merged_tdigest_quantiles_are_within_a_percent_of_rank(distribution):
+    rng = np.random.default_rng(0)
+    values = getattr(rng, distribution)(size=50000)
+
+    digest = merge_chunks(TDigest, values, chunks=20)
+
+    assert digest.count == len(values)
+    for q in [0.001, 0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99, 0.999]:
+        assert abs((values <= digest.quantile(q)).mean() - q) < 0.01
+
+
+def test_tdigest_stays_small():
+    digest = merge_chunks(TDigest, np.random.default_rng(0).normal(size=100000), chunks=50, compression=100)
+
+    assert len(digest.means) <= 2 * 100
+
+
+def test_empty_tdigest():
+    digest = TDigest().add(pd.Series([np.nan, None], dtype=float))
+
+    assert digest.quantile(0.5) is None
+    assert TDigest().add(pd.Series([3.0])).merge(digest).quantile(0.9) == 3.0
+    with pytest.raises(ValueError):
+        digest.quantile(1.5)
@@ -0,0 +1,77 @@
+import pandas as pd
+import pytest
+from Validation.Validation_Native import NativeValidator
+from Validation.Validation_Sampling import ReservoirSampler
+from Validation.Validation_Stream import StreamValidator, validate_stream
+
+SUITE = {
+    "expectation_suite_name": "test",
+    "expectations": [
+        {"expectation_type": "expect_column_values_to_not_be_null", "kwargs": {"column": "name"}, "meta": {}},
+        # Not evaluated natively, handed to Great Expectations.
+        {"expectation_type": "expect_column_values_to_be_in_set",
+         "kwargs": {"column": "name", "value_set": ["a", "b"]}, "meta": {}},
+    ],
+}
+
+
+def make_chunks(chunks: int, rows: int = 100) -> list[pd.DataFrame]:
+    return [pd.DataFrame({"name": [None if row % 10 == 0 else "a" for row in range(rows)]}) for _ in range(chunks)]
+
+
+@pytest.fixture
+def validator(monkeypatch):
+    validator = NativeValidator(SUITE)
+    validated = []
+
+    def validate_with_ge(df, indexes):
+        validated.append(len(df))
+        return [{"success": True, "expectation_config": validator.expectations[index], "result": {}, "meta": {}}
+                for index in indexes]
+
+    monkeypatch.setattr(validator, "_validate_with_ge", validate_with_ge)
+    validator.validated_rows = validated
+    return validator
+
+
+def test_early_stop_validates_fallback_expectations_on_the_sample(validator):
+    stream = StreamValidator(validator, ReservoirSampler(50, seed=0), error_budget=15)
+
+    result = validate_stream(stream, make_chunks(10))
+
+    assert result["meta"]["streaming"]["stop_reason"] == "error budget exceeded"
+    assert result["meta"]["streaming"]["rows_fetched"] == 200
+    assert [expectation["expectation_config"]["expectation_type"] for expectation in result["results"]] == [
+        "expect_column_values_to_not_be_null",
+        "expect_column_values_to_be_in_set",
+    ]
+    assert result["statistics"]["evaluated_expectations"] == 2
+    assert result["meta"]["streaming"]["fallback_rows_validated"] == 50
+    assert validator.validated_rows == [50]
+    assert not result["success"]
+
+
+def test_full_stream_validates_every_expectation_on_the_sample(validator):
+    stream = StreamValidator(validator, ReservoirSampler(50, seed=0), error_budget=1000)
+
+    result = validate_stream(stream, make_chunks(3))
+
+    assert result["meta"]["streaming"]["stop_reason"] is None
+    assert result["statistics"]["evaluated_expectations"] == 2
+    assert validator.validated_rows == [50]
+
+
+def test_fail_fast_rejects_fallback_expectations(validator):
+    with pytest.raises(ValueError, match="fail_fast"):
+        StreamValidator(validator, ReservoirSampler(50), fail_fast=True)
+
+
+def test_fail_fast_stops_once_every_expectation_failed():
+    validator = NativeValidator({"expectation_suite_name": "test", "expectations": SUITE["expectations"][:1]})
+    stream = StreamValidator(validator, fail_fast=True)
+
+    result = validate_stream(stream, make_chunks(10))
+
+    assert result["meta"]["streaming"]["stop_reason"] == "every expectation failed"
+    assert result["meta"]["streaming"]["chunks"] == 1
+    assert not result["success"]